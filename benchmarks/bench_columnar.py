@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# - bench_columnar.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Compare instances, values_list() and ResultFrame for a large read-only
+query.
+
+Usage:
+    python benchmarks/bench_columnar.py
+"""
+
+import gc
+import time
+import datetime
+import tracemalloc
+import os
+import sys
+
+# Run from a checkout, without installing the package
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+from vfxDatabaseORM.core import models  # noqa: E402
+from vfxDatabaseORM.core.interfaces import IManager  # noqa: E402
+
+ROW_COUNT = 200000
+
+ROWS = [
+    {
+        "type": "Version",
+        "id": uid,
+        "code": "v{:03d}".format(uid % 500),
+        "sg_status_list": ("ip", "rev", "apr")[uid % 3],
+        "frame_count": uid % 240,
+        "sg_ratio": 1.85,
+        "created_at": datetime.datetime(2023, 1, 1)
+        + datetime.timedelta(minutes=uid),
+    }
+    for uid in range(1, ROW_COUNT + 1)
+]
+
+
+class BenchRowsManager(IManager):
+    """Return the same rows for any query, like a backend would do."""
+
+    def execute_raw(self, query):
+        return ROWS
+
+    def execute(self, query):
+        return [self.model_class._from_db(row) for row in ROWS]
+
+    def iterate_raw(self, query, chunk_size):
+        return iter(ROWS)
+
+    def get(self, uid):
+        return None
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        return self.get_queryset().filter(**kwargs)
+
+    def create(self, **kwargs):
+        return None
+
+    def insert(self, instance):
+        return instance
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class BenchVersion(models.Model):
+    manager_class = BenchRowsManager
+    entity_name = "Version"
+
+    code = models.StringField("code")
+    status = models.StringField("sg_status_list")
+    frame_count = models.IntegerField("frame_count")
+    ratio = models.FloatField("sg_ratio")
+    created_at = models.DateTimeField("created_at")
+
+
+def measure(label, func):
+    gc.collect()
+    start = time.time()
+    func()
+    duration = time.time() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(
+        "{label:<24} {duration:6.2f} s {size:8.1f} MB".format(
+            label=label, duration=duration, size=size / 1024.0 / 1024.0
+        )
+    )
+
+
+if __name__ == "__main__":
+    print("{count} rows of 6 fields".format(count=ROW_COUNT))
+    measure("instances", lambda: list(BenchVersion.objects.all()))
+    measure(
+        "values_list",
+        lambda: list(BenchVersion.objects.all().values_list("uid", "code")),
+    )
+    measure(
+        "values_columnar",
+        lambda: BenchVersion.objects.all().values_columnar(),
+    )
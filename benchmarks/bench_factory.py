@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# - bench_factory.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Measure the hydration of rows into instances by ModelFactory.
+
+Usage:
+    python benchmarks/bench_factory.py
+"""
+
+import timeit
+import os
+import sys
+
+# Run from a checkout, without installing the package
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+from vfxDatabaseORM.core import models  # noqa: E402
+from vfxDatabaseORM.core.interfaces import IManager  # noqa: E402
+from vfxDatabaseORM.core.factories import ModelFactory  # noqa: E402
+
+FIELD_COUNT = 40
+ROW_COUNT = 20000
+
+attributes = {"manager_class": IManager, "entity_name": "Shot"}
+for index in range(FIELD_COUNT):
+    attributes["field_{}".format(index)] = models.StringField(
+        "sg_field_{}".format(index)
+    )
+BenchWideShot = type(models.Model)(
+    "BenchWideShot", (models.Model,), attributes
+)
+
+ROWS = []
+for uid in range(1, ROW_COUNT + 1):
+    row = {"type": "Shot", "id": uid}
+    for index in range(FIELD_COUNT):
+        row["sg_field_{}".format(index)] = "value"
+    ROWS.append(row)
+
+
+def legacy_build(model_class, raw_values):
+    """ModelFactory.build() before the db_name index, without the
+    IdentityMap support.
+    """
+    kwargs = {}
+    for field in model_class.get_fields():
+        for value_name, value in raw_values.items():
+            if value_name != field.db_name:
+                continue
+            kwargs[field.name] = value
+    return model_class(**kwargs)
+
+
+def bench(label, func):
+    duration = min(timeit.repeat(func, number=1, repeat=3))
+    print(
+        "{label:<40} {per_row:8.2f} us/row".format(
+            label=label, per_row=duration / ROW_COUNT * 1e6
+        )
+    )
+
+
+if __name__ == "__main__":
+    print(
+        "{rows} rows of {fields} fields".format(
+            rows=ROW_COUNT, fields=FIELD_COUNT + 1
+        )
+    )
+    bench(
+        "nested loops (legacy)",
+        lambda: [legacy_build(BenchWideShot, row) for row in ROWS],
+    )
+    bench(
+        "ModelFactory.build",
+        lambda: [ModelFactory.build(BenchWideShot, row) for row in ROWS],
+    )
+    bench(
+        "ModelFactory.build_many",
+        lambda: ModelFactory.build_many(BenchWideShot, ROWS),
+    )
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# - bench_filters.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Measure the translation of lookup arguments into Shotgrid filters.
+
+Usage:
+    python benchmarks/bench_filters.py
+
+The Shotgrid Python API (shotgun_api3) must be importable, it is imported by
+the manager. No request is sent.
+"""
+
+import timeit
+import os
+import sys
+
+# Run from a checkout, without installing the package
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+from vfxDatabaseORM.core import models  # noqa: E402
+from vfxDatabaseORM.core.queries import Query  # noqa: E402
+from vfxDatabaseORM.adapters.shotgridManager import (  # noqa: E402
+    ShotgridManager,
+)
+
+FIELD_COUNT = 40
+QUERY_COUNT = 5000
+
+attributes = {"manager_class": ShotgridManager, "entity_name": "Shot"}
+for index in range(FIELD_COUNT):
+    attributes["field_{}".format(index)] = models.StringField(
+        "sg_field_{}".format(index)
+    )
+attributes["project"] = models.OneToOneField(
+    "project", to="BenchFilterProject", related_db_name="shots"
+)
+BenchFilterShot = type(models.Model)(
+    "BenchFilterShot", (models.Model,), attributes
+)
+
+
+class BenchFilterProject(models.Model):
+    manager_class = ShotgridManager
+    entity_name = "BenchFilterProject"
+
+    code = models.StringField("name")
+
+
+QUERY = Query(BenchFilterShot)
+QUERY.add_filter(
+    {
+        "field_0__startswith": "SH",
+        "field_{}__contains".format(FIELD_COUNT - 1): "foo",
+        "project__code__is": "bar",
+        "uid__gt": 5,
+    }
+)
+QUERY.add_filter({"field_10": "omt"}, negated=True)
+
+
+def legacy_build_filter(manager, arg_name, arg_value):
+    """ShotgridManager._build_filter() before the filter plans, which
+    computed the lookup with every field of the model.
+    """
+    for field in manager.model_class.get_all_fields():
+        computed_lookup = field.compute_lookup(arg_name)
+        if not computed_lookup.lookup:
+            continue
+        sg_lookup = manager._LOOKUPS_MAPPING.get(computed_lookup.lookup)
+        if not sg_lookup:
+            continue
+        value = manager._to_sg_value(arg_value)
+        if not field.is_related or not computed_lookup.related_field_name:
+            return [field.db_name, sg_lookup, value]
+        related_model = manager.model_class._graph.get_node_model(field.to)
+        related_field = related_model.get_field(
+            computed_lookup.related_field_name
+        )
+        return [
+            "{}.{}.{}".format(
+                field.db_name, related_model.entity_name, related_field.db_name
+            ),
+            sg_lookup,
+            value,
+        ]
+    return None
+
+
+class LegacyShotgridManager(ShotgridManager):
+    def _build_filter(self, arg_name, arg_value):
+        return legacy_build_filter(self, arg_name, arg_value)
+
+
+def bench(label, func):
+    duration = min(timeit.repeat(func, number=1, repeat=3))
+    print(
+        "{label:<40} {per_query:8.2f} us/query".format(
+            label=label, per_query=duration / QUERY_COUNT * 1e6
+        )
+    )
+
+
+if __name__ == "__main__":
+    legacy_manager = LegacyShotgridManager(BenchFilterShot)
+    manager = ShotgridManager(BenchFilterShot)
+    assert legacy_manager._build_filters(QUERY) == manager._build_filters(
+        QUERY
+    )
+
+    print(
+        "{queries} queries on a model of {fields} fields".format(
+            queries=QUERY_COUNT, fields=FIELD_COUNT + 2
+        )
+    )
+    bench(
+        "compute_lookup on all fields (legacy)",
+        lambda: [
+            legacy_manager._build_filters(QUERY) for _ in range(QUERY_COUNT)
+        ],
+    )
+    bench(
+        "filter plans",
+        lambda: [manager._build_filters(QUERY) for _ in range(QUERY_COUNT)],
+    )
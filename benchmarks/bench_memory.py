@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# - bench_memory.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Measure the memory used by instances, with and without use_slots.
+
+Usage:
+    python benchmarks/bench_memory.py
+"""
+
+import gc
+import tracemalloc
+import os
+import sys
+
+# Run from a checkout, without installing the package
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+from vfxDatabaseORM.core import models  # noqa: E402
+from vfxDatabaseORM.core.interfaces import IManager  # noqa: E402
+from vfxDatabaseORM.core.factories import ModelFactory  # noqa: E402
+
+FIELD_COUNT = 10
+INSTANCE_COUNT = 100000
+
+
+def create_model(name, use_slots):
+    attributes = {
+        "manager_class": IManager,
+        "entity_name": "Version",
+        "use_slots": use_slots,
+    }
+    for index in range(FIELD_COUNT):
+        attributes["field_{}".format(index)] = models.StringField(
+            "sg_field_{}".format(index)
+        )
+    return type(models.Model)(name, (models.Model,), attributes)
+
+
+BenchVersion = create_model("BenchVersion", use_slots=False)
+BenchSlotsVersion = create_model("BenchSlotsVersion", use_slots=True)
+
+ROWS = []
+for uid in range(1, INSTANCE_COUNT + 1):
+    row = {"type": "Version", "id": uid}
+    for index in range(FIELD_COUNT):
+        row["sg_field_{}".format(index)] = "value"
+    ROWS.append(row)
+
+
+def measure(model_class):
+    gc.collect()
+    tracemalloc.start()
+    instances = ModelFactory.build_many(model_class, ROWS)
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size
+
+
+if __name__ == "__main__":
+    print(
+        "{count} instances of {fields} fields".format(
+            count=INSTANCE_COUNT, fields=FIELD_COUNT + 1
+        )
+    )
+    for label, model_class in (
+        ("__dict__", BenchVersion),
+        ("use_slots", BenchSlotsVersion),
+    ):
+        size = measure(model_class)
+        line = "{label:<20} {total:8.1f} MB {per_instance:6.0f} B/instance"
+        print(
+            line.format(
+                label=label,
+                total=size / 1024.0 / 1024.0,
+                per_instance=size / float(INSTANCE_COUNT),
+            )
+        )
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# - bench_objects.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Measure the cost of Model.objects and Model.serializer accesses.
+
+Usage:
+    python benchmarks/bench_objects.py
+"""
+
+import timeit
+import os
+import sys
+
+# Run from a checkout, without installing the package
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+from vfxDatabaseORM.core import models  # noqa: E402
+from vfxDatabaseORM.core.interfaces import IManager  # noqa: E402
+
+
+class BenchManager(IManager):
+    def get(self, uid):
+        return None
+
+    def all(self):
+        return []
+
+    def filters(self, **kwargs):
+        return []
+
+    def create(self, **kwargs):
+        return None
+
+    def insert(self, instance):
+        return instance
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class BenchShot(models.Model):
+    manager_class = BenchManager
+    entity_name = "Shot"
+
+    code = models.StringField("code")
+
+
+NUMBER = 200000
+
+
+def bench(label, statement):
+    duration = min(
+        timeit.repeat(
+            statement,
+            setup="from __main__ import BenchShot",
+            number=NUMBER,
+            repeat=5,
+        )
+    )
+    print(
+        "{label:<40} {per_call:8.1f} ns/call".format(
+            label=label, per_call=duration / NUMBER * 1e9
+        )
+    )
+
+
+if __name__ == "__main__":
+    bench(
+        "new manager per access",
+        "BenchShot.manager_class(model_class=BenchShot)",
+    )
+    bench("Model.objects (memoized)", "BenchShot.objects")
+    bench(
+        "new serializer per access",
+        "BenchShot.serializer_class(model_class=BenchShot)",
+    )
+    bench("Model.serializer (memoized)", "BenchShot.serializer")
@@ -28,7 +28,6 @@ authors = ["Laurette Alexandre"]
 
 requires = [
     "six",
-    "networkx",
     "python-2.7+",
     # "~shotgunPythonApi-3.2",  # Replace by your REZ package name for SG API
     # "~ftrackPythonApi-2.4",  # Replace by your REZ package name for FTrack API
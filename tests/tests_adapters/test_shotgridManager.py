@@ -0,0 +1,597 @@
+# -*- coding: utf-8 -*-
+#
+# - test_shotgridManager.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import sys
+import types
+import unittest
+
+try:
+    import shotgun_api3  # noqa
+except ImportError:
+    # Requests are sent to FakeShotgun, the API is only imported by the
+    # manager.
+    sys.modules["shotgun_api3"] = types.ModuleType("shotgun_api3")
+
+from vfxDatabaseORM.core import models, exceptions
+from vfxDatabaseORM.core.queries import Q, Count, Sum
+from vfxDatabaseORM.adapters.shotgridManager import ShotgridManager
+
+
+class FakeShotgun(object):
+    """Record requests and return rows of rows_by_entity, without
+    filtering them. Requested fields are sorted, python 2 doesn't keep the
+    order of fields declared in models.
+    """
+
+    calls = []
+    rows_by_entity = {}
+    summarize_result = {}
+
+    def find(self, entity_type, filters, fields, order=None, limit=0, page=0):
+        FakeShotgun.calls.append(
+            ("find", entity_type, filters, sorted(fields), order, limit, page)
+        )
+        rows = [dict(row) for row in self.rows_by_entity.get(entity_type, [])]
+        if limit:
+            page = max(page, 1)
+            rows = rows[(page - 1) * limit:page * limit]
+        return rows
+
+    def find_one(self, entity_type, filters, fields):
+        FakeShotgun.calls.append(
+            ("find_one", entity_type, filters, sorted(fields))
+        )
+        for row in self.rows_by_entity.get(entity_type, []):
+            return dict(row)
+        return None
+
+    def summarize(self, entity_type, filters, summary_fields, grouping=None):
+        FakeShotgun.calls.append(
+            ("summarize", entity_type, filters, summary_fields, grouping)
+        )
+        return self.summarize_result
+
+    def batch(self, requests):
+        FakeShotgun.calls.append(("batch", requests))
+        return [dict(request.get("data", {})) for request in requests]
+
+
+class FakeShotgridManager(ShotgridManager):
+    HOST = "https://fake.shotgrid.test"
+
+    def _create_client(self):
+        return FakeShotgun()
+
+
+class FakeSgProject(models.Model):
+    manager_class = FakeShotgridManager
+    entity_name = "Project"
+
+    name = models.StringField("name")
+
+
+class FakeSgSequence(models.Model):
+    manager_class = FakeShotgridManager
+    entity_name = "Sequence"
+
+    code = models.StringField("code")
+    duration = models.FloatField("sg_duration")
+    project = models.OneToOneField(
+        "project", to="FakeSgProject", related_db_name="sequences"
+    )
+
+
+class FakeSgShot(models.Model):
+    manager_class = FakeShotgridManager
+    entity_name = "Shot"
+
+    code = models.StringField("code")
+    frames = models.IntegerField("sg_frames")
+    sequence = models.OneToOneField(
+        "sg_sequence", to="FakeSgSequence", related_db_name="shots"
+    )
+    versions = models.OneToManyField(
+        "versions", to="FakeSgVersion", related_db_name="entity"
+    )
+
+
+class FakeSgVersion(models.Model):
+    manager_class = FakeShotgridManager
+    entity_name = "Version"
+
+    code = models.StringField("code")
+    shot = models.OneToOneField(
+        "entity", to="FakeSgShot", related_db_name="versions"
+    )
+
+
+SHOT_FIELDS = ["code", "id", "sg_frames"]
+
+
+class TestShotgridManager(unittest.TestCase):
+    def setUp(self):
+        FakeShotgun.calls = []
+        FakeShotgun.rows_by_entity = {
+            "Shot": [
+                {"type": "Shot", "id": i, "code": "SH{:03d}".format(i)}
+                for i in range(1, 6)
+            ]
+        }
+        FakeShotgun.summarize_result = {}
+
+    def _get_find_call(self):
+        self.assertEqual(len(FakeShotgun.calls), 1)
+        return FakeShotgun.calls[0]
+
+    def test_CASE_filters_SHOULD_translate_lookups(self):
+        queryset = FakeSgShot.objects.filters(
+            code__startswith="SH", frames__gt=10
+        ).exclude(code="SH002")
+
+        list(queryset)
+
+        self.assertEqual(
+            self._get_find_call(),
+            (
+                "find",
+                "Shot",
+                [
+                    ["code", "starts_with", "SH"],
+                    ["sg_frames", "greater_than", 10],
+                    ["code", "is_not", "SH002"],
+                ],
+                SHOT_FIELDS,
+                [],
+                0,
+                0,
+            ),
+        )
+
+    def test_CASE_filters_WITH_q_objects_SHOULD_build_groups(self):
+        list(
+            FakeSgShot.objects.filters(
+                Q(code="SH001") | ~Q(code__contains="foo", frames=2)
+            )
+        )
+
+        self.assertEqual(
+            self._get_find_call()[2],
+            [
+                {
+                    "filter_operator": "any",
+                    "filters": [
+                        ["code", "is", "SH001"],
+                        {
+                            "filter_operator": "any",
+                            "filters": [
+                                ["code", "not_contains", "foo"],
+                                ["sg_frames", "is_not", 2],
+                            ],
+                        },
+                    ],
+                }
+            ],
+        )
+
+    def test_CASE_filters_WITH_instance_SHOULD_send_entity(self):
+        sequence = FakeSgSequence._from_db({"id": 3})
+
+        list(FakeSgShot.objects.filters(sequence=sequence).only("code"))
+
+        self.assertEqual(
+            self._get_find_call()[2:4],
+            (
+                [["sg_sequence", "is", {"type": "Sequence", "id": 3}]],
+                ["code", "id"],
+            ),
+        )
+
+    def test_CASE_filters_WITH_deep_lookup_SHOULD_send_deep_path(self):
+        list(FakeSgVersion.objects.filters(shot__sequence__code__is="SEQ01"))
+
+        self.assertEqual(
+            self._get_find_call()[2],
+            [["entity.Shot.sg_sequence.Sequence.code", "is", "SEQ01"]],
+        )
+
+    def test_CASE_filters_WITH_deep_comparison_SHOULD_send_deep_path(self):
+        list(
+            FakeSgVersion.objects.filters(
+                shot__sequence__code__startswith="SEQ",
+                shot__code__contains="010",
+                shot__frames__gt=24,
+            )
+        )
+
+        self.assertEqual(
+            self._get_find_call()[2],
+            [
+                ["entity.Shot.code", "contains", "010"],
+                ["entity.Shot.sg_frames", "greater_than", 24],
+                [
+                    "entity.Shot.sg_sequence.Sequence.code",
+                    "starts_with",
+                    "SEQ",
+                ],
+            ],
+        )
+
+    def test_CASE_filter_related_WITH_comparison_SHOULD_send_deep_path(self):
+        list(
+            FakeSgVersion.objects.all().filter_related(
+                FakeSgSequence, code__startswith="SEQ"
+            )
+        )
+
+        self.assertEqual(
+            self._get_find_call()[2],
+            [
+                [
+                    "entity.Shot.sg_sequence.Sequence.code",
+                    "starts_with",
+                    "SEQ",
+                ]
+            ],
+        )
+
+    def test_CASE_order_by_and_slice_SHOULD_send_order_and_page(self):
+        shots = list(FakeSgShot.objects.all().order_by("-code")[2:4])
+
+        self.assertEqual(
+            self._get_find_call()[4:],
+            ([{"field_name": "code", "direction": "desc"}], 2, 2),
+        )
+        self.assertEqual([shot.uid for shot in shots], [3, 4])
+
+    def test_CASE_slice_WITH_unaligned_offset_SHOULD_skip_rows(self):
+        shots = list(FakeSgShot.objects.all()[3:5])
+
+        self.assertEqual(self._get_find_call()[5:], (5, 0))
+        self.assertEqual([shot.uid for shot in shots], [4, 5])
+
+    def test_CASE_iterator_SHOULD_request_pages(self):
+        shots = list(FakeSgShot.objects.all().iterator(chunk_size=2))
+
+        self.assertEqual([shot.uid for shot in shots], [1, 2, 3, 4, 5])
+        self.assertEqual(
+            [call[4:] for call in FakeShotgun.calls],
+            [
+                ([{"field_name": "id", "direction": "asc"}], 2, page)
+                for page in (1, 2, 3)
+            ],
+        )
+
+    def test_CASE_get_SHOULD_find_one(self):
+        shot = FakeSgShot.objects.get(1)
+
+        self.assertEqual(shot.code, "SH001")
+        self.assertEqual(
+            FakeShotgun.calls,
+            [("find_one", "Shot", [["id", "is", 1]], SHOT_FIELDS)],
+        )
+
+    def test_CASE_count_SHOULD_summarize(self):
+        FakeShotgun.summarize_result = {"summaries": {"id": 42}}
+
+        count = FakeSgShot.objects.filters(code__contains="SH").count()
+
+        self.assertEqual(count, 42)
+        self.assertEqual(
+            FakeShotgun.calls,
+            [
+                (
+                    "summarize",
+                    "Shot",
+                    [["code", "contains", "SH"]],
+                    [{"field": "id", "type": "record_count"}],
+                    None,
+                )
+            ],
+        )
+
+    def test_CASE_count_WITHOUT_summary_SHOULD_return_zero(self):
+        FakeShotgun.summarize_result = {"summaries": {}}
+
+        self.assertEqual(FakeSgShot.objects.filters(code="nothing").count(), 0)
+
+    def test_CASE_aggregate_WITHOUT_summary_SHOULD_count_zero(self):
+        FakeShotgun.summarize_result = {"summaries": {}}
+
+        result = FakeSgShot.objects.filters(code="nothing").aggregate(
+            Count(), Sum("frames")
+        )
+
+        self.assertEqual(result, {"uid__count": 0, "frames__sum": None})
+
+    def test_CASE_count_WITH_slice_SHOULD_limit_count(self):
+        FakeShotgun.summarize_result = {"summaries": {"id": 42}}
+
+        self.assertEqual(FakeSgShot.objects.all()[40:50].count(), 2)
+
+    def test_CASE_aggregate_WITH_group_by_SHOULD_summarize_groups(self):
+        FakeShotgun.summarize_result = {
+            "groups": [
+                {
+                    "group_value": "SH001",
+                    "summaries": {"id": 2, "sg_frames": 20},
+                },
+                {
+                    "group_value": "SH002",
+                    "summaries": {"id": 1, "sg_frames": 5},
+                },
+            ]
+        }
+
+        result = FakeSgShot.objects.all().aggregate(
+            Count(), Sum("frames"), group_by=["code"]
+        )
+
+        self.assertEqual(
+            result,
+            [
+                {"code": "SH001", "uid__count": 2, "frames__sum": 20},
+                {"code": "SH002", "uid__count": 1, "frames__sum": 5},
+            ],
+        )
+        self.assertEqual(
+            FakeShotgun.calls,
+            [
+                (
+                    "summarize",
+                    "Shot",
+                    [],
+                    [
+                        {"field": "id", "type": "record_count"},
+                        {"field": "sg_frames", "type": "sum"},
+                    ],
+                    [{"field": "code", "type": "exact", "direction": "asc"}],
+                )
+            ],
+        )
+
+    def test_CASE_prefetch_related_SHOULD_send_one_request(self):
+        FakeShotgun.rows_by_entity["Version"] = [
+            {"type": "Version", "id": 10, "entity": {"type": "Shot", "id": 1}},
+            {"type": "Version", "id": 11, "entity": {"type": "Shot", "id": 2}},
+            {"type": "Version", "id": 12, "entity": {"type": "Shot", "id": 1}},
+        ]
+
+        shots = list(FakeSgShot.objects.all()[:2].prefetch_related("versions"))
+
+        self.assertEqual(len(FakeShotgun.calls), 2)
+        self.assertEqual(
+            FakeShotgun.calls[1][1:4],
+            (
+                "Version",
+                [["entity.Shot.id", "in", [1, 2]]],
+                ["code", "entity", "id"],
+            ),
+        )
+        self.assertEqual(
+            [[version.uid for version in shot.versions] for shot in shots],
+            [[10, 12], [11]],
+        )
+        self.assertEqual(len(FakeShotgun.calls), 2)
+
+    def test_CASE_bulk_update_SHOULD_clear_related_cache(self):
+        FakeShotgun.rows_by_entity["Version"] = [
+            {"type": "Version", "id": 10, "entity": {"type": "Shot", "id": 1}},
+        ]
+        shot = FakeSgShot(uid=1, code="SH001")
+        self.assertEqual([version.uid for version in shot.versions], [10])
+
+        shot.frames = 24
+        FakeSgShot.objects.bulk_update([shot])
+
+        self.assertEqual(
+            FakeShotgun.calls[-1],
+            (
+                "batch",
+                [
+                    {
+                        "request_type": "update",
+                        "entity_type": "Shot",
+                        "entity_id": 1,
+                        "data": {"sg_frames": 24},
+                        "multi_entity_update_modes": {},
+                    }
+                ],
+            ),
+        )
+        self.assertFalse(shot.is_dirty)
+        self.assertEqual(shot._related_cache, {})
+
+        # Versions are fetched again, like after save()
+        self.assertEqual([version.uid for version in shot.versions], [10])
+        self.assertEqual(FakeShotgun.calls[-1][:2], ("find", "Version"))
+
+    def test_CASE_bulk_create_SHOULD_not_resolve_related_fields(self):
+        shot = FakeSgShot._from_db({"id": 1})
+        versions = [FakeSgVersion(code="v001"), FakeSgVersion(code="v002")]
+        versions[0]._set_related_cache("shot", [shot])
+
+        FakeSgVersion.objects.bulk_create(versions)
+
+        self.assertEqual(len(FakeShotgun.calls), 1)
+        self.assertEqual(
+            [request["data"] for request in FakeShotgun.calls[0][1]],
+            [
+                {"code": "v001", "entity": {"id": 1, "type": "Shot"}},
+                {"code": "v002", "entity": None},
+            ],
+        )
+
+    def test_CASE_bulk_create_WITHOUT_data_SHOULD_skip_instance(self):
+        empty_project = FakeSgProject()
+        project = FakeSgProject(name="Foo")
+        FakeSgProject.get_field("name")._read_only = True
+        self.addCleanup(
+            setattr, FakeSgProject.get_field("name"), "_read_only", False
+        )
+
+        result = FakeSgProject.objects.bulk_create([empty_project, project])
+
+        self.assertEqual(result, [empty_project, project])
+        self.assertEqual(FakeShotgun.calls, [])
+
+    def test_CASE_bulk_update_WITH_fields_SHOULD_keep_other_changes(self):
+        shot = FakeSgShot._from_db({"id": 1, "code": "SH001"})
+        shot.code = "SH010"
+        shot.frames = 99
+
+        FakeSgShot.objects.bulk_update([shot], fields=["code"])
+
+        self.assertEqual(
+            FakeShotgun.calls[-1][1][0]["data"], {"code": "SH010"}
+        )
+        self.assertTrue(shot.is_dirty)
+        self.assertEqual(shot.get_changes(), {"frames": (None, 99)})
+
+    def test_CASE_exclude_WITH_comparison_SHOULD_send_complement(self):
+        list(FakeSgShot.objects.all().exclude(frames__gt=3, frames__lt=10))
+
+        self.assertEqual(
+            self._get_find_call()[2],
+            [
+                {
+                    "filter_operator": "any",
+                    "filters": [
+                        {
+                            "filter_operator": "any",
+                            "filters": [
+                                ["sg_frames", "less_than", 3],
+                                ["sg_frames", "is", 3],
+                                ["sg_frames", "is", None],
+                            ],
+                        },
+                        {
+                            "filter_operator": "any",
+                            "filters": [
+                                ["sg_frames", "greater_than", 10],
+                                ["sg_frames", "is", 10],
+                                ["sg_frames", "is", None],
+                            ],
+                        },
+                    ],
+                }
+            ],
+        )
+
+    def test_CASE_exclude_WITH_startswith_SHOULD_raise(self):
+        queryset = FakeSgShot.objects.all().exclude(code__startswith="SH")
+
+        with self.assertRaises(exceptions.InvalidLookUp):
+            list(queryset)
+
+        self.assertEqual(FakeShotgun.calls, [])
+
+    def test_CASE_filters_WITH_unsupported_lookup_SHOULD_raise(self):
+        queryset = FakeSgSequence.objects.filters(
+            Q(code="SEQ01") | ~Q(duration__lte=10.0)
+        )
+
+        with self.assertRaises(exceptions.InvalidLookUp):
+            list(queryset)
+
+        self.assertEqual(FakeShotgun.calls, [])
+
+    def test_CASE_explain_WITH_deep_filter_SHOULD_send_one_request(self):
+        queryset = FakeSgVersion.objects.filters(
+            shot__sequence__code__is="SEQ01"
+        )
+
+        self.assertEqual(
+            queryset.explain(),
+            "FakeSgVersion on FakeShotgridManager: 1 round trip\n"
+            "  query: find FakeSgVersion (1 round trip)\n"
+            "  deep filter: shot__sequence__code__is through FakeSgShot, "
+            "FakeSgSequence",
+        )
+
+    def _limit_filter_depth(self, max_depth):
+        FakeShotgridManager.MAX_FILTER_DEPTH = max_depth
+        self.addCleanup(delattr, FakeShotgridManager, "MAX_FILTER_DEPTH")
+
+    def test_CASE_filters_WITH_deeper_filter_SHOULD_send_one_request(self):
+        list(
+            FakeSgVersion.objects.filters(
+                shot__sequence__project__name__is="Foo"
+            )
+        )
+
+        self.assertEqual(
+            self._get_find_call()[2],
+            [
+                [
+                    "entity.Shot.sg_sequence.Sequence.project.Project.name",
+                    "is",
+                    "Foo",
+                ]
+            ],
+        )
+
+    def test_CASE_explain_WITH_too_deep_filter_SHOULD_plan_subquery(self):
+        self._limit_filter_depth(2)
+        queryset = FakeSgVersion.objects.filters(
+            shot__sequence__project__name__is="Foo"
+        )
+
+        self.assertEqual(
+            queryset.explain(),
+            "FakeSgVersion on FakeShotgridManager: 2 round trips\n"
+            "  query: find FakeSgVersion (1 round trip)\n"
+            "  in-subquery: shot__sequence__project__name__is as "
+            "shot__sequence__project__in on FakeSgProject (1 round trip)\n"
+            "    FakeSgProject on FakeShotgridManager: 1 round trip\n"
+            "      query: find FakeSgProject (1 round trip)",
+        )
+        self.assertEqual(FakeShotgun.calls, [])
+
+    def test_CASE_filters_WITH_too_deep_filter_SHOULD_run_subquery(self):
+        self._limit_filter_depth(2)
+        FakeShotgun.rows_by_entity["Project"] = [{"type": "Project", "id": 7}]
+
+        list(
+            FakeSgVersion.objects.filters(
+                shot__sequence__project__name__is="Foo"
+            )
+        )
+
+        self.assertEqual(
+            [call[1:4] for call in FakeShotgun.calls],
+            [
+                ("Project", [["name", "is", "Foo"]], ["id"]),
+                (
+                    "Version",
+                    [
+                        [
+                            "entity.Shot.sg_sequence.Sequence.project",
+                            "in",
+                            [{"type": "Project", "id": 7}],
+                        ]
+                    ],
+                    ["code", "id"],
+                ),
+            ],
+        )
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+# - test_identityMap.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import unittest
+
+from vfxDatabaseORM.core import models
+from vfxDatabaseORM.core.caches import IdentityMap
+from vfxDatabaseORM.core.factories import ModelFactory
+from vfxDatabaseORM.core.interfaces import IManager
+
+
+class FakeRefreshManager(IManager):
+    rows = {}
+    requests = 0
+
+    def get(self, uid):
+        identity_map = IdentityMap.get_current()
+        if identity_map is not None:
+            instance = identity_map.get(self.model_class, uid)
+            if instance is not None:
+                return instance
+        FakeRefreshManager.requests += 1
+        return ModelFactory.build(self.model_class, dict(self.rows[uid]))
+
+    def all(self):
+        return []
+
+    def filters(self, *args, **kwargs):
+        return []
+
+    def create(self, **kwargs):
+        return None
+
+    def insert(self, instance):
+        row = {"id": len(self.rows) + 1, "code": instance.code}
+        FakeRefreshManager.rows[row["id"]] = row
+        return ModelFactory.build(self.model_class, dict(row))
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeIdentityModel(models.Model):
+    manager_class = type("FakeManager", (object,), {})
+    entity_name = "FakeIdentity"
+
+    code = models.StringField("code")
+
+
+class FakeRefreshIdentityModel(models.Model):
+    manager_class = FakeRefreshManager
+    entity_name = "FakeRefreshIdentity"
+
+    code = models.StringField("code")
+
+
+class FakeOtherIdentityModel(models.Model):
+    manager_class = type("FakeManager", (object,), {})
+    entity_name = "FakeIdentity"
+
+
+class TestIdentityMap(unittest.TestCase):
+    def test_CASE_no_active_map_SHOULD_return_none(self):
+        self.assertIsNone(IdentityMap.get_current())
+
+    def test_CASE_context_manager_SHOULD_activate_map(self):
+        with IdentityMap() as identity_map:
+            self.assertIs(IdentityMap.get_current(), identity_map)
+
+            with IdentityMap() as nested_map:
+                self.assertIs(IdentityMap.get_current(), nested_map)
+
+            self.assertIs(IdentityMap.get_current(), identity_map)
+
+        self.assertIsNone(IdentityMap.get_current())
+
+    def test_CASE_map_SHOULD_be_local_to_thread(self):
+        result = []
+
+        with IdentityMap():
+            thread = threading.Thread(
+                target=lambda: result.append(IdentityMap.get_current())
+            )
+            thread.start()
+            thread.join()
+
+        self.assertEqual(result, [None])
+
+    def test_CASE_build_WITH_active_map_SHOULD_return_same_instance(self):
+        with IdentityMap() as identity_map:
+            instance_0 = ModelFactory.build(
+                FakeIdentityModel, {"id": 1, "code": "foo"}
+            )
+            instance_1 = ModelFactory.build(
+                FakeIdentityModel, {"id": 1, "code": "foo"}
+            )
+            instance_2 = ModelFactory.build(
+                FakeIdentityModel, {"id": 2, "code": "foo"}
+            )
+
+            self.assertIs(instance_0, instance_1)
+            self.assertIsNot(instance_0, instance_2)
+            self.assertEqual(len(identity_map), 2)
+            self.assertIn(instance_0, identity_map)
+
+        instance_3 = ModelFactory.build(
+            FakeIdentityModel, {"id": 1, "code": "foo"}
+        )
+        self.assertIsNot(instance_0, instance_3)
+
+    def test_CASE_build_WITH_deferred_fields_SHOULD_fill_them(self):
+        with IdentityMap():
+            instance_0 = ModelFactory.build(
+                FakeIdentityModel, {"id": 1}, deferred_fields=["code"]
+            )
+            instance_1 = ModelFactory.build(
+                FakeIdentityModel, {"id": 1, "code": "foo"}
+            )
+
+        self.assertIs(instance_0, instance_1)
+        self.assertEqual(instance_0._deferred, set())
+        self.assertEqual(instance_0.code, "foo")
+
+    def test_CASE_get_WITH_other_model_SHOULD_return_none(self):
+        with IdentityMap() as identity_map:
+            instance = ModelFactory.build(FakeIdentityModel, {"id": 1})
+
+            self.assertIs(identity_map.get(FakeIdentityModel, 1), instance)
+            self.assertIsNone(identity_map.get(FakeOtherIdentityModel, 1))
+
+    def test_CASE_add_WITHOUT_uid_SHOULD_ignore_instance(self):
+        identity_map = IdentityMap()
+        identity_map.add(FakeIdentityModel(code="foo"))
+
+        self.assertEqual(len(identity_map), 0)
+
+    def test_CASE_remove_and_clear_SHOULD_unregister(self):
+        identity_map = IdentityMap()
+        instance_0 = FakeIdentityModel(uid=1)
+        instance_1 = FakeIdentityModel(uid=2)
+        identity_map.add(instance_0)
+        identity_map.add(instance_1)
+
+        identity_map.remove(instance_0)
+        self.assertNotIn(instance_0, identity_map)
+        self.assertEqual(len(identity_map), 1)
+
+        identity_map.clear()
+        self.assertEqual(len(identity_map), 0)
+
+    def test_CASE_suspend_SHOULD_deactivate_map(self):
+        with IdentityMap() as identity_map:
+            with IdentityMap.suspend():
+                self.assertIsNone(IdentityMap.get_current())
+                instance = ModelFactory.build(FakeIdentityModel, {"id": 1})
+
+            self.assertIs(IdentityMap.get_current(), identity_map)
+            self.assertNotIn(instance, identity_map)
+
+    def test_CASE_refresh_from_db_WITH_active_map_SHOULD_request_database(
+        self,
+    ):
+        FakeRefreshManager.rows[1] = {"id": 1, "code": "foo"}
+        FakeRefreshManager.requests = 0
+
+        with IdentityMap() as identity_map:
+            instance = FakeRefreshIdentityModel.objects.get(1)
+            FakeRefreshManager.rows[1]["code"] = "bar"
+
+            instance.refresh_from_db()
+
+            self.assertEqual(FakeRefreshManager.requests, 2)
+            self.assertEqual(instance.code, "bar")
+            self.assertIs(FakeRefreshIdentityModel.objects.get(1), instance)
+            self.assertEqual(len(identity_map), 1)
+
+    def test_CASE_save_WITH_active_map_SHOULD_register_instance(self):
+        FakeRefreshManager.rows = {}
+        FakeRefreshManager.requests = 0
+
+        with IdentityMap() as identity_map:
+            instance = FakeRefreshIdentityModel(code="foo")
+            instance.save()
+
+            self.assertEqual(instance.uid, 1)
+            self.assertIn(instance, identity_map)
+            self.assertIs(FakeRefreshIdentityModel.objects.get(1), instance)
+            self.assertEqual(FakeRefreshManager.requests, 0)
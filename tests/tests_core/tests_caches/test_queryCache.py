@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+#
+# - test_queryCache.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import sys
+import time
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import vfxDatabaseORM
+from vfxDatabaseORM.core import models
+from vfxDatabaseORM.core.caches import MemoryCache, DiskCache, IdentityMap
+from vfxDatabaseORM.core.factories import ModelFactory
+from vfxDatabaseORM.core.interfaces import IManager
+
+
+class FakeManager(IManager):
+    QUERY_CACHE = MemoryCache()
+
+    execute_call_count = 0
+
+    def get(self, uid):
+        return self.model_class(uid=uid)
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        return self.get_queryset().filter(**kwargs)
+
+    def execute(self, query):
+        FakeManager.execute_call_count += 1
+        return ModelFactory.build_many(
+            self.model_class,
+            [{"id": i + 1, "code": "foo", "tags": ["a"]} for i in range(2)],
+        )
+
+    def create(self, **kwargs):
+        return self.model_class(uid=1)
+
+    def insert(self, instance):
+        self.invalidate_cache()
+        return self.model_class(uid=1)
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeCachedModel(models.Model):
+    manager_class = FakeManager
+    entity_name = "FakeCached"
+
+    code = models.StringField("code")
+    tags = models.ListField("tags")
+
+
+class FakeCachedSequence(models.Model):
+    manager_class = FakeManager
+    entity_name = "FakeCachedSequence"
+
+    code = models.StringField("code")
+
+
+class FakeCachedShot(models.Model):
+    manager_class = FakeManager
+    entity_name = "FakeCachedShot"
+
+    code = models.StringField("code")
+    sequence = models.OneToOneField(
+        "sequence", to="FakeCachedSequence", related_db_name="shots"
+    )
+
+
+class FakeCachedVersion(models.Model):
+    manager_class = FakeManager
+    entity_name = "FakeCachedVersion"
+
+    code = models.StringField("code")
+    shot = models.OneToOneField(
+        "shot", to="FakeCachedShot", related_db_name="versions"
+    )
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_CASE_get_SHOULD_count_hits_and_misses(self):
+        cache = MemoryCache()
+
+        self.assertIsNone(cache.get(("A", (), 1)))
+        cache.set(("A", (), 1), "foo")
+        self.assertEqual(cache.get(("A", (), 1)), "foo")
+
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1})
+
+    def test_CASE_set_WITH_full_cache_SHOULD_evict_least_recently_used(self):
+        cache = MemoryCache(max_size=2)
+        cache.set(("A", (), 1), 1)
+        cache.set(("A", (), 2), 2)
+        cache.get(("A", (), 1))  # ("A", (), 2) is now the least recently used
+        cache.set(("A", (), 3), 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(("A", (), 1)), 1)
+        self.assertIsNone(cache.get(("A", (), 2)))
+        self.assertEqual(cache.get(("A", (), 3)), 3)
+
+    def test_CASE_get_WITH_expired_value_SHOULD_return_none(self):
+        cache = MemoryCache(ttl=0.01)
+        cache.set(("A", (), 1), 1)
+
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get(("A", (), 1)))
+        self.assertEqual(len(cache), 0)
+
+    def test_CASE_invalidate_SHOULD_remove_entity_values(self):
+        cache = MemoryCache()
+        cache.set(("A", (), 1), 1)
+        cache.set(("B", (), 1), 1)
+
+        cache.invalidate("A")
+
+        self.assertIsNone(cache.get(("A", (), 1)))
+        self.assertEqual(cache.get(("B", (), 1)), 1)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_CASE_invalidate_SHOULD_remove_dependent_values(self):
+        cache = MemoryCache()
+        cache.set(("A", ("B",), 1), 1)
+        cache.set(("A", ("C",), 1), 1)
+
+        cache.invalidate("B")
+
+        self.assertIsNone(cache.get(("A", ("B",), 1)))
+        self.assertEqual(cache.get(("A", ("C",), 1)), 1)
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_CASE_set_SHOULD_be_shared_between_caches(self):
+        cache_0 = DiskCache(self.directory)
+        cache_1 = DiskCache(self.directory)
+
+        cache_0.set(("A", (), 1), {"id": 1})
+
+        self.assertEqual(cache_1.get(("A", (), 1)), {"id": 1})
+        self.assertIsNone(cache_1.get(("A", (), 2)))
+        self.assertEqual(cache_1.stats, {"hits": 1, "misses": 1})
+
+    def test_CASE_get_WITH_expired_value_SHOULD_return_none(self):
+        cache = DiskCache(self.directory, ttl=0.01)
+        cache.set(("A", (), 1), 1)
+
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get(("A", (), 1)))
+
+    def test_CASE_invalidate_SHOULD_remove_entity_values(self):
+        cache = DiskCache(self.directory)
+        cache.set(("A", (), 1), 1)
+        cache.set(("B", (), 1), 1)
+
+        cache.invalidate("A")
+
+        self.assertIsNone(cache.get(("A", (), 1)))
+        self.assertEqual(cache.get(("B", (), 1)), 1)
+
+        cache.clear()
+        self.assertIsNone(cache.get(("B", (), 1)))
+
+    def test_CASE_invalidate_SHOULD_remove_dependent_values(self):
+        cache = DiskCache(self.directory)
+        cache.set(("A", ("B", "C"), 1), 1)
+        cache.set(("A", ("C",), 1), 1)
+
+        cache.invalidate("B")
+
+        self.assertIsNone(cache.get(("A", ("B", "C"), 1)))
+        self.assertEqual(cache.get(("A", ("C",), 1)), 1)
+
+    def test_CASE_set_WITH_existing_value_SHOULD_replace_it(self):
+        cache = DiskCache(self.directory)
+        cache.set(("A", (), 1), 1)
+        cache.set(("A", (), 1), 2)
+
+        self.assertEqual(cache.get(("A", (), 1)), 2)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_CASE_set_WITH_unpicklable_value_SHOULD_remove_temp_file(self):
+        cache = DiskCache(self.directory)
+
+        with self.assertRaises(Exception):
+            cache.set(("A", (), 1), lambda: None)
+
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_CASE_key_WITH_sets_SHOULD_not_depend_on_hash_seed(self):
+        root_path = os.path.dirname(
+            os.path.dirname(os.path.abspath(vfxDatabaseORM.__file__))
+        )
+        key = (
+            "Shot",
+            ("Sequence",),
+            ("code", "in", frozenset(["sh_{0}".format(i) for i in range(20)])),
+        )
+        script = (
+            "from vfxDatabaseORM.core.caches import DiskCache;"
+            "print(DiskCache({directory!r})._get_path({key!r}))"
+        ).format(directory=self.directory, key=key)
+
+        paths = set()
+        for seed in ("1", "2", "3"):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            output = subprocess.check_output(
+                [sys.executable, "-c", script],
+                env=env,
+                cwd=root_path,
+            )
+            paths.add(output.strip().decode("utf-8"))
+
+        self.assertEqual(paths, {DiskCache(self.directory)._get_path(key)})
+
+
+class TestManagerQueryCache(unittest.TestCase):
+    def tearDown(self):
+        FakeManager.QUERY_CACHE.clear()
+        FakeManager.execute_call_count = 0
+
+    def test_CASE_same_query_SHOULD_execute_once(self):
+        result_0 = list(FakeCachedModel.objects.filters(code="foo"))
+        result_1 = list(FakeCachedModel.objects.filters(code="foo"))
+
+        self.assertEqual(FakeManager.execute_call_count, 1)
+        self.assertEqual(result_0, result_1)
+        self.assertEqual(result_1[0].code, "foo")
+        # Instances are not shared between results
+        self.assertIsNot(result_0[0], result_1[0])
+
+        list(FakeCachedModel.objects.filters(code="bar"))
+        self.assertEqual(FakeManager.execute_call_count, 2)
+
+    def test_CASE_insert_SHOULD_invalidate_cache(self):
+        list(FakeCachedModel.objects.all())
+        FakeCachedModel(code="foo").save()
+        list(FakeCachedModel.objects.all())
+
+        self.assertEqual(FakeManager.execute_call_count, 2)
+
+    def test_CASE_identity_map_SHOULD_not_cache_local_changes(self):
+        with IdentityMap():
+            instance = list(FakeCachedModel.objects.all())[0]
+            instance.code = "LOCAL_EDIT"
+
+            result = list(FakeCachedModel.objects.filters(code="foo"))
+            self.assertIs(result[0], instance)
+
+        result = list(FakeCachedModel.objects.filters(code="foo"))
+
+        self.assertEqual(FakeManager.execute_call_count, 2)
+        self.assertEqual(result[0].code, "foo")
+
+    def test_CASE_insert_SHOULD_invalidate_deep_related_queries(self):
+        queryset = FakeCachedVersion.objects.filters(
+            shot__sequence__code__is="SEQ01"
+        )
+        list(queryset.all())
+        list(queryset.all())
+        self.assertEqual(FakeManager.execute_call_count, 1)
+
+        FakeCachedSequence(code="SEQ01").save()
+        list(queryset.all())
+
+        self.assertEqual(FakeManager.execute_call_count, 2)
+
+    def test_CASE_insert_SHOULD_keep_queries_not_filtered_through_it(self):
+        queryset = FakeCachedVersion.objects.filters(code="v001")
+        list(queryset.all())
+
+        FakeCachedSequence(code="SEQ01").save()
+        list(queryset.all())
+
+        self.assertEqual(FakeManager.execute_call_count, 1)
+
+    def test_CASE_change_on_mutable_value_SHOULD_not_alter_cache(self):
+        list(FakeCachedModel.objects.all())[0].tags.append("mutated")
+        list(FakeCachedModel.objects.all())[1].tags.append("mutated")
+
+        result = list(FakeCachedModel.objects.all())
+
+        self.assertEqual(FakeManager.execute_call_count, 1)
+        self.assertEqual([i.tags for i in result], [["a"], ["a"]])
@@ -35,6 +35,14 @@ class ExampleModel(models.Model):
     is_valid = models.BooleanField("foo_is_valid", default=False)
 
 
+class ExampleSlotsModel(models.Model):
+    manager_class = type("FakeManager", (object,), {})
+    use_slots = True
+
+    name = models.StringField("name")
+    is_valid = models.BooleanField("foo_is_valid", default=False)
+
+
 class TestModelFactory(unittest.TestCase):
     def test_CASE_build_WITH_valid_data_SHOULD_return_instance(self):
         raw_values = {"id": 50, "name": "foo", "foo_is_valid": True}
@@ -89,3 +97,42 @@ class TestModelFactory(unittest.TestCase):
             instance.name, None
         )  # default value defined in the field
         self.assertEqual(instance.is_valid, False)  # defined in the field
+
+    def test_CASE_build_many_SHOULD_return_instances_in_order(self):
+        rows = [
+            {"id": 1, "name": "foo", "type": "Example"},
+            {"id": 2, "foo_is_valid": True},
+        ]
+
+        instances = ModelFactory.build_many(
+            ExampleModel, rows, deferred_fields=["name"]
+        )
+
+        self.assertEqual([i.uid for i in instances], [1, 2])
+        self.assertEqual(instances[0]._name, "foo")
+        self.assertEqual(instances[1].is_valid, True)
+        self.assertEqual(instances[0]._deferred, set(["name"]))
+        self.assertIsNot(instances[0]._deferred, instances[1]._deferred)
+
+    def test_CASE_build_many_SHOULD_match_build(self):
+        rows = [
+            {"id": 1, "name": "foo", "type": "Example"},
+            {"id": 2, "foo_is_valid": True},
+        ]
+
+        for model_class in (ExampleModel, ExampleSlotsModel):
+            instances = ModelFactory.build_many(model_class, rows)
+
+            for instance, row in zip(instances, rows):
+                expected = ModelFactory.build(model_class, row)
+                self.assertEqual(
+                    ModelFactory.to_raw_values(instance),
+                    ModelFactory.to_raw_values(expected),
+                )
+                self.assertFalse(instance.is_dirty)
+
+            instances[1].name = "bar"
+            self.assertEqual(
+                instances[1].get_changes(), {"name": (None, "bar")}
+            )
+            self.assertFalse(instances[0].is_dirty)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# - asyncManagerCases.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import asyncio
+import threading
+import unittest
+
+from vfxDatabaseORM.core import models
+from vfxDatabaseORM.core.caches import IdentityMap
+from vfxDatabaseORM.core.factories import ModelFactory
+from vfxDatabaseORM.core.interfaces import AsyncIManager
+
+
+class FakeAsyncManager(AsyncIManager):
+    MAX_WORKERS = 4
+
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+    iterate_threads = []
+
+    def get(self, uid):
+        with FakeAsyncManager.lock:
+            FakeAsyncManager.running += 1
+            FakeAsyncManager.max_running = max(
+                FakeAsyncManager.max_running, FakeAsyncManager.running
+            )
+        time.sleep(0.01)
+        with FakeAsyncManager.lock:
+            FakeAsyncManager.running -= 1
+        return ModelFactory.build(self.model_class, {"id": uid})
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        return self.get_queryset().filter(**kwargs)
+
+    def execute(self, query):
+        rows = [
+            ModelFactory.build(
+                self.model_class,
+                {"id": i + 1, "code": "code_{}".format(i + 1)},
+            )
+            for i in range(5)
+        ]
+        if query.limit is None:
+            return rows[query.offset:]
+        return rows[query.offset:query.offset + query.limit]
+
+    def iterate(self, query, chunk_size):
+        FakeAsyncManager.iterate_threads.append(threading.current_thread())
+        return super(FakeAsyncManager, self).iterate(query, chunk_size)
+
+    def create(self, **kwargs):
+        return self.model_class(uid=1, **kwargs)
+
+    def insert(self, instance):
+        return instance
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeAsyncModel(models.Model):
+    manager_class = FakeAsyncManager
+    entity_name = "FakeAsync"
+
+    code = models.StringField("code")
+
+
+class TestAsyncManager(unittest.TestCase):
+    def tearDown(self):
+        FakeAsyncManager.max_running = 0
+        FakeAsyncManager.iterate_threads = []
+
+    def test_CASE_aget_SHOULD_not_block_the_event_loop(self):
+        async def run():
+            return await asyncio.gather(
+                *[FakeAsyncModel.objects.aget(uid) for uid in range(1, 13)]
+            )
+
+        instances = asyncio.run(run())
+
+        self.assertEqual([i.uid for i in instances], list(range(1, 13)))
+        self.assertGreater(FakeAsyncManager.max_running, 1)
+        self.assertLessEqual(
+            FakeAsyncManager.max_running, FakeAsyncManager.MAX_WORKERS
+        )
+
+    def test_CASE_await_afilters_SHOULD_return_list(self):
+        async def run():
+            return await FakeAsyncModel.objects.afilters(code="foo")[1:3]
+
+        instances = asyncio.run(run())
+
+        self.assertEqual([i.uid for i in instances], [2, 3])
+
+    def test_CASE_async_for_SHOULD_iterate_by_chunk(self):
+        async def run():
+            queryset = FakeAsyncModel.objects.aall()
+            return [i.uid async for i in queryset.aiterator(chunk_size=2)]
+
+        self.assertEqual(asyncio.run(run()), [1, 2, 3, 4, 5])
+        # The query, and its subqueries, are prepared in the executor
+        self.assertEqual(len(FakeAsyncManager.iterate_threads), 1)
+        self.assertIsNot(
+            FakeAsyncManager.iterate_threads[0], threading.current_thread()
+        )
+
+    def test_CASE_acreate_SHOULD_return_instance(self):
+        instance = asyncio.run(FakeAsyncModel.objects.acreate(code="foo"))
+
+        self.assertEqual(instance.code, "foo")
+
+    def test_CASE_identity_map_SHOULD_be_active_in_executor(self):
+        async def run():
+            with IdentityMap():
+                first = await FakeAsyncModel.objects.aget(1)
+                second = await FakeAsyncModel.objects.aget(1)
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        self.assertIs(first, second)
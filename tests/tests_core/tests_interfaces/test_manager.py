@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# - test_manager.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from vfxDatabaseORM.core import models, exceptions
+from vfxDatabaseORM.core.interfaces import IManager
+
+
+class FakeManager(IManager):
+    inserted = []
+    updated = []
+    sent = []
+    deleted = []
+
+    def get(self, uid):
+        return self.model_class(uid=uid)
+
+    def all(self):
+        return []
+
+    def filters(self, **kwargs):
+        return []
+
+    def create(self, **kwargs):
+        return self.model_class(uid=1)
+
+    def insert(self, instance):
+        if instance.code == "fail":
+            raise RuntimeError("Insert failed")
+        FakeManager.inserted.append(instance)
+        return self.model_class(
+            uid=len(FakeManager.inserted), code=instance.code
+        )
+
+    def update(self, instance):
+        FakeManager.updated.append(instance)
+        FakeManager.sent.append(sorted(f.name for f in instance._changed))
+        return True
+
+    def delete(self, instance):
+        FakeManager.deleted.append(instance)
+        return True
+
+
+class FakeManagerModel(models.Model):
+    manager_class = FakeManager
+
+    code = models.StringField("code")
+    frames = models.IntegerField("frames")
+
+
+class TestManager(unittest.TestCase):
+    def tearDown(self):
+        FakeManager.inserted = []
+        FakeManager.updated = []
+        FakeManager.sent = []
+        FakeManager.deleted = []
+
+    def test_CASE_bulk_create_SHOULD_return_instances_in_order(self):
+        instances = [
+            FakeManagerModel(code="foo"),
+            FakeManagerModel(code="bar"),
+        ]
+
+        result = FakeManagerModel.objects.bulk_create(instances)
+
+        self.assertEqual([i.uid for i in result], [1, 2])
+        self.assertEqual([i.code for i in result], ["foo", "bar"])
+
+    def test_CASE_bulk_create_WITH_failure_SHOULD_report_failed_items(self):
+        instances = [
+            FakeManagerModel(code="foo"),
+            FakeManagerModel(code="fail"),
+            FakeManagerModel(code="bar"),
+        ]
+
+        with self.assertRaises(exceptions.BulkOperationError) as context:
+            FakeManagerModel.objects.bulk_create(instances)
+
+        error = context.exception
+        self.assertEqual(len(FakeManager.inserted), 2)
+        self.assertEqual(
+            [i is None for i in error.results], [False, True, False]
+        )
+        self.assertEqual(len(error.errors), 1)
+        self.assertEqual(error.errors[0][0], 1)
+        self.assertIs(error.errors[0][1], instances[1])
+        self.assertIsInstance(error.errors[0][2], RuntimeError)
+
+    def test_CASE_bulk_update_SHOULD_reset_changes(self):
+        instance = FakeManagerModel(uid=1, code="foo")
+        instance.code = "bar"
+
+        self.assertTrue(instance.is_dirty)
+
+        result = FakeManagerModel.objects.bulk_update([instance])
+
+        self.assertEqual(result, [instance])
+        self.assertEqual(FakeManager.updated, [instance])
+        self.assertFalse(instance.is_dirty)
+        self.assertEqual(instance._changed, {})
+
+    def test_CASE_bulk_update_WITH_fields_SHOULD_keep_other_changes(self):
+        instance = FakeManagerModel(uid=1, code="foo")
+        instance._reset_changes()
+        instance.code = "bar"
+        instance.frames = 99
+
+        FakeManagerModel.objects.bulk_update([instance], fields=["code"])
+
+        self.assertEqual(FakeManager.sent, [["code"]])
+        self.assertTrue(instance.is_dirty)
+        self.assertEqual(instance.get_changes(), {"frames": (None, 99)})
+
+    def test_CASE_bulk_update_SHOULD_clear_related_cache(self):
+        instance = FakeManagerModel(uid=1, code="foo")
+        instance._set_related_cache("links", [FakeManagerModel(uid=2)])
+        instance.code = "bar"
+
+        FakeManagerModel.objects.bulk_update([instance])
+
+        self.assertEqual(instance._related_cache, {})
+
+    def test_CASE_bulk_delete_SHOULD_delete(self):
+        instances = [FakeManagerModel(uid=1), FakeManagerModel(uid=2)]
+
+        result = FakeManagerModel.objects.bulk_delete(instances)
+
+        self.assertEqual(result, [True, True])
+        self.assertEqual(FakeManager.deleted, instances)
+
+    def test_CASE_run_in_batches_SHOULD_split_instances(self):
+        batches = []
+
+        def run_batch(batch):
+            batches.append(batch)
+            return batch
+
+        manager = FakeManagerModel.objects
+        result = manager._run_in_batches(range(5), 2, run_batch)
+
+        self.assertEqual(result, [0, 1, 2, 3, 4])
+        self.assertEqual(batches, [[0, 1], [2, 3], [4]])
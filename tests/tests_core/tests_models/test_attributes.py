@@ -39,6 +39,7 @@ class FakeManager(IManager):
     get_was_called = False
     all_was_called = False
     filters_was_called = False
+    filters_call_count = 0
 
     should_return_one_value = False
     should_return_nothing = False
@@ -56,6 +57,7 @@ class FakeManager(IManager):
 
     def filters(self, **kwargs):
         self.filters_was_called = True
+        FakeManager.filters_call_count += 1
         if self.should_return_one_value:
             return [self.model_class(uid=i) for i in range(1)]
         if self.should_return_nothing:
@@ -127,12 +129,13 @@ class TestAttributeDescriptor(unittest.TestCase):
         FakeManager.filters_was_called = False
         FakeManager.should_return_one_value = False
         FakeManager.should_return_nothing = False
+        FakeManager.filters_call_count = 0
 
     # __set__
     def test_CASE_set_on_class_init_WITH_valid_data_SHOULD_set(self):
         fake_model = FakeModel1(uid=5)
 
-        self.assertEqual(fake_model._changed, [])
+        self.assertEqual(fake_model._changed, {})
         self.assertEqual(fake_model.uid, 5)
 
     def test_CASE_set_on_class_init_WITH_invalid_data_SHOULD_raise(self):
@@ -163,6 +166,17 @@ class TestAttributeDescriptor(unittest.TestCase):
         self.assertEqual(fake_model.code, "foo")
         self.assertEqual(len(fake_model._changed), 0)
 
+    def test_CASE_set_on_instantiated_class_WITH_original_data_SHOULD_unset(
+        self,
+    ):
+        fake_model = FakeModel1(uid=5, code="foo")
+
+        fake_model.code = "bar"
+        fake_model.code = "foo"
+
+        self.assertEqual(fake_model.code, "foo")
+        self.assertEqual(fake_model._changed, {})
+
     def test_CASE_set_on_instantiated_class_WITH_read_only_field_SHOULD_raise(
         self,
     ):
@@ -257,3 +271,32 @@ class TestAttributeDescriptor(unittest.TestCase):
 
         with self.assertRaises(exceptions.FieldBadType):
             fake_model.bad_field
+
+    def test_CASE_get_on_related_field_twice_SHOULD_query_once(self):
+        fake_model = FakeModel1(uid=5, code="foo")
+
+        result_0 = fake_model.many
+        result_1 = fake_model.many
+
+        self.assertEqual(result_0, result_1)
+        self.assertEqual(FakeManager.filters_call_count, 1)
+
+    def test_CASE_get_on_related_field_after_refresh_SHOULD_query_again(
+        self,
+    ):
+        fake_model = FakeModel1(uid=5, code="foo")
+
+        fake_model.many
+        fake_model.refresh_from_db(fields=["many"])
+        fake_model.many
+
+        self.assertEqual(FakeManager.filters_call_count, 2)
+
+    def test_CASE_get_on_related_field_after_save_SHOULD_query_again(self):
+        fake_model = FakeModel1(uid=5, code="foo")
+
+        fake_model.many
+        fake_model.save(code="bar")
+        fake_model.many
+
+        self.assertEqual(FakeManager.filters_call_count, 2)
@@ -128,6 +128,12 @@ class TestField(unittest.TestCase):
         self.assertEqual(result.related_field_name, "temp")
         self.assertEqual(result.lookup, "is")
 
+        result = field.compute_lookup("foo__temp__other__isnot")
+
+        self.assertEqual(result.field_name, "foo")
+        self.assertEqual(result.related_field_name, "temp__other")
+        self.assertEqual(result.lookup, "isnot")
+
     def test_CASE_compute_lookup_WITH_invalid_name_lookup_SHOULD_return_computed_lookup(
         self,
     ):
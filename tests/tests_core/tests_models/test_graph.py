@@ -24,6 +24,12 @@
 
 import unittest
 
+try:
+    import networkx
+except ImportError:
+    networkx = None
+
+from vfxDatabaseORM.core import exceptions
 from vfxDatabaseORM.core.models.graph import Graph
 
 
@@ -119,3 +125,64 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(
             graph.edges, [("A", "B", {"on_attr": "foo", "origin": "A"})]
         )
+
+    def test_CASE_get_neighbors_SHOULD_return_connected_nodes(self):
+        graph = Graph()
+        graph.add_node("A")
+        graph.add_node("B")
+        graph.add_node("C")
+        graph.connect_nodes("A", "B", on_attr="foo")
+
+        self.assertEqual(graph.get_neighbors("A"), ["B"])
+        self.assertEqual(graph.get_neighbors("B"), ["A"])
+        self.assertEqual(graph.get_neighbors("C"), [])
+
+    def test_CASE_connect_nodes_WITH_missing_node_SHOULD_create_it(self):
+        graph = Graph()
+        graph.add_node("A")
+        graph.connect_nodes("A", "B", on_attr="foo")
+
+        self.assertEqual([name for name, _ in graph.nodes], ["A", "B"])
+        self.assertIsNone(graph.get_node_model("B"))
+
+        # Registering the model later keeps the edge
+        graph.add_node("B")
+        graph.add_attribute_to_node("B", "model", FakeModel)
+
+        self.assertEqual(graph.get_node_model("B"), FakeModel)
+        self.assertEqual(graph.get_neighbors("B"), ["A"])
+
+    def test_CASE_connect_nodes_twice_SHOULD_update_edge(self):
+        graph = Graph()
+        graph.add_node("A")
+        graph.add_node("B")
+        graph.connect_nodes("A", "B", on_attr="foo")
+        graph.connect_nodes("B", "A", on_attr="bar")
+
+        self.assertEqual(
+            graph.edges, [("A", "B", {"on_attr": "bar", "origin": "B"})]
+        )
+
+    def test_CASE_get_node_model_WITH_unknown_node_SHOULD_raise(self):
+        graph = Graph()
+
+        with self.assertRaises(exceptions.ModelNotRegistered):
+            graph.get_node_model("A")
+        with self.assertRaises(exceptions.ModelNotRegistered):
+            graph.get_neighbors("A")
+
+    @unittest.skipIf(networkx is None, "networkx is not installed")
+    def test_CASE_to_networkx_SHOULD_copy_graph(self):
+        graph = Graph()
+        graph.add_node("A")
+        graph.add_node("B")
+        graph.add_attribute_to_node("A", "model", FakeModel)
+        graph.connect_nodes("A", "B", on_attr="foo")
+
+        nx_graph = graph.to_networkx()
+
+        self.assertEqual(nx_graph.nodes["A"]["model"], FakeModel)
+        self.assertEqual(
+            list(nx_graph.edges(data=True)),
+            [("A", "B", {"on_attr": "foo", "origin": "A"})],
+        )
@@ -70,6 +70,24 @@ class FakeModelB(models.Model):
     )
 
 
+class FakeSlotsModel(models.Model):
+    entity_name = "FakeSlotsModel"
+    manager_class = FakeManager
+    use_slots = True
+
+    name = models.StringField("name", default="foo")
+    related_field = models.OneToOneField(
+        "related_slots", to="FakeSlotsModel", related_db_name="related_slots"
+    )
+
+
+class FakeInheritedSlotsModel(FakeSlotsModel):
+    entity_name = "FakeInheritedSlotsModel"
+    manager_class = FakeManager
+
+    code = models.StringField("code", default="bar")
+
+
 class TestModel(unittest.TestCase):
     def tearDown(self):
         FakeManager.update_was_called = False
@@ -198,6 +216,192 @@ class TestModel(unittest.TestCase):
         with self.assertRaises(exceptions.FieldBadValue):
             model.save(name=1)
 
+    # refresh_from_db() tests
+    def test_CASE_refresh_from_db_SHOULD_discard_changes(self):
+        model = FakeModelB(uid=1, name="foo")
+        model.name = "bar"
+
+        self.assertTrue(model.is_dirty)
+
+        model.refresh_from_db()
+
+        self.assertEqual(model.name, None)  # value returned by the manager
+        self.assertFalse(model.is_dirty)
+        self.assertEqual(model._changed, {})
+
+    def test_CASE_refresh_from_db_WITH_fields_SHOULD_refresh_only_fields(
+        self,
+    ):
+        model = FakeModelB(uid=1, name="foo")
+        model.name = "bar"
+
+        model.refresh_from_db(fields=["uid"])
+
+        self.assertEqual(model.name, "bar")
+        self.assertTrue(model.is_dirty)
+
+    def test_CASE_refresh_from_db_WITH_invalid_field_SHOULD_raise(self):
+        model = FakeModelB(uid=1, name="foo")
+
+        with self.assertRaises(exceptions.FieldNotFound):
+            model.refresh_from_db(fields=["nothing"])
+
+    # get_changes() tests
+    def test_CASE_get_changes_SHOULD_return_original_and_new_values(self):
+        model = FakeModelB(uid=1, name="foo")
+        model.name = "bar"
+
+        self.assertEqual(model.get_changes(), {"name": ("foo", "bar")})
+
+    def test_CASE_get_changes_WITH_deferred_field_SHOULD_return_none(self):
+        model = FakeModelB._from_db({"id": 3}, deferred_fields=["name"])
+        model.name = "bar"
+
+        self.assertEqual(model.get_changes(), {"name": (None, "bar")})
+
+    # revert() tests
+    def test_CASE_revert_SHOULD_restore_original_values(self):
+        model = FakeModelB(uid=1, name="foo")
+        model.name = "bar"
+
+        model.revert()
+
+        self.assertEqual(model.name, "foo")
+        self.assertFalse(model.is_dirty)
+
+    def test_CASE_revert_WITH_fields_SHOULD_revert_only_fields(self):
+        model = FakeSlotsModel(uid=1, name="foo")
+        model.name = "bar"
+        model.related_field = FakeSlotsModel(uid=2)
+
+        model.revert(fields=["name"])
+
+        self.assertEqual(model.name, "foo")
+        self.assertEqual(list(model.get_changes()), ["related_field"])
+
+    def test_CASE_revert_WITH_deferred_field_SHOULD_defer_it_again(self):
+        model = FakeModelB._from_db({"id": 3}, deferred_fields=["name"])
+        model.name = "bar"
+
+        model.revert()
+
+        self.assertFalse(model.is_dirty)
+        self.assertEqual(model._deferred, set(["name"]))
+
+    # _from_db() tests
+    def test_CASE_from_db_SHOULD_build_clean_instance(self):
+        model = FakeModelB._from_db(
+            {"type": "FakeModel", "id": 3, "name": "foo"},
+            deferred_fields=["name"],
+        )
+
+        self.assertEqual(model.uid, 3)
+        self.assertEqual(model._name, "foo")
+        self.assertEqual(model._deferred, set(["name"]))
+        self.assertFalse(model.is_dirty)
+        self.assertEqual(model._changed, {})
+
+    def test_CASE_from_db_SHOULD_not_check_values(self):
+        model = FakeModelB._from_db({"id": 3, "name": 5})
+
+        self.assertEqual(model._name, 5)
+
+    def test_CASE_from_db_WITH_validate_db_values_SHOULD_raise(self):
+        FakeModelB.validate_db_values = True
+        try:
+            with self.assertRaises(exceptions.FieldBadValue):
+                FakeModelB._from_db({"id": 3, "name": 5})
+        finally:
+            del FakeModelB.validate_db_values
+
+    # use_slots tests
+    def test_CASE_use_slots_SHOULD_not_have_dict(self):
+        model = FakeSlotsModel(uid=2)
+
+        self.assertFalse(hasattr(model, "__dict__"))
+        self.assertTrue(hasattr(FakeModelB(uid=2), "__dict__"))
+        self.assertEqual(model.uid, 2)
+        self.assertEqual(model.name, "foo")  # Default value
+        self.assertFalse(model.is_dirty)
+
+        with self.assertRaises(AttributeError):
+            model.foo = "bar"
+
+    def test_CASE_use_slots_WITH_parent_model_SHOULD_be_inherited(self):
+        model = FakeInheritedSlotsModel(uid=2, code="baz")
+
+        self.assertTrue(FakeInheritedSlotsModel._meta.use_slots)
+        self.assertFalse(hasattr(model, "__dict__"))
+        self.assertEqual(model.uid, 2)
+        self.assertEqual(model.code, "baz")
+        # Slots of the parent model are not defined twice
+        self.assertNotIn("_changed", FakeInheritedSlotsModel.__slots__)
+
+    def test_CASE_use_slots_SHOULD_track_changes(self):
+        model = FakeSlotsModel(uid=2)
+        related_model = FakeSlotsModel(uid=3)
+
+        model.name = "bar"
+        model.related_field = related_model
+
+        self.assertTrue(model.is_dirty)
+        self.assertEqual(model.name, "bar")
+        self.assertIs(model.related_field, related_model)
+        self.assertEqual(len(model._changed), 2)
+
+    def test_CASE_use_slots_WITH_from_db_SHOULD_build_instance(self):
+        model = FakeSlotsModel._from_db({"id": 3})
+
+        self.assertEqual(model.uid, 3)
+        self.assertEqual(model.name, "foo")
+        self.assertFalse(model.is_dirty)
+
+    def test_CASE_instances_without_changes_SHOULD_share_empty_dicts(self):
+        for model_class in (FakeModelB, FakeSlotsModel):
+            model_0 = model_class._from_db({"id": 3, "name": "foo"})
+            model_1 = model_class(uid=4, name="foo")
+
+            self.assertIs(model_0._changed, model_1._changed)
+            self.assertIs(model_0._related_cache, model_1._related_cache)
+
+            model_0.name = "bar"
+            model_0._set_related_cache("related_field", [])
+
+            self.assertEqual(model_0.get_changes(), {"name": ("foo", "bar")})
+            self.assertEqual(model_0._related_cache, {"related_field": []})
+            self.assertEqual(model_1._changed, {})
+            self.assertEqual(model_1._related_cache, {})
+
+            model_0.save()
+
+            self.assertIs(model_0._changed, model_1._changed)
+            self.assertIs(model_0._related_cache, model_1._related_cache)
+
+    # objects / serializer tests
+    def test_CASE_objects_SHOULD_return_same_manager(self):
+        manager = FakeModelA.objects
+
+        self.assertIsInstance(manager, FakeManager)
+        self.assertIs(manager.model_class, FakeModelA)
+        self.assertIs(FakeModelA.objects, manager)
+        self.assertIsNot(FakeModelB.objects, manager)
+
+    def test_CASE_reset_manager_SHOULD_create_new_manager(self):
+        manager = FakeModelA.objects
+
+        FakeModelA.reset_manager()
+
+        self.assertIsNot(FakeModelA.objects, manager)
+
+    def test_CASE_serializer_SHOULD_return_same_serializer(self):
+        serializer = FakeModelA.serializer
+
+        self.assertIs(FakeModelA.serializer, serializer)
+
+        FakeModelA.reset_serializer()
+
+        self.assertIsNot(FakeModelA.serializer, serializer)
+
     # delete() tests
     def test_CASE_delete_SHOULD_delete(self):
         # TODO
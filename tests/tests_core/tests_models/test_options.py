@@ -68,3 +68,23 @@ class TestOptions(unittest.TestCase):
 
         self.assertEqual(len(options.fields), 0)
         self.assertEqual(len(options.related_fields), 1)
+
+    def test_CASE_add_fields_SHOULD_index_fields(self):
+        field = Field("foo")
+        field._name = "foo_name"
+        related_field = RelatedField("bar", to="Bar", related_db_name="baz")
+        related_field._name = "bar_name"
+
+        options = Options()
+        options.add_field(field)
+        options.add_related_field(related_field)
+
+        self.assertIs(options.get_field("foo_name"), field)
+        self.assertIs(options.get_field("bar_name"), related_field)
+        self.assertIsNone(options.get_field("unknown"))
+        self.assertIs(options.get_field_by_db_name("foo"), field)
+        self.assertIsNone(options.get_field_by_db_name("bar"))
+        self.assertIs(
+            options.get_related_field_by_db_name("bar"), related_field
+        )
+        self.assertEqual(options.field_names, frozenset(["foo_name"]))
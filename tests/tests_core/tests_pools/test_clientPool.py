@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# - test_clientPool.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import threading
+import unittest
+
+from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.pools import ClientPool
+
+
+class FakeClient(object):
+    pass
+
+
+class TestClientPool(unittest.TestCase):
+    def test_CASE_acquire_SHOULD_create_clients_lazily(self):
+        pool = ClientPool(FakeClient, max_size=2)
+
+        self.assertEqual(pool.size, 0)
+
+        with pool.connection() as client:
+            self.assertIsInstance(client, FakeClient)
+            self.assertEqual(pool.size, 1)
+
+        # The client has been returned, it is reused
+        with pool.connection() as other_client:
+            self.assertIs(client, other_client)
+        self.assertEqual(pool.size, 1)
+
+    def test_CASE_acquire_twice_in_thread_SHOULD_return_same_client(self):
+        pool = ClientPool(FakeClient, max_size=1)
+
+        with pool.connection() as client:
+            with pool.connection(timeout=0.01) as nested_client:
+                self.assertIs(client, nested_client)
+            # Still held by the thread after the nested release
+            self.assertEqual(pool._idle_clients, [])
+
+        self.assertEqual(pool._idle_clients, [client])
+
+    def test_CASE_acquire_WITH_threads_SHOULD_use_one_client_per_thread(self):
+        pool = ClientPool(FakeClient, max_size=2)
+        clients = []
+        barrier = threading.Event()
+
+        def work():
+            with pool.connection() as client:
+                clients.append(client)
+                barrier.wait(1)
+
+        threads = [threading.Thread(target=work) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while len(clients) < 2:
+            time.sleep(0.001)
+        barrier.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertIsNot(clients[0], clients[1])
+        self.assertEqual(pool.size, 2)
+
+    def test_CASE_acquire_WITH_exhausted_pool_SHOULD_raise(self):
+        pool = ClientPool(FakeClient, max_size=1)
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def work():
+            with pool.connection():
+                acquired.set()
+                release.wait(1)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        acquired.wait(1)
+
+        with self.assertRaises(exceptions.PoolExhausted):
+            pool.acquire(timeout=0.01)
+
+        release.set()
+        thread.join()
+
+        # The client has been returned, it can be checked out now
+        client = pool.acquire(timeout=0.01)
+        self.assertIsInstance(client, FakeClient)
+        pool.release(client)
+
+    def test_CASE_acquire_WITH_failing_factory_SHOULD_free_place(self):
+        def factory():
+            raise RuntimeError("Authentication failed")
+
+        pool = ClientPool(factory, max_size=1)
+
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+
+        self.assertEqual(pool.size, 0)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# - test_aggregates.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from vfxDatabaseORM.core import models
+from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.queries import Avg, Count, Max, Min, Sum
+from vfxDatabaseORM.core.queries.aggregates import aggregate_rows
+
+
+class FakeAggregateManager(IManager):
+    def get(self, uid):
+        return None
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        return self.get_queryset().filter(**kwargs)
+
+    def create(self, **kwargs):
+        return None
+
+    def insert(self, instance):
+        return None
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeAggregateModel(models.Model):
+    manager_class = FakeAggregateManager
+
+    frame_count = models.IntegerField("frame_count")
+    status = models.StringField("sg_status_list")
+
+
+ROWS = [
+    {"id": 1, "frame_count": 10, "sg_status_list": "apr"},
+    {"id": 2, "frame_count": 30, "sg_status_list": "rev"},
+    {"id": 3, "frame_count": None, "sg_status_list": "apr"},
+    {"id": 4, "frame_count": 20, "sg_status_list": "apr"},
+]
+
+
+class TestAggregates(unittest.TestCase):
+    def test_CASE_default_alias_SHOULD_contain_function(self):
+        self.assertEqual(Sum("frame_count").default_alias, "frame_count__sum")
+        self.assertEqual(Count().default_alias, "uid__count")
+
+    def test_CASE_aggregate_rows_SHOULD_ignore_empty_values(self):
+        result = aggregate_rows(
+            FakeAggregateModel,
+            iter(ROWS),
+            {
+                "count": Count(),
+                "frames": Count("frame_count"),
+                "sum": Sum("frame_count"),
+                "avg": Avg("frame_count"),
+                "min": Min("frame_count"),
+                "max": Max("frame_count"),
+            },
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "count": 4,
+                "frames": 3,
+                "sum": 60,
+                "avg": 20.0,
+                "min": 10,
+                "max": 30,
+            },
+        )
+
+    def test_CASE_aggregate_rows_WITH_no_rows_SHOULD_return_empty_results(
+        self,
+    ):
+        result = aggregate_rows(
+            FakeAggregateModel, [], {"count": Count(), "avg": Avg("uid")}
+        )
+
+        self.assertEqual(result, {"count": 0, "avg": None})
+
+    def test_CASE_aggregate_rows_WITH_group_by_SHOULD_return_groups(self):
+        result = aggregate_rows(
+            FakeAggregateModel,
+            ROWS,
+            {"frame_count__sum": Sum("frame_count")},
+            group_by=["status"],
+        )
+
+        self.assertEqual(
+            result,
+            [
+                {"status": "apr", "frame_count__sum": 30},
+                {"status": "rev", "frame_count__sum": 30},
+            ],
+        )
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# - test_lookups.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from vfxDatabaseORM.core import models, exceptions
+from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.queries import CompiledLookup, compile_lookup
+
+
+class FakeLookupManager(IManager):
+    def get(self, uid):
+        return None
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        return self.get_queryset().filter(**kwargs)
+
+    def create(self, **kwargs):
+        return None
+
+    def insert(self, instance):
+        return None
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeLookupModel(models.Model):
+    entity_name = "FakeLookupModel"
+    manager_class = FakeLookupManager
+
+    code = models.StringField("code")
+    parent = models.OneToOneField(
+        "parent", to="FakeLookupModel", related_db_name="children"
+    )
+
+
+class TestLookups(unittest.TestCase):
+    def test_CASE_compile_lookup_SHOULD_resolve_field(self):
+        result = compile_lookup(FakeLookupModel, "code__startswith")
+
+        self.assertEqual(
+            result,
+            CompiledLookup(
+                FakeLookupModel.get_field("code"),
+                None,
+                None,
+                "startswith",
+                (),
+            ),
+        )
+
+    def test_CASE_compile_lookup_WITH_related_lookup_SHOULD_resolve_model(
+        self,
+    ):
+        result = compile_lookup(FakeLookupModel, "parent__code__isnot")
+
+        self.assertEqual(result.field, FakeLookupModel.get_field("parent"))
+        self.assertIs(result.related_model, FakeLookupModel)
+        self.assertEqual(
+            result.related_field, FakeLookupModel.get_field("code")
+        )
+        self.assertEqual(result.lookup, "isnot")
+
+    def test_CASE_compile_lookup_WITH_deep_lookup_SHOULD_resolve_path(
+        self,
+    ):
+        result = compile_lookup(FakeLookupModel, "parent__parent__code__is")
+
+        self.assertEqual(result.field, FakeLookupModel.get_field("parent"))
+        self.assertEqual(
+            result.related_path,
+            (
+                (FakeLookupModel, FakeLookupModel.get_field("parent")),
+                (FakeLookupModel, FakeLookupModel.get_field("code")),
+            ),
+        )
+        self.assertEqual(
+            result.related_field, FakeLookupModel.get_field("code")
+        )
+
+    def test_CASE_compile_lookup_WITH_deep_lookup_SHOULD_check_last_field(
+        self,
+    ):
+        for arg_name in (
+            "parent__code__contains",
+            "parent__parent__code__startswith",
+        ):
+            result = compile_lookup(FakeLookupModel, arg_name)
+            self.assertEqual(
+                result.related_field, FakeLookupModel.get_field("code")
+            )
+            self.assertEqual(result.lookup, arg_name.rsplit("__", 1)[1])
+
+        with self.assertRaises(exceptions.InvalidLookUp):
+            compile_lookup(FakeLookupModel, "parent__parent__startswith")
+
+    def test_CASE_compile_lookup_WITH_invalid_deep_lookup_SHOULD_raise(self):
+        with self.assertRaises(exceptions.InvalidLookUp):
+            compile_lookup(FakeLookupModel, "parent__code__uid__is")
+
+        with self.assertRaises(exceptions.FieldNotFound):
+            compile_lookup(FakeLookupModel, "parent__nothing__code__is")
+
+    def test_CASE_compile_lookup_SHOULD_be_memoized(self):
+        result = compile_lookup(FakeLookupModel, "code__endswith")
+
+        self.assertIs(
+            compile_lookup(FakeLookupModel, "code__endswith"), result
+        )
+        self.assertIs(
+            FakeLookupModel._meta.compiled_lookups["code__endswith"], result
+        )
+
+    def test_CASE_compile_lookup_WITH_unknown_field_SHOULD_return_none(self):
+        self.assertIsNone(compile_lookup(FakeLookupModel, "nothing__is"))
+
+    def test_CASE_compile_lookup_WITH_invalid_lookup_SHOULD_raise(self):
+        with self.assertRaises(exceptions.InvalidLookUp):
+            compile_lookup(FakeLookupModel, "code__foo")
+
+        self.assertNotIn("code__foo", FakeLookupModel._meta.compiled_lookups)
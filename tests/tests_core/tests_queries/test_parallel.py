@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# - test_parallel.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import threading
+import unittest
+
+from vfxDatabaseORM.core import models
+from vfxDatabaseORM.core.caches import IdentityMap
+from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.factories import ModelFactory
+from vfxDatabaseORM.core.queries import gather, run_in_parallel
+
+
+class FakeParallelManager(IManager):
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def get(self, uid):
+        return ModelFactory.build(self.model_class, {"id": uid})
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        return self.get_queryset().filter(**kwargs)
+
+    def execute(self, query):
+        with FakeParallelManager.lock:
+            FakeParallelManager.running += 1
+            FakeParallelManager.max_running = max(
+                FakeParallelManager.max_running, FakeParallelManager.running
+            )
+        time.sleep(0.01)
+        with FakeParallelManager.lock:
+            FakeParallelManager.running -= 1
+
+        _, code = query.where.children[0]
+        if code == "fail":
+            raise RuntimeError("Query failed")
+        return [ModelFactory.build(self.model_class, {"id": 1, "code": code})]
+
+    def create(self, **kwargs):
+        return self.model_class(uid=1)
+
+    def insert(self, instance):
+        return instance
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeParallelModel(models.Model):
+    manager_class = FakeParallelManager
+    entity_name = "FakeParallel"
+
+    code = models.StringField("code")
+
+
+class TestParallel(unittest.TestCase):
+    def tearDown(self):
+        FakeParallelManager.max_running = 0
+
+    def test_CASE_gather_SHOULD_return_results_in_order(self):
+        querysets = [
+            FakeParallelModel.objects.filters(code="code_{}".format(i))
+            for i in range(4)
+        ]
+
+        results = FakeParallelModel.objects.gather(*querysets)
+
+        self.assertEqual(
+            [[i.code for i in result] for result in results],
+            [["code_0"], ["code_1"], ["code_2"], ["code_3"]],
+        )
+        self.assertGreater(FakeParallelManager.max_running, 1)
+        # QuerySets keep their results
+        self.assertIsNotNone(querysets[0]._result_cache)
+
+    def test_CASE_gather_WITH_max_workers_SHOULD_limit_threads(self):
+        querysets = [
+            FakeParallelModel.objects.filters(code="code_{}".format(i))
+            for i in range(4)
+        ]
+
+        gather(*querysets, max_workers=2)
+
+        self.assertLessEqual(FakeParallelManager.max_running, 2)
+
+    def test_CASE_gather_WITH_failure_SHOULD_raise(self):
+        with self.assertRaises(RuntimeError):
+            gather(
+                FakeParallelModel.objects.filters(code="foo"),
+                FakeParallelModel.objects.filters(code="fail"),
+            )
+
+    def test_CASE_run_in_parallel_SHOULD_share_identity_map(self):
+        with IdentityMap():
+            instance = FakeParallelModel.objects.get(1)
+            first, second = run_in_parallel(
+                lambda: FakeParallelModel.objects.get(1),
+                lambda: FakeParallelModel.objects.get(1),
+            )
+
+        self.assertIs(first, instance)
+        self.assertIs(second, instance)
+
+    def test_CASE_run_in_parallel_WITH_unknown_argument_SHOULD_raise(self):
+        with self.assertRaises(TypeError):
+            run_in_parallel(lambda: 1, workers=2)
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+#
+# - test_planner.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from vfxDatabaseORM.core import models, exceptions
+from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.factories import ModelFactory
+from vfxDatabaseORM.core.queries import (
+    Q,
+    filter_rows,
+    find_related_path,
+    plan_query,
+)
+
+ROWS = {
+    "FakePlanSequence": [
+        {"id": 1, "code": "SEQ01"},
+        {"id": 2, "code": "SEQ02"},
+    ],
+    "FakePlanShot": [
+        {"id": 10, "sequence": {"type": "FakePlanSequence", "id": 1}},
+        {"id": 11, "sequence": {"type": "FakePlanSequence", "id": 2}},
+        {"id": 12, "sequence": {"type": "FakePlanSequence", "id": 1}},
+    ],
+    "FakePlanVersion": [
+        {"id": 100, "shot": {"type": "FakePlanShot", "id": 10}},
+        {"id": 101, "shot": {"type": "FakePlanShot", "id": 11}},
+        {"id": 102, "shot": {"type": "FakePlanShot", "id": 12}},
+    ],
+}
+
+
+class FakePlanManager(IManager):
+    """Filter rows in memory, without following related models."""
+
+    MAX_FILTER_DEPTH = 0
+
+    executed_queries = []
+
+    def get(self, uid):
+        return None
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, *args, **kwargs):
+        return self.get_queryset().filter(*args, **kwargs)
+
+    def execute(self, query):
+        FakePlanManager.executed_queries.append(query)
+        rows = filter_rows(
+            self.model_class,
+            query.where,
+            ROWS[self.model_class.__name__],
+        )
+        return ModelFactory.build_many(self.model_class, rows)
+
+    def create(self, **kwargs):
+        return None
+
+    def insert(self, instance):
+        return None
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeDeepPlanManager(FakePlanManager):
+    MAX_FILTER_DEPTH = None
+
+
+class FakePlanSequence(models.Model):
+    entity_name = "FakePlanSequence"
+    manager_class = FakePlanManager
+
+    code = models.StringField("code")
+
+
+class FakePlanShot(models.Model):
+    entity_name = "FakePlanShot"
+    manager_class = FakePlanManager
+
+    sequence = models.OneToOneField(
+        "sequence", to="FakePlanSequence", related_db_name="shots"
+    )
+
+
+class FakePlanVersion(models.Model):
+    entity_name = "FakePlanVersion"
+    manager_class = FakePlanManager
+
+    shot = models.OneToOneField(
+        "shot", to="FakePlanShot", related_db_name="versions"
+    )
+
+
+class FakePlanReview(models.Model):
+    entity_name = "FakePlanReview"
+    manager_class = FakePlanManager
+
+    shot = models.OneToOneField(
+        "shot", to="FakePlanShot", related_db_name="reviews"
+    )
+    reference_shot = models.OneToOneField(
+        "reference_shot", to="FakePlanShot", related_db_name="references"
+    )
+
+
+class TestPlanner(unittest.TestCase):
+    def tearDown(self):
+        FakePlanManager.executed_queries = []
+
+    def test_CASE_find_related_path_SHOULD_return_shortest_path(self):
+        self.assertEqual(
+            find_related_path(FakePlanVersion, FakePlanSequence),
+            ["shot", "sequence"],
+        )
+        self.assertEqual(
+            find_related_path(FakePlanVersion, FakePlanVersion), []
+        )
+
+    def test_CASE_find_related_path_WITHOUT_path_SHOULD_raise(self):
+        with self.assertRaises(exceptions.InvalidQuery):
+            find_related_path(FakePlanSequence, FakePlanVersion)
+
+    def test_CASE_find_related_path_WITH_several_paths_SHOULD_raise(self):
+        with self.assertRaises(exceptions.InvalidQuery):
+            find_related_path(FakePlanReview, FakePlanSequence)
+
+        with self.assertRaises(exceptions.InvalidQuery):
+            FakePlanReview.objects.all().filter_related(
+                FakePlanShot, uid=10
+            )
+
+    def test_CASE_plan_query_WITH_deep_filters_SHOULD_keep_lookups(self):
+        queryset = FakePlanVersion.objects.filters(
+            shot__sequence__code__is="SEQ01"
+        )
+
+        plan = plan_query(FakeDeepPlanManager(FakePlanVersion), queryset.query)
+
+        self.assertIs(plan.get_query(), queryset.query)
+        self.assertEqual(plan.round_trips, 1)
+        self.assertEqual(
+            plan.explain(),
+            "FakePlanVersion on FakeDeepPlanManager: 1 round trip\n"
+            "  query: find FakePlanVersion (1 round trip)\n"
+            "  deep filter: shot__sequence__code__is through FakePlanShot, "
+            "FakePlanSequence",
+        )
+
+    def test_CASE_explain_WITH_limited_depth_SHOULD_plan_subqueries(self):
+        queryset = FakePlanVersion.objects.filters(
+            shot__sequence__code__is="SEQ01"
+        ).prefetch_related("shot")
+
+        self.assertEqual(
+            queryset.explain(),
+            "FakePlanVersion on FakePlanManager: 3 round trips\n"
+            "  query: find FakePlanVersion (1 round trip)\n"
+            "  in-subquery: shot__sequence__code__is as shot__in "
+            "on FakePlanShot (2 round trips)\n"
+            "    FakePlanShot on FakePlanManager: 2 round trips\n"
+            "      query: find FakePlanShot (1 round trip)\n"
+            "      in-subquery: sequence__code__is as sequence__in "
+            "on FakePlanSequence (1 round trip)\n"
+            "        FakePlanSequence on FakePlanManager: 1 round trip\n"
+            "          query: find FakePlanSequence (1 round trip)",
+        )
+        self.assertEqual(FakePlanManager.executed_queries, [])
+
+    def test_CASE_evaluate_WITH_limited_depth_SHOULD_run_subqueries(self):
+        queryset = FakePlanVersion.objects.filters(
+            ~Q(shot__sequence__code__is="SEQ01") | Q(uid=100)
+        )
+
+        self.assertEqual([version.uid for version in queryset], [100, 101])
+        self.assertEqual(len(FakePlanManager.executed_queries), 3)
+
+    def test_CASE_subqueries_SHOULD_run_once_per_queryset(self):
+        queryset = FakePlanVersion.objects.filters(
+            shot__sequence__code__is="SEQ01"
+        )
+
+        self.assertTrue(queryset.exists())
+        self.assertEqual(queryset.count(), 2)
+        self.assertEqual([version.uid for version in queryset], [100, 102])
+        # 2 subqueries, then exists(), count() and the evaluation
+        self.assertEqual(len(FakePlanManager.executed_queries), 5)
+
+    def test_CASE_filter_related_SHOULD_filter_through_path(self):
+        queryset = FakePlanVersion.objects.all().filter_related(
+            "FakePlanSequence", code="SEQ02"
+        )
+
+        self.assertEqual(
+            queryset.query.where, Q(shot__sequence__code__is="SEQ02")
+        )
+        self.assertEqual([version.uid for version in queryset], [101])
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# - test_prefetch.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from vfxDatabaseORM.core import models, exceptions
+from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.queries import prefetch_related_objects
+
+
+class FakeManager(IManager):
+    filters_calls = []
+
+    def get(self, uid):
+        return self.model_class(uid=uid)
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        FakeManager.filters_calls.append(kwargs)
+        return self.get_queryset().filter(**kwargs)
+
+    def execute(self, query):
+        if self.model_class is FakePrefetchShot:
+            return [self.model_class(uid=i + 1) for i in range(3)]
+        _, uid = query.where.children[0]
+        return [
+            self.model_class(uid=uid * 10),
+            self.model_class(uid=uid * 11),
+        ]
+
+    def create(self, **kwargs):
+        return self.model_class(uid=1)
+
+    def insert(self, instance):
+        return self.model_class(uid=1)
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakePrefetchShot(models.Model):
+    manager_class = FakeManager
+    entity_name = "FakePrefetchShot"
+
+    assets = models.ManyToManyField(
+        "assets", to="FakePrefetchAsset", related_db_name="shots"
+    )
+    code = models.StringField("code")
+
+
+class FakePrefetchAsset(models.Model):
+    manager_class = FakeManager
+    entity_name = "FakePrefetchAsset"
+
+    shots = models.ManyToManyField(
+        "shots", to="FakePrefetchShot", related_db_name="assets"
+    )
+
+
+class TestPrefetch(unittest.TestCase):
+    def tearDown(self):
+        FakeManager.filters_calls = []
+
+    def test_CASE_prefetch_related_objects_SHOULD_fill_instances(self):
+        shots = [FakePrefetchShot(uid=1), FakePrefetchShot(uid=2)]
+
+        prefetch_related_objects(FakePrefetchShot, shots, ["assets"])
+
+        self.assertEqual(len(FakeManager.filters_calls), 2)
+        self.assertEqual(
+            shots[1].assets,
+            [FakePrefetchAsset(uid=20), FakePrefetchAsset(uid=22)],
+        )
+        # Values come from the instances, no more request
+        self.assertEqual(len(FakeManager.filters_calls), 2)
+
+    def test_CASE_queryset_prefetch_related_SHOULD_resolve_on_evaluation(
+        self,
+    ):
+        queryset = FakePrefetchShot.objects.all().prefetch_related("assets")
+
+        self.assertEqual(queryset.query.prefetch_related, ["assets"])
+        self.assertEqual(FakeManager.filters_calls, [])
+
+        shots = list(queryset)
+        self.assertEqual(len(FakeManager.filters_calls), 3)
+
+        for shot in shots:
+            self.assertEqual(len(shot.assets), 2)
+        self.assertEqual(len(FakeManager.filters_calls), 3)
+
+    def test_CASE_prefetch_related_WITH_basic_field_SHOULD_raise(self):
+        with self.assertRaises(exceptions.FieldRelatedError):
+            FakePrefetchShot.objects.all().prefetch_related("code")
+
+    def test_CASE_set_prefetched_field_SHOULD_return_new_value(self):
+        shot = FakePrefetchShot(uid=1)
+        prefetch_related_objects(FakePrefetchShot, [shot], ["assets"])
+
+        shot.assets = [FakePrefetchAsset(uid=5)]
+
+        self.assertEqual(shot.assets, [FakePrefetchAsset(uid=5)])
+        self.assertNotIn("assets", shot._related_cache)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# - test_q.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from vfxDatabaseORM.core import models, exceptions
+from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.queries import Q, Query, evaluate, filter_rows
+
+
+class FakeQManager(IManager):
+    def get(self, uid):
+        return None
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, *args, **kwargs):
+        return self.get_queryset().filter(*args, **kwargs)
+
+    def create(self, **kwargs):
+        return None
+
+    def insert(self, instance):
+        return None
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeQModel(models.Model):
+    entity_name = "FakeQModel"
+    manager_class = FakeQManager
+
+    code = models.StringField("code")
+    frame_count = models.IntegerField("frame_count")
+    parent = models.OneToOneField(
+        "parent", to="FakeQModel", related_db_name="children"
+    )
+
+
+ROWS = [
+    {"id": 1, "code": "SH010", "frame_count": 10, "parent": None},
+    {
+        "id": 2,
+        "code": "SH020",
+        "frame_count": None,
+        "parent": {"type": "FakeQModel", "id": 1},
+    },
+    {"id": 3, "code": "AS010", "frame_count": 30, "parent": None},
+]
+
+
+class TestQ(unittest.TestCase):
+    def test_CASE_init_SHOULD_sort_lookups(self):
+        node = Q(uid=1, code="foo")
+
+        self.assertEqual(node.connector, Q.AND)
+        self.assertFalse(node.negated)
+        self.assertEqual(node.children, [("code", "foo"), ("uid", 1)])
+
+    def test_CASE_init_WITH_invalid_argument_SHOULD_raise(self):
+        with self.assertRaises(TypeError):
+            Q({"code": "foo"})
+
+    def test_CASE_or_SHOULD_combine_nodes(self):
+        node = Q(code="foo") | Q(code="bar") | Q(uid=1, code="baz")
+
+        self.assertEqual(node.connector, Q.OR)
+        self.assertEqual(
+            node.children,
+            [("code", "foo"), ("code", "bar"), Q(uid=1, code="baz")],
+        )
+
+    def test_CASE_invert_SHOULD_not_alter_node(self):
+        node = Q(code="foo")
+        negated_node = ~node
+
+        self.assertFalse(node.negated)
+        self.assertTrue(negated_node.negated)
+        self.assertEqual(~negated_node, node)
+
+    def test_CASE_combine_WITH_empty_node_SHOULD_return_other_node(self):
+        node = Q(code="foo")
+
+        self.assertEqual(Q() & node, node)
+        self.assertEqual(node | Q(), node)
+        self.assertFalse(Q())
+
+    def test_CASE_combine_WITH_invalid_argument_SHOULD_raise(self):
+        with self.assertRaises(TypeError):
+            Q(code="foo") & {"code": "bar"}
+
+    def test_CASE_cache_key_SHOULD_depend_on_tree(self):
+        query_0 = Query(FakeQModel)
+        query_0.add_q(Q(code="foo") | Q(code="bar"))
+        query_1 = Query(FakeQModel)
+        query_1.add_q(Q(code="foo") | Q(code="bar"))
+        query_2 = Query(FakeQModel)
+        query_2.add_q(Q(code="foo") & Q(code="bar"))
+
+        self.assertEqual(query_0.get_cache_key(), query_1.get_cache_key())
+        self.assertNotEqual(query_0.get_cache_key(), query_2.get_cache_key())
+
+
+class TestEvaluator(unittest.TestCase):
+    def _filter(self, node):
+        return [row["id"] for row in filter_rows(FakeQModel, node, ROWS)]
+
+    def test_CASE_filter_rows_SHOULD_evaluate_tree(self):
+        node = (Q(code__startswith="SH") & ~Q(uid=1)) | Q(frame_count__gt=20)
+
+        self.assertEqual(self._filter(node), [2, 3])
+
+    def test_CASE_filter_rows_WITH_empty_values_SHOULD_not_match(self):
+        self.assertEqual(self._filter(Q(frame_count__lt=20)), [1])
+
+    def test_CASE_filter_rows_WITH_entity_SHOULD_compare_uids(self):
+        parent = FakeQModel(uid=1)
+
+        self.assertEqual(self._filter(Q(parent=parent)), [2])
+        self.assertEqual(self._filter(Q(parent__in=[parent, 5])), [2])
+
+    def test_CASE_evaluate_WITH_unknown_field_SHOULD_ignore_lookup(self):
+        self.assertTrue(evaluate(FakeQModel, Q(nothing=1), ROWS[0]))
+        self.assertTrue(evaluate(FakeQModel, Q(), ROWS[0]))
+
+    def test_CASE_evaluate_WITH_related_model_lookup_SHOULD_raise(self):
+        with self.assertRaises(exceptions.InvalidLookUp):
+            evaluate(FakeQModel, Q(parent__code__is="SH010"), ROWS[0])
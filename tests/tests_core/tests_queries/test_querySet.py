@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+#
+# - test_querySet.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from vfxDatabaseORM.core import models, exceptions
+from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.caches import IdentityMap
+from vfxDatabaseORM.core.factories import ModelFactory
+from vfxDatabaseORM.core.queries import QuerySet, Q, Count, Max, Sum
+
+
+class FakeManager(IManager):
+    executed_queries = []
+
+    def get(self, uid):
+        return self.model_class(uid=uid)
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        return self.get_queryset().filter(**kwargs)
+
+    def execute(self, query):
+        FakeManager.executed_queries.append(query)
+        deferred_fields = query.get_deferred_field_names()
+        rows = []
+        for i in range(5):
+            raw_values = {"id": i + 1, "code": "code_{}".format(i + 1)}
+            for field_name in deferred_fields:
+                # Deferred fields are not retrieved
+                raw_values.pop(field_name, None)
+            rows.append(
+                ModelFactory.build(
+                    self.model_class,
+                    raw_values,
+                    deferred_fields=deferred_fields,
+                )
+            )
+        if query.limit is None:
+            return rows[query.offset:]
+        return rows[query.offset:query.offset + query.limit]
+
+    def create(self, **kwargs):
+        return self.model_class(uid=1)
+
+    def insert(self, instance):
+        return self.model_class(uid=1)
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeQuerySetModel(models.Model):
+    manager_class = FakeManager
+
+    code = models.StringField("code")
+
+
+class TestQuerySet(unittest.TestCase):
+    def tearDown(self):
+        FakeManager.executed_queries = []
+
+    def test_CASE_filter_SHOULD_be_lazy(self):
+        queryset = FakeQuerySetModel.objects.filters(code="foo")
+        queryset = queryset.filter(uid__gt=1).exclude(code="bar")
+
+        self.assertIsInstance(queryset, QuerySet)
+        self.assertEqual(FakeManager.executed_queries, [])
+        self.assertEqual(
+            queryset.query.where,
+            Q(code="foo") & Q(uid__gt=1) & ~Q(code="bar"),
+        )
+
+    def test_CASE_filter_SHOULD_not_alter_parent(self):
+        queryset = FakeQuerySetModel.objects.all()
+        queryset.filter(code="foo")
+
+        self.assertEqual(queryset.query.where, Q())
+
+    def test_CASE_iterate_SHOULD_execute_once(self):
+        queryset = FakeQuerySetModel.objects.all()
+
+        result = list(queryset)
+        self.assertEqual(len(queryset), 5)
+        self.assertTrue(queryset)
+
+        expected = [FakeQuerySetModel(uid=i + 1) for i in range(5)]
+        self.assertEqual(result, expected)
+        self.assertEqual(len(FakeManager.executed_queries), 1)
+
+    def test_CASE_order_by_SHOULD_store_ordering(self):
+        queryset = FakeQuerySetModel.objects.all().order_by("-code", "uid")
+
+        self.assertEqual(
+            queryset.query.ordering, [("code", True), ("uid", False)]
+        )
+
+    def test_CASE_order_by_WITH_unknown_field_SHOULD_raise(self):
+        with self.assertRaises(exceptions.FieldNotFound):
+            FakeQuerySetModel.objects.all().order_by("nothing")
+
+    def test_CASE_only_SHOULD_keep_uid(self):
+        queryset = FakeQuerySetModel.objects.all().only("code")
+
+        self.assertEqual(queryset.query.only_fields, ["uid", "code"])
+        self.assertEqual(
+            queryset.query.get_fields(), FakeQuerySetModel.get_fields()
+        )
+
+    def test_CASE_defer_SHOULD_exclude_fields(self):
+        queryset = FakeQuerySetModel.objects.all().defer("code", "uid")
+
+        self.assertEqual(queryset.query.deferred_fields, ["code"])
+        self.assertEqual(
+            queryset.query.get_fields(), [FakeQuerySetModel.get_field("uid")]
+        )
+        self.assertEqual(queryset.query.get_deferred_field_names(), ["code"])
+
+    def test_CASE_only_after_defer_SHOULD_reset_deferred_fields(self):
+        queryset = FakeQuerySetModel.objects.all().defer("code").only("code")
+
+        self.assertEqual(queryset.query.deferred_fields, [])
+        self.assertEqual(queryset.query.get_deferred_field_names(), [])
+
+    def test_CASE_get_deferred_field_SHOULD_load_it(self):
+        instance = FakeQuerySetModel.objects.all().defer("code").first()
+
+        self.assertEqual(instance._deferred, set(["code"]))
+        self.assertEqual(len(FakeManager.executed_queries), 1)
+
+        self.assertEqual(instance.code, "code_1")
+        self.assertEqual(instance._deferred, set())
+        self.assertEqual(len(FakeManager.executed_queries), 2)
+        self.assertEqual(
+            FakeManager.executed_queries[1].only_fields, ["uid", "code"]
+        )
+
+        # Already loaded, no more request
+        self.assertEqual(instance.code, "code_1")
+        self.assertEqual(len(FakeManager.executed_queries), 2)
+
+    def test_CASE_get_deferred_field_WITH_identity_map_SHOULD_load_it(self):
+        with IdentityMap():
+            instance = FakeQuerySetModel.objects.all().defer("code").first()
+
+            self.assertEqual(instance.code, "code_1")
+            self.assertEqual(instance._deferred, set())
+            self.assertEqual(len(FakeManager.executed_queries), 2)
+
+    def test_CASE_set_deferred_field_SHOULD_not_load_it(self):
+        instance = FakeQuerySetModel.objects.all().defer("code").first()
+
+        instance.code = "code_1"
+
+        self.assertEqual(instance.code, "code_1")
+        self.assertTrue(instance.is_dirty)
+        self.assertEqual(len(FakeManager.executed_queries), 1)
+
+    def test_CASE_slice_SHOULD_set_limits(self):
+        queryset = FakeQuerySetModel.objects.all()[1:4][1:]
+
+        self.assertEqual(FakeManager.executed_queries, [])
+        self.assertEqual(queryset.query.offset, 2)
+        self.assertEqual(queryset.query.limit, 2)
+        expected = [FakeQuerySetModel(uid=3), FakeQuerySetModel(uid=4)]
+        self.assertEqual(list(queryset), expected)
+
+    def test_CASE_slice_WITH_negative_index_SHOULD_raise(self):
+        with self.assertRaises(ValueError):
+            FakeQuerySetModel.objects.all()[-1:]
+        with self.assertRaises(ValueError):
+            FakeQuerySetModel.objects.all()[-1]
+
+    def test_CASE_filter_WITH_sliced_queryset_SHOULD_raise(self):
+        with self.assertRaises(exceptions.InvalidQuery):
+            FakeQuerySetModel.objects.all()[:2].filter(code="foo")
+
+    def test_CASE_index_SHOULD_return_instance(self):
+        result = FakeQuerySetModel.objects.all()[2]
+
+        self.assertEqual(result, FakeQuerySetModel(uid=3))
+        self.assertEqual(FakeManager.executed_queries[0].limit, 1)
+
+    def test_CASE_first_SHOULD_return_instance(self):
+        self.assertEqual(
+            FakeQuerySetModel.objects.all().first(), FakeQuerySetModel(uid=1)
+        )
+        self.assertIsNone(FakeQuerySetModel.objects.all()[5:].first())
+
+    def test_CASE_exists_and_count_SHOULD_return_values(self):
+        queryset = FakeQuerySetModel.objects.all()
+
+        self.assertTrue(queryset.exists())
+        self.assertFalse(queryset[10:].exists())
+        self.assertEqual(queryset.count(), 5)
+        self.assertEqual(queryset[1:3].count(), 2)
+
+    def test_CASE_count_SHOULD_only_request_uids(self):
+        FakeQuerySetModel.objects.filters(code="foo").count()
+
+        self.assertEqual(
+            FakeManager.executed_queries[0].get_fields(),
+            [FakeQuerySetModel.get_field("uid")],
+        )
+
+    def test_CASE_count_WITH_result_cache_SHOULD_not_execute(self):
+        queryset = FakeQuerySetModel.objects.all()
+        list(queryset)
+
+        self.assertEqual(queryset.count(), 5)
+        self.assertEqual(len(FakeManager.executed_queries), 1)
+
+    def test_CASE_empty_slice_SHOULD_not_execute(self):
+        queryset = FakeQuerySetModel.objects.all()[2:2]
+
+        self.assertEqual(list(queryset), [])
+        self.assertEqual(FakeManager.executed_queries, [])
+
+    def test_CASE_iterator_SHOULD_not_cache_results(self):
+        queryset = FakeQuerySetModel.objects.all()
+
+        result = list(queryset.iterator(chunk_size=2))
+
+        self.assertEqual(len(result), 5)
+        self.assertIsNone(queryset._result_cache)
+
+        list(queryset.iterator(chunk_size=2))
+        self.assertEqual(len(FakeManager.executed_queries), 2)
+
+    def test_CASE_iterator_WITH_invalid_chunk_size_SHOULD_raise(self):
+        with self.assertRaises(ValueError):
+            FakeQuerySetModel.objects.all().iterator(chunk_size=0)
+
+    def test_CASE_get_cache_key_SHOULD_be_normalized(self):
+        queryset_0 = FakeQuerySetModel.objects.filters(code="foo", uid__in=[1])
+        queryset_1 = FakeQuerySetModel.objects.filters(uid__in=[1], code="foo")
+        queryset_2 = FakeQuerySetModel.objects.filters(code="bar", uid__in=[1])
+
+        key = queryset_0.query.get_cache_key()
+
+        self.assertEqual(key[0], FakeQuerySetModel.entity_name)
+        self.assertEqual(hash(key), hash(queryset_1.query.get_cache_key()))
+        self.assertEqual(key, queryset_1.query.get_cache_key())
+        self.assertNotEqual(key, queryset_2.query.get_cache_key())
+
+    def test_CASE_values_SHOULD_return_dicts(self):
+        queryset = FakeQuerySetModel.objects.all().values("code")[1:3]
+
+        self.assertEqual(FakeManager.executed_queries, [])
+        self.assertEqual(
+            list(queryset), [{"code": "code_2"}, {"code": "code_3"}]
+        )
+        self.assertEqual(
+            FakeManager.executed_queries[0].only_fields, ["uid", "code"]
+        )
+
+    def test_CASE_values_list_SHOULD_return_tuples(self):
+        queryset = FakeQuerySetModel.objects.all()
+
+        self.assertEqual(
+            list(queryset.values_list("uid", "code")[:2]),
+            [(1, "code_1"), (2, "code_2")],
+        )
+        self.assertEqual(
+            list(queryset.values_list("uid", flat=True)), [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(
+            list(queryset.values_list("code", flat=True).iterator()),
+            ["code_1", "code_2", "code_3", "code_4", "code_5"],
+        )
+
+    def test_CASE_values_list_WITH_flat_and_fields_SHOULD_raise(self):
+        with self.assertRaises(TypeError):
+            FakeQuerySetModel.objects.all().values_list(
+                "uid", "code", flat=True
+            )
+
+    def test_CASE_aggregate_SHOULD_reduce_rows(self):
+        result = FakeQuerySetModel.objects.all()[1:].aggregate(
+            Sum("uid"), Count(), last_code=Max("code")
+        )
+
+        self.assertEqual(
+            result, {"uid__sum": 14, "uid__count": 4, "last_code": "code_5"}
+        )
+        self.assertEqual(
+            FakeManager.executed_queries[0].only_fields, ["uid", "code"]
+        )
+
+    def test_CASE_aggregate_WITH_group_by_SHOULD_return_groups(self):
+        result = FakeQuerySetModel.objects.all()[:2].aggregate(
+            Count(), group_by="code"
+        )
+
+        self.assertEqual(
+            result,
+            [
+                {"code": "code_1", "uid__count": 1},
+                {"code": "code_2", "uid__count": 1},
+            ],
+        )
+
+    def test_CASE_aggregate_WITH_empty_slice_SHOULD_not_execute(self):
+        result = FakeQuerySetModel.objects.all()[2:2].aggregate(Sum("uid"))
+
+        self.assertEqual(result, {"uid__sum": None})
+        self.assertEqual(FakeManager.executed_queries, [])
+
+    def test_CASE_aggregate_WITH_invalid_arguments_SHOULD_raise(self):
+        queryset = FakeQuerySetModel.objects.all()
+
+        with self.assertRaises(TypeError):
+            queryset.aggregate()
+        with self.assertRaises(TypeError):
+            queryset.aggregate(total="uid")
+        with self.assertRaises(ValueError):
+            queryset.aggregate(Sum("uid"), uid__sum=Max("uid"))
+        with self.assertRaises(exceptions.FieldNotFound):
+            queryset.aggregate(Sum("nothing"))
+
+    def test_CASE_filter_WITH_q_objects_SHOULD_combine_them(self):
+        queryset = FakeQuerySetModel.objects.all().filter(
+            Q(code="foo") | Q(code="bar"), uid__gt=1
+        )
+        queryset = queryset.exclude(Q(uid=3))
+
+        self.assertEqual(
+            queryset.query.where,
+            (Q(code="foo") | Q(code="bar")) & Q(uid__gt=1) & ~Q(uid=3),
+        )
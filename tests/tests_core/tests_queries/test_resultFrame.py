@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# - test_resultFrame.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import datetime
+import unittest
+
+from vfxDatabaseORM.core import models, exceptions
+from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.factories import ModelFactory
+from vfxDatabaseORM.core.queries import ResultFrame
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FakeFrameManager(IManager):
+    executed_queries = []
+
+    def get(self, uid):
+        return self.model_class(uid=uid)
+
+    def all(self):
+        return self.get_queryset()
+
+    def filters(self, **kwargs):
+        return self.get_queryset().filter(**kwargs)
+
+    def execute(self, query):
+        FakeFrameManager.executed_queries.append(query)
+        return ModelFactory.build_many(
+            self.model_class,
+            [
+                {"id": 1, "code": "foo", "frames": 10, "is_valid": True},
+                {"id": 2, "code": "bar", "frames": 20, "is_valid": False},
+                {"id": 3, "code": "foo", "frames": None, "is_valid": True},
+            ],
+        )
+
+    def create(self, **kwargs):
+        return self.model_class(uid=1)
+
+    def insert(self, instance):
+        return instance
+
+    def update(self, instance):
+        return True
+
+    def delete(self, instance):
+        return True
+
+
+class FakeFrameModel(models.Model):
+    manager_class = FakeFrameManager
+    entity_name = "FakeFrame"
+
+    code = models.StringField("code")
+    frames = models.IntegerField("frames")
+    is_valid = models.BooleanField("is_valid")
+    ratio = models.FloatField("ratio")
+    created_at = models.DateTimeField("created_at")
+
+
+class TestResultFrame(unittest.TestCase):
+    def tearDown(self):
+        FakeFrameManager.executed_queries = []
+
+    def _create_frame(self, *field_names):
+        fields = [FakeFrameModel.get_field(name) for name in field_names]
+        return ResultFrame(fields)
+
+    def test_CASE_append_SHOULD_store_values_by_column(self):
+        frame = self._create_frame("uid", "code", "is_valid", "ratio")
+
+        frame.append({"id": 1, "code": "foo", "is_valid": True, "ratio": 1})
+        frame.append({"id": 2, "code": "foo", "is_valid": False})
+
+        self.assertEqual(len(frame), 2)
+        self.assertEqual(frame.get_column("uid").to_list(), [1, 2])
+        self.assertEqual(frame.get_column("code").table, ["foo"])
+        self.assertEqual(
+            frame.get_column("is_valid").to_list(), [True, False]
+        )
+        self.assertIs(frame[0].is_valid, True)
+        self.assertEqual(frame[0].ratio, 1.0)
+        self.assertEqual(frame[1].ratio, None)  # Default value
+        self.assertEqual(
+            frame.to_dicts()[1],
+            {"uid": 2, "code": "foo", "is_valid": False, "ratio": None},
+        )
+
+    def test_CASE_append_WITH_datetimes_SHOULD_restore_datetimes(self):
+        frame = self._create_frame("created_at")
+        value = datetime.datetime(2023, 4, 5, 6, 7, 8, 9000)
+
+        frame.append({"created_at": value})
+        frame.append({"created_at": None})
+
+        self.assertEqual(frame[0].created_at, value)
+        self.assertIsNone(frame[1].created_at)
+
+    def test_CASE_row_WITH_unknown_field_SHOULD_raise(self):
+        frame = self._create_frame("code")
+        frame.append({"code": "foo"})
+
+        with self.assertRaises(AttributeError):
+            frame[0].frames
+        with self.assertRaises(IndexError):
+            frame[1]
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_CASE_to_numpy_SHOULD_return_arrays(self):
+        frame = self._create_frame("uid", "code", "created_at")
+        created_at = datetime.datetime(2023, 1, 1)
+        frame.append({"id": 1, "code": "foo", "created_at": created_at})
+        frame.append({"id": 2, "code": "bar", "created_at": None})
+
+        arrays = frame.to_numpy()
+
+        self.assertEqual(arrays["uid"].tolist(), [1, 2])
+        self.assertEqual(arrays["code"].tolist(), ["foo", "bar"])
+        self.assertEqual(
+            arrays["created_at"][0], numpy.datetime64("2023-01-01")
+        )
+        self.assertTrue(numpy.isnat(arrays["created_at"][1]))
+
+    def test_CASE_values_columnar_SHOULD_only_request_given_fields(self):
+        frame = FakeFrameModel.objects.all().values_columnar("code", "frames")
+
+        self.assertEqual(frame.field_names, ["code", "frames"])
+        self.assertEqual(
+            FakeFrameManager.executed_queries[0].only_fields,
+            ["uid", "code", "frames"],
+        )
+        self.assertEqual(
+            frame.get_column("code").to_list(), ["foo", "bar", "foo"]
+        )
+        # None can't be stored in an array of integers
+        self.assertEqual(frame.get_column("frames").to_list(), [10, 20, None])
+
+    def test_CASE_values_columnar_WITH_unknown_field_SHOULD_raise(self):
+        with self.assertRaises(exceptions.FieldNotFound):
+            FakeFrameModel.objects.all().values_columnar("nothing")
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+#
+# - asyncShotgridManager.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from vfxDatabaseORM.core.interfaces import AsyncIManager
+from vfxDatabaseORM.adapters.shotgridManager import ShotgridManager
+
+
+class AsyncShotgridManager(AsyncIManager, ShotgridManager):
+    """ShotgridManager used from asyncio coroutines. Requests run in a pool
+    of POOL_SIZE threads shared by all managers connected to the same HOST
+    with the same SCRIPT_NAME, so each thread has its own Shotgrid client
+    and requests beyond POOL_SIZE wait for a free thread, not for a client.
+    """
+
+    def _get_executor_key(self):
+        return (self.HOST, self.SCRIPT_NAME)
+
+    def _get_max_workers(self):
+        return self.POOL_SIZE
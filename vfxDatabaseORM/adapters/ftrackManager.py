@@ -51,7 +51,7 @@ class FTrackManager(IManager):
     def all(self):
         raise NotImplementedError()
 
-    def filters(self, **kwargs):
+    def filters(self, *args, **kwargs):
         raise NotImplementedError()
 
     def create(self, **kwargs):
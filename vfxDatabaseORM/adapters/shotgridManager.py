@@ -22,11 +22,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import collections
+import threading
+
 import shotgun_api3
 
+from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.models import Model
 from vfxDatabaseORM.core.interfaces import IManager
+from vfxDatabaseORM.core.caches import IdentityMap
 from vfxDatabaseORM.core.factories import ModelFactory
-from vfxDatabaseORM.core.models.constants import LOOKUPS
+from vfxDatabaseORM.core.queries import Q, compile_lookup
+from vfxDatabaseORM.core.pools import ClientPool
+from vfxDatabaseORM.core.models import constants
+from vfxDatabaseORM.core.models.constants import AGGREGATES, LOOKUPS
 
 
 class ShotgridManager(IManager):
@@ -35,7 +44,16 @@ class ShotgridManager(IManager):
     SCRIPT_KEY = ""
     HTTP_PROXY = ""
 
-    _SG_CLIENT = None
+    # Maximum number of clients connected at the same time, per HOST and
+    # SCRIPT_NAME
+    POOL_SIZE = 4
+
+    # Shotgrid filters through any number of linked entities, a limit turns
+    # deeper filters into in-subqueries, see IManager.MAX_FILTER_DEPTH
+    MAX_FILTER_DEPTH = None
+
+    _CLIENT_POOLS = {}
+    _CLIENT_POOLS_LOCK = threading.Lock()
     _LOOKUPS_MAPPING = {
         LOOKUPS.EQUAL: "is",
         LOOKUPS.NOT_EQUAL: "is_not",
@@ -43,41 +61,79 @@ class ShotgridManager(IManager):
         LOOKUPS.GREATER_THAN: "greater_than",
         LOOKUPS.CONTAINS: "contains",
         LOOKUPS.IN: "in",
+        LOOKUPS.NOT_IN: "not_in",
         LOOKUPS.STARTS_WITH: "starts_with",
         LOOKUPS.ENDS_WITH: "ends_with",
     }
+    _AGGREGATES_MAPPING = {
+        AGGREGATES.COUNT: "count",
+        AGGREGATES.SUM: "sum",
+        AGGREGATES.AVG: "average",
+        AGGREGATES.MIN: "minimum",
+        AGGREGATES.MAX: "maximum",
+    }
+    # Shotgrid paths and operators of lookup arguments, see
+    # _get_filter_plan()
+    _FILTER_PLANS = {}
+    _NEGATED_LOOKUPS_MAPPING = {
+        "is": "is_not",
+        "is_not": "is",
+        "contains": "not_contains",
+        "not_contains": "contains",
+        "in": "not_in",
+        "not_in": "in",
+    }
+    # Operators without opposite on Shotgrid, NOT (a < b) is sent as
+    # a > b OR a = b OR a is empty.
+    _COMPLEMENT_LOOKUPS_MAPPING = {
+        "less_than": "greater_than",
+        "greater_than": "less_than",
+    }
 
-    def __init__(self, model_class):
-        super(ShotgridManager, self).__init__(model_class)
+    def _create_client(self):
+        """Create a new Shotgrid client.
 
-        if not self._SG_CLIENT:
-            self._SG_CLIENT = shotgun_api3.Shotgun(
-                self.HOST,
-                script_name=self.SCRIPT_NAME,
-                api_key=self.SCRIPT_KEY,
-                http_proxy=self.HTTP_PROXY,
-            )
+        :return: The client
+        :rtype: shotgun_api3.Shotgun
+        """
+        return shotgun_api3.Shotgun(
+            self.HOST,
+            script_name=self.SCRIPT_NAME,
+            api_key=self.SCRIPT_KEY,
+            http_proxy=self.HTTP_PROXY,
+        )
 
-    def all(self):
-        """Get all entities in the database
+    def _get_pool(self):
+        """Get the pool of clients shared by all managers connected to the
+        same HOST with the same SCRIPT_NAME.
 
-        :return: All entites in the database
-        :rtype: list
+        :return: The pool of clients
+        :rtype: vfxDatabaseORM.core.pools.ClientPool
         """
-        field_names = [f.db_name for f in self.model_class.get_fields()]
-
-        query_entities = self._SG_CLIENT.find(
-            self.model_class.entity_name, [], field_names
-        )
+        key = (self.HOST, self.SCRIPT_NAME)
+        with self._CLIENT_POOLS_LOCK:
+            pool = self._CLIENT_POOLS.get(key)
+            if pool is None:
+                pool = ClientPool(self._create_client, max_size=self.POOL_SIZE)
+                self._CLIENT_POOLS[key] = pool
+        return pool
+
+    def _connection(self):
+        """Context manager which checks out a Shotgrid client from the pool
+        for the current thread.
+
+        >>> with self._connection() as sg_client:
+        ...     sg_client.find("Shot", [], ["code"])
+        """
+        return self._get_pool().connection()
 
-        result = []
-        for entity in query_entities:
-            model_instance = ModelFactory.build(
-                model_class=self.model_class, raw_values=entity
-            )
-            result.append(model_instance)
+    def all(self):
+        """Get all entities in the database
 
-        return result
+        :return: A lazy QuerySet on all entities in the database
+        :rtype: vfxDatabaseORM.core.queries.QuerySet
+        """
+        return self.get_queryset()
 
     def get(self, uid):
         """Get an entity from its ID.
@@ -87,14 +143,22 @@ class ShotgridManager(IManager):
         :return: The entity in the database
         :rtype: model_class instance
         """
+        identity_map = IdentityMap.get_current()
+        if identity_map is not None:
+            instance = identity_map.get(self.model_class, uid)
+            if instance is not None:
+                # Already loaded, no need to request Shotgrid
+                return instance
+
         field_names = [f.db_name for f in self.model_class.get_fields()]
-        uid_field = self.model_class.get_field(self.model_class.uid_key)
+        uid_field = self.model_class._meta.uid_field
 
-        query_entity = self._SG_CLIENT.find_one(
-            self.model_class.entity_name,
-            [[uid_field.db_name, "is", uid]],
-            field_names,
-        )
+        with self._connection() as sg_client:
+            query_entity = sg_client.find_one(
+                self.model_class.entity_name,
+                [[uid_field.db_name, "is", uid]],
+                field_names,
+            )
 
         if not query_entity:
             # No entity found, return None
@@ -106,106 +170,538 @@ class ShotgridManager(IManager):
 
         return model_instance
 
-    def filters(self, **kwargs):
-        """Get entities in the database filtered by given kwargs
+    def filters(self, *args, **kwargs):
+        """Get entities in the database filtered by given Q objects and
+        kwargs
 
-        :return: All entites in the database which correspond
-        to the given filter
-        :rtype: list
+        :return: A lazy QuerySet on all entites in the database which
+        correspond to the given filter
+        :rtype: vfxDatabaseORM.core.queries.QuerySet
         """
-        if not kwargs:
+        if not args and not kwargs:
             # No filters supplied, let's return like the all() method.
             return self.all()
+        return self.get_queryset().filter(*args, **kwargs)
 
-        all_fields = self.model_class.get_all_fields()
+    def execute(self, query):
+        """Run the query on Shotgrid
 
-        field_names = [f.db_name for f in self.model_class.get_fields()]
-        filters = []
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: Instances corresponding to the query
+        :rtype: list
+        """
+        return ModelFactory.build_many(
+            self.model_class,
+            self.execute_raw(query),
+            deferred_fields=query.get_deferred_field_names(),
+        )
 
-        for arg_name, arg_value in kwargs.items():
-            for field in all_fields:
-                computed_lookup = field.compute_lookup(arg_name)
-                if not computed_lookup.lookup:
-                    continue
+    def execute_raw(self, query):
+        """Run the query on Shotgrid and return entities as they are
+        returned by the API.
 
-                sg_lookup = self._LOOKUPS_MAPPING.get(
-                    computed_lookup.lookup, None
-                )
-                if not sg_lookup:
-                    # TODO No corresponding lookup found, Raise here ?
-                    continue
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: Raw values by db_name, one dict per entity
+        :rtype: list
+        """
+        filters = self._build_filters(query)
+        field_names = [f.db_name for f in query.get_fields()]
+        order = self._build_order(query)
+        limit, page, skip = self._build_paging(query)
+
+        with self._connection() as sg_client:
+            query_entities = sg_client.find(
+                self.model_class.entity_name,
+                filters,
+                field_names,
+                order=order,
+                limit=limit,
+                page=page,
+            )
 
-                if not field.is_related:
-                    # It is a classic field
-                    filters.append([field.db_name, sg_lookup, arg_value])
-                    continue
+        return query_entities[skip:]
 
-                # It is a related field
-                related_model = self.model_class._graph.get_node_model(
-                    field.to
-                )  # TODO ugly private member access
-                related_field = related_model.get_field(
-                    computed_lookup.related_field_name
-                )
-                filters.append(
-                    [
-                        "{}.{}.{}".format(
-                            field.db_name,
-                            related_model.entity_name,
-                            related_field.db_name,
-                        ),
-                        computed_lookup.lookup,
-                        arg_value,
-                    ]
+    def iterate(self, query, chunk_size):
+        """Run the query on Shotgrid and yield instances page by page.
+        Only one page of raw entities is kept in memory at a time.
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param chunk_size: The number of entities fetched per page
+        :type chunk_size: int
+        :return: A generator of instances
+        :rtype: generator
+        """
+        deferred_fields = query.get_deferred_field_names()
+        for rows in self._iterate_pages(query, chunk_size):
+            for instance in ModelFactory.build_many(
+                self.model_class, rows, deferred_fields=deferred_fields
+            ):
+                yield instance
+
+    def iterate_raw(self, query, chunk_size):
+        """Run the query on Shotgrid and yield entities, as they are
+        returned by the API, page by page.
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param chunk_size: The number of entities fetched per page
+        :type chunk_size: int
+        :return: A generator of raw values by db_name
+        :rtype: generator
+        """
+        for rows in self._iterate_pages(query, chunk_size):
+            for row in rows:
+                yield row
+
+    def _iterate_pages(self, query, chunk_size):
+        """Run the query on Shotgrid page by page.
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param chunk_size: The number of entities fetched per page
+        :type chunk_size: int
+        :return: A generator of pages, lists of raw entities
+        :rtype: generator
+        """
+        filters = self._build_filters(query)
+        field_names = [f.db_name for f in query.get_fields()]
+        order = self._build_order(query)
+        if not order:
+            # Pages are only consistent with a stable order
+            uid_field = self.model_class._meta.uid_field
+            order = [{"field_name": uid_field.db_name, "direction": "asc"}]
+
+        page = query.offset // chunk_size + 1
+        skip = query.offset % chunk_size
+        remaining = query.limit
+
+        while remaining is None or remaining > 0:
+            with self._connection() as sg_client:
+                query_entities = sg_client.find(
+                    self.model_class.entity_name,
+                    filters,
+                    field_names,
+                    order=order,
+                    limit=chunk_size,
+                    page=page,
                 )
 
-        # print(self.model_class.entity_name, filters, field_names)
+            rows = query_entities[skip:]
+            if remaining is not None:
+                rows = rows[:remaining]
+                remaining -= len(rows)
+            yield rows
+
+            if len(query_entities) < chunk_size:
+                # Last page reached
+                break
+
+            page += 1
+            skip = 0
 
-        query_entities = self._SG_CLIENT.find(
-            self.model_class.entity_name, filters, field_names
+    def execute_count(self, query):
+        """Count the entities matching the query with summarize() on
+        Shotgrid, no entity is retrieved.
+
+        :param query: The query to count
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: The number of entities
+        :rtype: int
+        """
+        uid_db_name = self.model_class._meta.uid_field.db_name
+        summaries = self._summarize(
+            query, [{"field": uid_db_name, "type": "record_count"}]
         )
+        # No summary is returned when no entity matches
+        count = summaries[()].get(uid_db_name) or 0
+        return query.get_sliced_count(count)
+
+    def execute_aggregate(self, query, aggregates, group_by=None):
+        """Compute aggregates with summarize() on Shotgrid, no entity is
+        retrieved. Sliced queries can't be summarized, their aggregates are
+        computed on the client side.
+
+        :param query: The query to aggregate
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param aggregates: Aggregates by alias
+        :type aggregates: dict
+        :param group_by: Names of the fields to group entities by,
+        defaults to None
+        :type group_by: list, optional
+        :return: Results by alias. With group_by, a list of them, one per
+        group, which also contains values of the grouped fields.
+        :rtype: dict or list
+        """
+        if query.is_sliced:
+            return super(ShotgridManager, self).execute_aggregate(
+                query, aggregates, group_by
+            )
 
-        result = []
+        group_fields = [
+            self.model_class.get_field(field_name)
+            for field_name in group_by or []
+        ]
+        grouping = [
+            {"field": field.db_name, "type": "exact", "direction": "asc"}
+            for field in group_fields
+        ] or None
+
+        # Summaries are returned by field, a field can only be summarized
+        # once per request.
+        requests = []
+        for alias, aggregate in aggregates.items():
+            field = self.model_class.get_field(aggregate.field_name)
+            summary_type = self._AGGREGATES_MAPPING[aggregate.function]
+            if summary_type == "count" and field.name == constants.UID_KEY:
+                summary_type = "record_count"
+            summary_field = {"field": field.db_name, "type": summary_type}
+            for request in requests:
+                if field.db_name not in request:
+                    break
+            else:
+                request = collections.OrderedDict()
+                requests.append(request)
+            request[field.db_name] = (alias, summary_field)
+
+        values_by_group = collections.OrderedDict()
+        for request in requests:
+            summaries_by_group = self._summarize(
+                query,
+                [summary_field for _, summary_field in request.values()],
+                grouping,
+            )
+            for key, summaries in summaries_by_group.items():
+                values = values_by_group.setdefault(key, {})
+                for db_name, (alias, _) in request.items():
+                    value = summaries.get(db_name)
+                    if aggregates[alias].function == AGGREGATES.COUNT:
+                        # No summary is returned when no entity matches
+                        value = value or 0
+                    values[alias] = value
+
+        results = []
+        for key, values in values_by_group.items():
+            result = {
+                field.name: value for field, value in zip(group_fields, key)
+            }
+            for alias in aggregates:
+                result[alias] = values.get(alias)
+            results.append(result)
+
+        if not group_fields:
+            return results[0]
+        return results
+
+    def _summarize(self, query, summary_fields, grouping=None):
+        """Run summarize() on Shotgrid with filters of the query.
+
+        :param query: The query to summarize
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param summary_fields: Shotgrid summary fields
+        :type summary_fields: list
+        :param grouping: Shotgrid grouping, defaults to None
+        :type grouping: list, optional
+        :return: Summaries by field db_name, by tuple of group values
+        :rtype: dict
+        """
+        with self._connection() as sg_client:
+            result = sg_client.summarize(
+                self.model_class.entity_name,
+                self._build_filters(query),
+                summary_fields,
+                grouping=grouping,
+            )
+
+        summaries_by_group = collections.OrderedDict()
+        if not grouping:
+            summaries_by_group[()] = result.get("summaries") or {}
+            return summaries_by_group
+
+        # Groups are nested, one level per grouping field
+        stack = [((), result.get("groups") or [])]
+        while stack:
+            key, groups = stack.pop(0)
+            for group in groups:
+                group_key = key + (group.get("group_value"),)
+                if len(group_key) < len(grouping):
+                    stack.append((group_key, group.get("groups") or []))
+                    continue
+                summaries_by_group[group_key] = group.get("summaries") or {}
+        return summaries_by_group
+
+    def fetch_related(self, field, uids):
+        """Get entities linked to any of the given uids through the related
+        field with a single request on Shotgrid.
+
+        :param field: The related field of the model which links to the uids
+        :type field: vfxDatabaseORM.core.models.fields.RelatedField
+        :param uids: Uids of the linked entities
+        :type uids: list
+        :return: Instances grouped by linked uid
+        :rtype: dict
+        """
+        if not uids:
+            return {}
+
+        key = "{}{}{}{}{}".format(
+            field.name,
+            constants.LOOKUP_TOKEN,
+            constants.UID_KEY,
+            constants.LOOKUP_TOKEN,
+            constants.LOOKUPS.IN,
+        )
+        filters = [self._build_filter(key, list(uids))]
+
+        # Also retrieve the link to know which entities are linked to which uid
+        field_names = [f.db_name for f in self.model_class.get_fields()]
+        field_names.append(field.db_name)
+
+        with self._connection() as sg_client:
+            query_entities = sg_client.find(
+                self.model_class.entity_name, filters, field_names
+            )
+
+        uids = set(uids)
+        result = {}
         for entity in query_entities:
             model_instance = ModelFactory.build(self.model_class, entity)
-            result.append(model_instance)
+
+            linked_entities = entity.get(field.db_name) or []
+            if isinstance(linked_entities, dict):
+                linked_entities = [linked_entities]
+
+            for linked_entity in linked_entities:
+                linked_uid = linked_entity.get("id")
+                if linked_uid not in uids:
+                    continue
+                result.setdefault(linked_uid, []).append(model_instance)
 
         return result
 
+    def _build_filters(self, query):
+        """Translate filters of the query into Shotgrid filters.
+
+        :param query: The query to translate
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: Shotgrid filters
+        :rtype: list
+        """
+        sg_filter = self._build_node(query.where)
+        if sg_filter is None:
+            return []
+        if isinstance(sg_filter, dict) and (
+            sg_filter["filter_operator"] == "all"
+        ):
+            # Shotgrid combines top level filters with AND
+            return sg_filter["filters"]
+        return [sg_filter]
+
+    def _build_node(self, node, negated=False):
+        """Translate a tree of Q nodes into a Shotgrid filter. Shotgrid
+        can't negate a group of filters, so negations are pushed down to
+        lookups: NOT (A AND B) is equivalent to (NOT A) OR (NOT B).
+
+        :param node: The node to translate
+        :type node: vfxDatabaseORM.core.queries.Q
+        :param negated: Is the node negated by a parent ?, defaults to False
+        :type negated: bool, optional
+        :return: The Shotgrid filter, or complex filter, None if the node
+        doesn't filter anything
+        :rtype: list or dict
+        """
+        negated = negated != node.negated
+        connector = node.connector
+        if negated:
+            connector = Q.AND if connector == Q.OR else Q.OR
+
+        sg_filters = []
+        for child in node.children:
+            if isinstance(child, Q):
+                sg_filter = self._build_node(child, negated)
+            else:
+                sg_filter = self._build_filter(*child)
+                if sg_filter and negated:
+                    sg_filter = self._negate_filter(sg_filter)
+            if sg_filter:
+                sg_filters.append(sg_filter)
+
+        if not sg_filters:
+            return None
+        if len(sg_filters) == 1:
+            return sg_filters[0]
+        return {
+            "filter_operator": "all" if connector == Q.AND else "any",
+            "filters": sg_filters,
+        }
+
+    def _build_filter(self, arg_name, arg_value):
+        """Translate a lookup argument into a Shotgrid filter.
+
+        :param arg_name: The lookup (eg: "users__uid__is")
+        :type arg_name: str
+        :param arg_value: The value of the lookup
+        :type arg_value: any
+        :return: The Shotgrid filter, None if no field matches the lookup
+        :rtype: list
+        """
+        filter_plan = self._get_filter_plan(arg_name)
+        if filter_plan is None:
+            return None
+        path, sg_lookup = filter_plan
+        return [path, sg_lookup, self._to_sg_value(arg_value)]
+
+    def _get_filter_plan(self, arg_name):
+        """Get the Shotgrid path and operator of a lookup argument. They
+        are computed once per manager class, model and argument.
+
+        :param arg_name: The lookup (eg: "users__uid__is")
+        :type arg_name: str
+        :raises exceptions.InvalidLookUp: Raised if there is no Shotgrid
+        operator for the lookup
+        :return: The path and the Shotgrid operator, None if no field
+        matches the lookup
+        :rtype: tuple
+        """
+        key = (self.__class__, self.model_class, arg_name)
+        try:
+            return self._FILTER_PLANS[key]
+        except KeyError:
+            pass
+
+        compiled_lookup = compile_lookup(self.model_class, arg_name)
+        if compiled_lookup is None:
+            # Like other managers, lookups without field are ignored
+            filter_plan = None
+        else:
+            sg_lookup = self._LOOKUPS_MAPPING.get(compiled_lookup.lookup)
+            if not sg_lookup:
+                # Skipping it would change the meaning of the filters
+                raise exceptions.InvalidLookUp(
+                    "The lookup '{lookup}' has no equivalent "
+                    "on Shotgrid.".format(lookup=compiled_lookup.lookup)
+                )
+            # A deep path crosses each related model
+            # (eg: "entity.Shot.sg_sequence.Sequence.code"). It is the field
+            # itself for classic fields and related fields filtered directly
+            # with entities.
+            path = [compiled_lookup.field.db_name]
+            for related_model, related_field in compiled_lookup.related_path:
+                path.append(related_model.entity_name)
+                path.append(related_field.db_name)
+            filter_plan = (".".join(path), sg_lookup)
+
+        self._FILTER_PLANS[key] = filter_plan
+        return filter_plan
+
+    def _negate_filter(self, sg_filter):
+        """Get the opposite of the given Shotgrid filter. Empty values match
+        the opposite filter, like entities excluded in memory.
+
+        :param sg_filter: The Shotgrid filter to negate
+        :type sg_filter: list
+        :raises exceptions.InvalidLookUp: Raised if the lookup can't be negated
+        :return: The negated filter, or complex filter
+        :rtype: list or dict
+        """
+        path, sg_lookup, value = sg_filter
+        negated_lookup = self._NEGATED_LOOKUPS_MAPPING.get(sg_lookup, None)
+        if negated_lookup:
+            return [path, negated_lookup, value]
+
+        complement_lookup = self._COMPLEMENT_LOOKUPS_MAPPING.get(sg_lookup)
+        if complement_lookup:
+            return {
+                "filter_operator": "any",
+                "filters": [
+                    [path, complement_lookup, value],
+                    [path, "is", value],
+                    [path, "is", None],
+                ],
+            }
+
+        raise exceptions.InvalidLookUp(
+            "The lookup '{lookup}' cannot be excluded on Shotgrid.".format(
+                lookup=sg_lookup
+            )
+        )
+
+    def _to_sg_value(self, value):
+        """Convert instances of Model into Shotgrid entity dicts.
+
+        :param value: The value to convert
+        :type value: any
+        :return: The value understood by Shotgrid
+        :rtype: any
+        """
+        if isinstance(value, (list, tuple)):
+            return [self._to_sg_value(v) for v in value]
+        if isinstance(value, Model):
+            return {"type": value.entity_name, "id": value.uid}
+        return value
+
+    def _build_order(self, query):
+        """Translate the ordering of the query into a Shotgrid order.
+
+        :param query: The query to translate
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: The Shotgrid order
+        :rtype: list
+        """
+        order = []
+        for field_name, descending in query.ordering:
+            field = self.model_class.get_field(field_name)
+            order.append(
+                {
+                    "field_name": field.db_name,
+                    "direction": "desc" if descending else "asc",
+                }
+            )
+        return order
+
+    def _build_paging(self, query):
+        """Translate the offset and the limit of the query into Shotgrid
+        paging arguments.
+
+        Shotgrid only knows pages, so when the offset is not a multiple of the
+        limit, rows before the offset are fetched then skipped.
+
+        :param query: The query to translate
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: The limit, the page and the number of rows to skip
+        :rtype: tuple
+        """
+        offset = query.offset
+        limit = query.limit or 0
+        if not offset:
+            return limit, 0, 0
+        if limit and offset % limit == 0:
+            return limit, offset // limit + 1, 0
+        if limit:
+            return offset + limit, 0, offset
+        return 0, 0, offset
+
     def update(self, instance):
         """Update the given instance into ShotGrid
 
         :param instance: The instance to update
         :type instance: vfxDatabaseORM.core.models.Model
         """
-        uid_field = self.model_class.get_field(self.model_class.uid_key)
-
-        new_data = {
-            field.db_name: getattr(instance, field.name)
-            for field in instance.get_fields() if field in instance._changed
-        }
-
-        multi_entity_update_modes = {}
-        for field in instance.get_related_fields():
-            if field not in instance._changed:
-                continue
-            if field.is_many_to_many or field.is_one_to_many:
-                new_data[field.db_name] = [{"type": i.entity_name, uid_field.db_name: i.uid} for i in getattr(instance, field.name)]
-                multi_entity_update_modes[field.db_name] = "set"
-            else:
-                # o2o field
-                related_element = getattr(instance, field.name)
-                if not related_element:
-                    new_data[field.db_name] = None
-                else:
-                    new_data[field.db_name] = {"type": related_element.entity_name, uid_field.db_name: related_element.uid}
+        new_data, multi_entity_update_modes = self._get_update_data(instance)
 
         if not new_data:
             return
 
-        self._SG_CLIENT.update(
-            self.model_class.entity_name, instance.uid, new_data, multi_entity_update_modes
-        )
+        with self._connection() as sg_client:
+            sg_client.update(
+                self.model_class.entity_name,
+                instance.uid,
+                new_data,
+                multi_entity_update_modes,
+            )
+        self.invalidate_cache()
 
     def create(self, **kwargs):
         """From given arguments, create an entity in the database and return
@@ -226,6 +722,215 @@ class ShotgridManager(IManager):
         :return: A new instance
         :rtype: vfxDatabaseORM.core.models.Model
         """
+        new_data = self._get_insert_data(instance)
+        if not new_data:
+            return instance
+
+        field_names = [f.db_name for f in self.model_class.get_fields()]
+
+        with self._connection() as sg_client:
+            query_data = sg_client.create(
+                self.model_class.entity_name, new_data, field_names
+            )
+        self.invalidate_cache()
+        new_instance = ModelFactory.build(self.model_class, query_data)
+
+        return new_instance
+
+    def delete(self, instance):
+        """Delete the entity on Shotgrid
+
+        :param instance: The instance to delete
+        :type instance: vfxDatabaseORM.core.models.Model
+        :return: True if done, False otherwise
+        :rtype: bool
+        """
+        with self._connection() as sg_client:
+            sg_client.delete(self.model_class.entity_name, instance.uid)
+        self.invalidate_cache()
+
+        identity_map = IdentityMap.get_current()
+        if identity_map is not None:
+            identity_map.remove(instance)
+
+        return True
+
+    def bulk_create(self, instances, batch_size=None):
+        """Insert entities on Shotgrid through batch requests. Like insert(),
+        instances without data to send are not created, they are returned
+        as they are.
+
+        :param instances: Instances to create
+        :type instances: list
+        :param batch_size: The number of entities per batch request,
+        defaults to BATCH_SIZE
+        :type batch_size: int, optional
+        :raises exceptions.BulkOperationError: Raised if at least one batch
+        has failed
+        :return: New instances, in the same order
+        :rtype: list
+        """
+        field_names = [f.db_name for f in self.model_class.get_fields()]
+
+        def run_batch(batch):
+            results = list(batch)
+            indexes = []
+            requests = []
+            for index, instance in enumerate(batch):
+                new_data = self._get_insert_data(instance)
+                if not new_data:
+                    continue
+                indexes.append(index)
+                requests.append(
+                    {
+                        "request_type": "create",
+                        "entity_type": self.model_class.entity_name,
+                        "data": new_data,
+                        "return_fields": field_names,
+                    }
+                )
+            if not requests:
+                return results
+
+            with self._connection() as sg_client:
+                batch_result = sg_client.batch(requests)
+            self.invalidate_cache()
+            new_instances = ModelFactory.build_many(
+                self.model_class, batch_result
+            )
+            for index, new_instance in zip(indexes, new_instances):
+                results[index] = new_instance
+            return results
+
+        return self._run_in_batches(instances, batch_size, run_batch)
+
+    def bulk_update(self, instances, fields=None, batch_size=None):
+        """Update entities on Shotgrid through batch requests. Instances
+        without changes are not sent.
+
+        :param instances: Instances to update
+        :type instances: list
+        :param fields: Names of the fields to send, defaults to changed fields
+        :type fields: list, optional
+        :param batch_size: The number of entities per batch request,
+        defaults to BATCH_SIZE
+        :type batch_size: int, optional
+        :raises exceptions.BulkOperationError: Raised if at least one batch
+        has failed
+        :return: Updated instances, in the same order
+        :rtype: list
+        """
+        if fields is not None:
+            fields = [self.model_class.get_field(name) for name in fields]
+
+        def run_batch(batch):
+            requests = []
+            for instance in batch:
+                new_data, multi_entity_update_modes = self._get_update_data(
+                    instance, fields=fields
+                )
+                if not new_data:
+                    continue
+                requests.append(
+                    {
+                        "request_type": "update",
+                        "entity_type": self.model_class.entity_name,
+                        "entity_id": instance.uid,
+                        "data": new_data,
+                        "multi_entity_update_modes": multi_entity_update_modes,
+                    }
+                )
+            if requests:
+                with self._connection() as sg_client:
+                    sg_client.batch(requests)
+                self.invalidate_cache()
+            for instance in batch:
+                instance._mark_saved(fields)
+            return batch
+
+        return self._run_in_batches(instances, batch_size, run_batch)
+
+    def bulk_delete(self, instances, batch_size=None):
+        """Delete entities on Shotgrid through batch requests.
+
+        :param instances: Instances to delete
+        :type instances: list
+        :param batch_size: The number of entities per batch request,
+        defaults to BATCH_SIZE
+        :type batch_size: int, optional
+        :raises exceptions.BulkOperationError: Raised if at least one batch
+        has failed
+        :return: True for each deleted entity, in the same order
+        :rtype: list
+        """
+
+        def run_batch(batch):
+            requests = [
+                {
+                    "request_type": "delete",
+                    "entity_type": self.model_class.entity_name,
+                    "entity_id": instance.uid,
+                }
+                for instance in batch
+            ]
+            with self._connection() as sg_client:
+                result = [bool(r) for r in sg_client.batch(requests)]
+            self.invalidate_cache()
+
+            identity_map = IdentityMap.get_current()
+            if identity_map is not None:
+                for instance in batch:
+                    identity_map.remove(instance)
+
+            return result
+
+        return self._run_in_batches(instances, batch_size, run_batch)
+
+    def _get_update_data(self, instance, fields=None):
+        """Get data to send to Shotgrid to update the instance.
+
+        :param instance: The instance to update
+        :type instance: vfxDatabaseORM.core.models.Model
+        :param fields: Fields to send, defaults to changed fields
+        :type fields: list, optional
+        :return: The data and the update modes of multi entity fields
+        :rtype: tuple
+        """
+        if fields is None:
+            fields = instance._changed
+
+        uid_field = self.model_class._meta.uid_field
+
+        new_data = {
+            field.db_name: getattr(instance, field.name)
+            for field in instance.get_fields() if field in fields
+        }
+
+        multi_entity_update_modes = {}
+        for field in instance.get_related_fields():
+            if field not in fields:
+                continue
+            if field.is_many_to_many or field.is_one_to_many:
+                new_data[field.db_name] = [{"type": i.entity_name, uid_field.db_name: i.uid} for i in getattr(instance, field.name)]
+                multi_entity_update_modes[field.db_name] = "set"
+            else:
+                # o2o field
+                related_element = getattr(instance, field.name)
+                if not related_element:
+                    new_data[field.db_name] = None
+                else:
+                    new_data[field.db_name] = {"type": related_element.entity_name, uid_field.db_name: related_element.uid}
+
+        return new_data, multi_entity_update_modes
+
+    def _get_insert_data(self, instance):
+        """Get data to send to Shotgrid to create the instance.
+
+        :param instance: The instance to create
+        :type instance: vfxDatabaseORM.core.models.Model
+        :return: The data to create
+        :rtype: dict
+        """
         fields = self.model_class.get_fields()
         non_read_only_fields = [
             field for field in fields if not field.read_only
@@ -236,12 +941,10 @@ class ShotgridManager(IManager):
             for field in non_read_only_fields
         }
         if not new_data:
-            return instance
-
-        field_names = [f.db_name for f in self.model_class.get_fields()]
+            return new_data
 
         for field in self.model_class.get_related_fields():
-            value = getattr(instance, field.name)
+            value = self._get_set_related_value(instance, field)
             if field.is_one_to_one:
                 if not new_data.get(field.db_name, None):
                     if not value:
@@ -254,20 +957,22 @@ class ShotgridManager(IManager):
                 else:
                     new_data[field.db_name] = [{"id": v.uid, "type": v.entity_name} for v in value]
 
-        query_data = self._SG_CLIENT.create(
-            self.model_class.entity_name, new_data, field_names
-        )
-        new_instance = ModelFactory.build(self.model_class, query_data)
-
-        return new_instance
+        return new_data
 
-    def delete(self, instance):
-        """Delete the entity on Shotgrid
+    def _get_set_related_value(self, instance, field):
+        """Get the value of a related field set on the instance, without
+        resolving it from Shotgrid. Nothing is linked yet to an instance
+        which is about to be created.
 
-        :param instance: The instance to delete
+        :param instance: The instance to create
         :type instance: vfxDatabaseORM.core.models.Model
-        :return: True if done, False otherwise
-        :rtype: bool
+        :param field: The related field
+        :type field: vfxDatabaseORM.core.models.fields.RelatedField
+        :return: The value, None if it has not been set
+        :rtype: any
         """
-        self._SG_CLIENT.delete(self.model_class.entity_name, instance.uid)
-        return True
+        if field in instance._changed or (
+            field.name in instance._related_cache
+        ):
+            return getattr(instance, field.name)
+        return None
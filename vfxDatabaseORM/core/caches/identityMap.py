@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# - identityMap.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import contextlib
+import threading
+
+_local = threading.local()
+
+
+class IdentityMap(object):
+    """Keep a single instance per entity while the map is active. Entities
+    built from the database are registered and the same instance is returned
+    when the entity is built again, so memory and state are shared.
+
+    The map is activated as a context manager, for the current thread only.
+
+    >>> with IdentityMap():
+    ...     project = Project.objects.get(1)
+    ...     project is Project.objects.get(1)  # No request
+    True
+    """
+
+    def __init__(self):
+        self._instances = {}
+
+    @staticmethod
+    def get_current():
+        """Get the active identity map of the current thread.
+
+        :return: The active identity map, None if there is no active map
+        :rtype: IdentityMap
+        """
+        stack = getattr(_local, "stack", None)
+        if not stack:
+            return None
+        return stack[-1]
+
+    @staticmethod
+    def bind_current(func):
+        """Wrap a callable so the active identity map of the current thread
+        is also active when the callable runs in another thread.
+
+        :param func: The callable to wrap
+        :type func: callable
+        :return: The wrapped callable
+        :rtype: callable
+        """
+        identity_map = IdentityMap.get_current()
+        if identity_map is None:
+            return func
+
+        def run(*args, **kwargs):
+            with identity_map:
+                return func(*args, **kwargs)
+
+        return run
+
+    @staticmethod
+    @contextlib.contextmanager
+    def suspend():
+        """Context manager which deactivates identity maps of the current
+        thread, entities built inside are new instances which are not
+        registered. Useful to get fresh values of an entity.
+
+        >>> with IdentityMap.suspend():
+        ...     fresh_project = Project.objects.get(1)
+        """
+        if not hasattr(_local, "stack"):
+            _local.stack = []
+        _local.stack.append(None)
+        try:
+            yield
+        finally:
+            _local.stack.pop()
+
+    def get(self, model_class, uid):
+        """Get the registered instance of an entity.
+
+        :param model_class: The Model of the entity
+        :type model_class: vfxDatabaseORM.core.models.Model
+        :param uid: The uid of the entity
+        :type uid: int
+        :return: The registered instance, None if the entity is not registered
+        :rtype: vfxDatabaseORM.core.models.Model
+        """
+        instance = self._instances.get((model_class.entity_name, uid))
+        if not isinstance(instance, model_class):
+            # Another Model may target the same entity with other fields
+            return None
+        return instance
+
+    def add(self, instance):
+        """Register an instance. Instances without uid are ignored since
+        they don't exist in the database yet.
+
+        :param instance: The instance to register
+        :type instance: vfxDatabaseORM.core.models.Model
+        """
+        if not instance.uid:
+            return
+        self._instances[(instance.entity_name, instance.uid)] = instance
+
+    def remove(self, instance):
+        """Unregister an instance.
+
+        :param instance: The instance to unregister
+        :type instance: vfxDatabaseORM.core.models.Model
+        """
+        self._instances.pop((instance.entity_name, instance.uid), None)
+
+    def clear(self):
+        """Unregister all instances."""
+        self._instances.clear()
+
+    def __enter__(self):
+        if not hasattr(_local, "stack"):
+            _local.stack = []
+        _local.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.stack.remove(self)
+
+    def __len__(self):
+        return len(self._instances)
+
+    def __contains__(self, instance):
+        key = (instance.entity_name, instance.uid)
+        return self._instances.get(key) is instance
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+#
+# - queryCache.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import time
+import json
+import errno
+import pickle
+import hashlib
+import tempfile
+import threading
+
+from collections import OrderedDict
+
+from vfxDatabaseORM.core.interfaces.cache import ICache
+
+
+class MemoryCache(ICache):
+    """In-memory cache with a least recently used eviction and an optional
+    time to live.
+
+    >>> class StudioManager(ShotgridManager):
+    ...     QUERY_CACHE = MemoryCache(max_size=500, ttl=60)
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        """Constructor for MemoryCache
+
+        :param max_size: The maximum number of stored values, defaults to 1024
+        :type max_size: int, optional
+        :param ttl: Seconds before a value expires, defaults to None (never)
+        :type ttl: float, optional
+        """
+        super(MemoryCache, self).__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                self.misses += 1
+                return None
+
+            # Move the entry to the end, it is the most recently used
+            self._entries[key] = entry
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires_at, value)
+            while len(self._entries) > self.max_size:
+                # Evict the least recently used entry
+                self._entries.popitem(last=False)
+
+    def invalidate(self, entity_name):
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == entity_name or entity_name in key[1]:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache(ICache):
+    """On-disk cache which can be shared by several processes. Each value is
+    pickled in its own file of the cache directory.
+    """
+
+    def __init__(self, directory, ttl=None):
+        """Constructor for DiskCache
+
+        :param directory: The directory where values are stored
+        :type directory: str
+        :param ttl: Seconds before a value expires, defaults to None (never)
+        :type ttl: float, optional
+        """
+        super(DiskCache, self).__init__()
+        self.directory = directory
+        self.ttl = ttl
+
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError as error:
+                # Another process may have created it
+                if error.errno != errno.EEXIST:
+                    raise
+
+    def get(self, key):
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                expires_at, value = pickle.load(cache_file)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+
+        if expires_at is not None and expires_at < time.time():
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+
+        # Write in a temporary file first, so other processes never read
+        # a partially written file.
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(file_descriptor, "wb") as cache_file:
+                pickle.dump((expires_at, value), cache_file, protocol=2)
+            _replace(temp_path, self._get_path(key))
+        except Exception:
+            # Values which can't be pickled would leave the file forever,
+            # clear() only removes cache files.
+            self._remove(temp_path)
+            raise
+
+    def invalidate(self, entity_name):
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(".cache"):
+                continue
+            # Entity names are before the digest, see _get_path()
+            entity_names = file_name.split("-", 1)[0].split("+")
+            if entity_name in entity_names:
+                self._remove(os.path.join(self.directory, file_name))
+
+    def clear(self):
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".cache"):
+                self._remove(os.path.join(self.directory, file_name))
+
+    def _get_path(self, key):
+        # repr() of a set depends on the hash seed of the process, the key
+        # must be canonical so every process finds the same file.
+        digest = hashlib.sha1(_dump_key(key).encode("utf-8")).hexdigest()
+        # The entity and the entities the value depends on, so invalidate()
+        # doesn't need to read files.
+        file_name = "{entity_names}-{digest}.cache".format(
+            entity_names="+".join((key[0],) + tuple(key[1])), digest=digest
+        )
+        return os.path.join(self.directory, file_name)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _dump_key(value):
+    """Serialize a cache key into a string which does not depend on the
+    process, sets are sorted and tuples become lists.
+
+    :param value: The key to serialize
+    :type value: any
+    :return: The canonical representation of the key
+    :rtype: str
+    """
+    return json.dumps(_canonical(value), sort_keys=True, default=repr)
+
+
+def _canonical(value):
+    if isinstance(value, (set, frozenset)):
+        # Items may not be comparable together, sort their serialized form
+        return sorted((_canonical(v) for v in value), key=_dump_key)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return sorted(
+            ([_canonical(k), _canonical(v)] for k, v in value.items()),
+            key=_dump_key,
+        )
+    return value
+
+
+def _replace(source, destination):
+    """Atomically move source over destination."""
+    if hasattr(os, "replace"):
+        os.replace(source, destination)
+        return
+
+    # os.rename() overwrites atomically on posix. On Windows it refuses an
+    # existing destination, python 2 has no better option than removing it.
+    try:
+        os.rename(source, destination)
+    except OSError:
+        if not os.path.exists(destination):
+            raise
+        os.remove(destination)
+        os.rename(source, destination)
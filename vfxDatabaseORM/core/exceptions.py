@@ -65,3 +65,29 @@ class ModelNotRegistered(Exception):
 
 class ManagerNotDefined(Exception):
     pass
+
+
+class InvalidQuery(Exception):
+    pass
+
+
+class BulkOperationError(Exception):
+    """Raised when some items of a bulk operation have failed.
+
+    ``results`` contains the result of each item in the given order (None for
+    failed items) and ``errors`` contains (index, instance, exception) tuples
+    for failed items.
+    """
+
+    def __init__(self, message, results, errors):
+        super(BulkOperationError, self).__init__(message)
+        self.results = results
+        self.errors = errors
+
+
+class EntityNotFound(Exception):
+    pass
+
+
+class PoolExhausted(Exception):
+    pass
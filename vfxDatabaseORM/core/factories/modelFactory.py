@@ -22,27 +22,118 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from vfxDatabaseORM.core.caches import IdentityMap
+
 
 class ModelFactory(object):
     """ModelFactory is a factory for models."""
 
     @staticmethod
-    def build(model_class, raw_values):
+    def build(model_class, raw_values, deferred_fields=None):
         """Create an instance of the given model class with the given values.
+        If an IdentityMap is active and the entity has already been built,
+        the existing instance is returned.
 
         :param model_class: The Model to build
         :type model_class: vfxDatabaseORM.core.models.Model
         :param raw_values: Values for the model. It should be raw values
         from the database.
         :type raw_values: dict
+        :param deferred_fields: Names of fields which have not been retrieved
+        from the database, they will be loaded on first access,
+        defaults to None
+        :type deferred_fields: list, optional
         :return: An instance of the Model
         :rtype: vfxDatabaseORM.core.models.Model
         """
-        kwargs = {}
-        fields = model_class.get_fields()
-        for field in fields:
-            for value_name, value in raw_values.items():
-                if value_name != field.db_name:
-                    continue
-                kwargs[field.name] = value
-        return model_class(**kwargs)
+        return ModelFactory._build(
+            model_class, raw_values, IdentityMap.get_current(), deferred_fields
+        )
+
+    @staticmethod
+    def build_many(model_class, rows, deferred_fields=None):
+        """Create instances of the given model class, one per row. It is the
+        same as calling build() for each row, but the setup is done once.
+
+        :param model_class: The Model to build
+        :type model_class: vfxDatabaseORM.core.models.Model
+        :param rows: Raw values from the database, one dict per instance
+        :type rows: list
+        :param deferred_fields: Names of fields which have not been retrieved
+        from the database, they will be loaded on first access,
+        defaults to None
+        :type deferred_fields: list, optional
+        :return: Instances of the Model, in the same order
+        :rtype: list
+        """
+        identity_map = IdentityMap.get_current()
+        if identity_map is None:
+            return model_class._from_db_many(
+                rows, deferred_fields=deferred_fields
+            )
+        return [
+            ModelFactory._build(
+                model_class, raw_values, identity_map, deferred_fields
+            )
+            for raw_values in rows
+        ]
+
+    @staticmethod
+    def to_raw_values(instance, fields=None):
+        """Get values of an instance as raw values from the database, the
+        opposite of build(). Deferred fields are not loaded.
+
+        :param instance: The instance
+        :type instance: vfxDatabaseORM.core.models.Model
+        :param fields: Basic fields to get, defaults to all basic fields
+        :type fields: list, optional
+        :return: Values, by db_name
+        :rtype: dict
+        """
+        if fields is None:
+            fields = instance.get_fields()
+        return {
+            field.db_name: getattr(instance, "_{name}".format(name=field.name))
+            for field in fields
+        }
+
+    @staticmethod
+    def _build(model_class, raw_values, identity_map, deferred_fields):
+        """Create an instance from raw values, see build().
+
+        :param identity_map: The active identity map, if any
+        :type identity_map: vfxDatabaseORM.core.caches.IdentityMap
+        """
+        if identity_map is not None:
+            uid = raw_values.get(model_class._meta.uid_field.db_name)
+            instance = identity_map.get(model_class, uid) if uid else None
+            if instance is not None:
+                ModelFactory._fill_deferred_fields(instance, raw_values)
+                return instance
+
+        instance = model_class._from_db(
+            raw_values, deferred_fields=deferred_fields
+        )
+
+        if identity_map is not None:
+            identity_map.add(instance)
+
+        return instance
+
+    @staticmethod
+    def _fill_deferred_fields(instance, raw_values):
+        """Set deferred fields of an already built instance with values
+        retrieved from the database.
+
+        :param instance: The instance to fill
+        :type instance: vfxDatabaseORM.core.models.Model
+        :param raw_values: Raw values from the database, by db_name
+        :type raw_values: dict
+        """
+        for field_name in list(instance._deferred):
+            field = instance._meta.get_field(field_name)
+            if field.db_name not in raw_values:
+                continue
+            attribute_name = "_{name}".format(name=field_name)
+            setattr(instance, attribute_name, raw_values[field.db_name])
+            instance._deferred.discard(field_name)
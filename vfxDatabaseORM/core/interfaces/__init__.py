@@ -22,5 +22,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import six
+
+from .cache import ICache  # noqa
 from .manager import IManager  # noqa
 from .serializer import ISerializer  # noqa
+
+if six.PY3:
+    # Coroutines are not supported by python 2
+    from .asyncManager import AsyncIManager  # noqa
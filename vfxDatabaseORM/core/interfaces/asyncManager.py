@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# - asyncManager.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from vfxDatabaseORM.core.models import constants
+from vfxDatabaseORM.core.caches import IdentityMap
+from vfxDatabaseORM.core.queries.asyncQuerySet import AsyncQuerySet
+
+from .manager import IManager
+
+
+class AsyncIManager(IManager):
+    """Interface for managers used from asyncio coroutines. Blocking methods
+    of the manager run in a bounded pool of threads, so the event loop is
+    never blocked and many requests can be in flight at the same time.
+
+    >>> shot, assets = await asyncio.gather(
+    ...     Shot.objects.aget(1), Asset.objects.afilters(code="foo")
+    ... )
+    """
+
+    # Maximum number of threads running requests at the same time,
+    # per executor
+    MAX_WORKERS = constants.DEFAULT_MAX_WORKERS
+
+    _EXECUTORS = {}
+    _EXECUTORS_LOCK = threading.Lock()
+
+    def _get_executor_key(self):
+        """Get the key of the executor. Managers with the same key share
+        the same executor.
+
+        :rtype: hashable
+        """
+        return self.__class__
+
+    def _get_max_workers(self):
+        """Get the maximum number of threads of the executor.
+
+        :rtype: int
+        """
+        return self.MAX_WORKERS
+
+    def _get_executor(self):
+        """Get the executor which runs blocking requests of the manager.
+
+        :rtype: concurrent.futures.ThreadPoolExecutor
+        """
+        key = self._get_executor_key()
+        with self._EXECUTORS_LOCK:
+            executor = self._EXECUTORS.get(key)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self._get_max_workers()
+                )
+                self._EXECUTORS[key] = executor
+        return executor
+
+    async def run_in_executor(self, func, *args, **kwargs):
+        """Run a blocking callable in the executor of the manager. The active
+        IdentityMap of the caller is also active in the thread.
+
+        :param func: The callable to run
+        :type func: callable
+        :return: The result of the callable
+        :rtype: any
+        """
+        call = functools.partial(func, *args, **kwargs)
+        run = IdentityMap.bind_current(call)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), run)
+
+    async def aget(self, uid):
+        """Asynchronous version of get().
+
+        :param uid: The id of the object in the database
+        :type uid: int
+        :return: The object, None if it doesn't exist
+        :rtype: vfxDatabaseORM.core.models.Model
+        """
+        return await self.run_in_executor(self.get, uid)
+
+    def aall(self):
+        """Asynchronous version of all(). Nothing is requested until the
+        result is awaited or iterated.
+
+        :return: An AsyncQuerySet on all objects
+        :rtype: vfxDatabaseORM.core.queries.AsyncQuerySet
+        """
+        return AsyncQuerySet(manager=self, queryset=self.all())
+
+    def afilters(self, *args, **kwargs):
+        """Asynchronous version of filters(). Nothing is requested until the
+        result is awaited or iterated.
+
+        :return: An AsyncQuerySet on filtered objects
+        :rtype: vfxDatabaseORM.core.queries.AsyncQuerySet
+        """
+        return AsyncQuerySet(
+            manager=self, queryset=self.filters(*args, **kwargs)
+        )
+
+    async def acreate(self, **kwargs):
+        """Asynchronous version of create().
+
+        :return: The created object
+        :rtype: vfxDatabaseORM.core.models.Model
+        """
+        return await self.run_in_executor(self.create, **kwargs)
+
+    async def ainsert(self, instance):
+        """Asynchronous version of insert().
+
+        :param instance: The instance to insert in the database.
+        :type instance: vfxDatabaseORM.core.models.Model
+        """
+        return await self.run_in_executor(self.insert, instance)
+
+    async def aupdate(self, instance):
+        """Asynchronous version of update().
+
+        :param instance: The instance to update in the database.
+        :type instance: vfxDatabaseORM.core.models.Model
+        """
+        return await self.run_in_executor(self.update, instance)
+
+    async def adelete(self, instance):
+        """Asynchronous version of delete().
+
+        :param instance: The instance to delete from the database.
+        :type instance: vfxDatabaseORM.core.models.Model
+        """
+        return await self.run_in_executor(self.delete, instance)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# - cache.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import abc
+
+ABC = abc.ABCMeta("ABC", (object,), {})
+
+
+class ICache(ABC):
+    """Interface for query-result caches used by managers.
+
+    Keys are tuples whose first item is the entity name and second item a
+    tuple of names of other entities the value depends on, so all entries
+    which depend on an entity can be invalidated at once.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Get hit and miss counters of the cache.
+
+        :return: The counters
+        :rtype: dict
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    @abc.abstractmethod
+    def get(self, key):
+        """Get the value stored for the key and update hit/miss counters.
+
+        :param key: The key of the value
+        :type key: tuple
+        :return: The stored value, None if there is no valid value
+        :rtype: any
+        """
+        pass
+
+    @abc.abstractmethod
+    def set(self, key, value):
+        """Store a value for the key.
+
+        :param key: The key of the value
+        :type key: tuple
+        :param value: The value to store
+        :type value: any
+        """
+        pass
+
+    @abc.abstractmethod
+    def invalidate(self, entity_name):
+        """Remove all values stored for the entity, or which depend on it.
+
+        :param entity_name: The name of the entity
+        :type entity_name: str
+        """
+        pass
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove all values."""
+        pass
@@ -23,6 +23,14 @@
 # SOFTWARE.
 
 import abc
+import copy
+
+from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.caches import IdentityMap
+from vfxDatabaseORM.core.models import constants
+from vfxDatabaseORM.core.factories import ModelFactory
+from vfxDatabaseORM.core.queries import QuerySet, gather, run_in_parallel
+from vfxDatabaseORM.core.queries.aggregates import aggregate_rows
 
 ABC = abc.ABCMeta("ABC", (object,), {})
 
@@ -30,9 +38,286 @@ ABC = abc.ABCMeta("ABC", (object,), {})
 class IManager(ABC):
     """Interface for all managers."""
 
+    # Default number of entities sent per request by bulk operations
+    BATCH_SIZE = 100
+
+    # Cache of query results shared by all instances of the manager,
+    # see vfxDatabaseORM.core.caches
+    QUERY_CACHE = None
+
+    # Maximum number of related models a filter can go through in a single
+    # request (eg: 2 for "shot__sequence__code__is"), None if there is no
+    # limit. Deeper filters are resolved by subqueries,
+    # see vfxDatabaseORM.core.queries.plan_query()
+    MAX_FILTER_DEPTH = None
+
     def __init__(self, model_class):
         self.model_class = model_class
 
+    def get_queryset(self):
+        """Get a new lazy QuerySet on all objects of the model.
+
+        :return: The QuerySet
+        :rtype: vfxDatabaseORM.core.queries.QuerySet
+        """
+        return QuerySet(manager=self)
+
+    def count(self):
+        """Get the number of objects in the database, without retrieving
+        them. See QuerySet.count().
+
+        :return: The number of objects
+        :rtype: int
+        """
+        return self.get_queryset().count()
+
+    def exists(self):
+        """Is there at least one object in the database ?
+        See QuerySet.exists().
+
+        :return: True if there is an object, False otherwise
+        :rtype: bool
+        """
+        return self.get_queryset().exists()
+
+    def aggregate(self, *args, **kwargs):
+        """Compute aggregates over all objects in the database.
+        See QuerySet.aggregate().
+
+        >>> Version.objects.aggregate(Sum("frame_count"), group_by="status")
+        [{"status": "apr", "frame_count__sum": 2400}, ...]
+
+        :return: Results by alias, or a list of them with group_by
+        :rtype: dict or list
+        """
+        return self.get_queryset().aggregate(*args, **kwargs)
+
+    @staticmethod
+    def gather(*querysets, **kwargs):
+        """Evaluate independent QuerySets, of any model, at the same time.
+        See vfxDatabaseORM.core.queries.gather().
+
+        >>> shots, assets = Shot.objects.gather(
+        ...     Shot.objects.filters(project=project),
+        ...     Asset.objects.filters(project=project),
+        ... )
+
+        :return: Results of each QuerySet as a list, in the same order
+        :rtype: list
+        """
+        return gather(*querysets, **kwargs)
+
+    @staticmethod
+    def parallel(*callables, **kwargs):
+        """Call independent callables at the same time.
+        See vfxDatabaseORM.core.queries.run_in_parallel().
+
+        >>> project, shot = Shot.objects.parallel(
+        ...     lambda: Project.objects.get(1), lambda: Shot.objects.get(2)
+        ... )
+
+        :return: Results of the callables, in the same order
+        :rtype: list
+        """
+        return run_in_parallel(*callables, **kwargs)
+
+    def execute(self, query):
+        """Run the query in the database. Managers which return a QuerySet
+        from all() or filters() should implement it.
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: Instances corresponding to the query
+        :rtype: list
+        """
+        raise NotImplementedError()
+
+    def execute_raw(self, query):
+        """Run the query in the database and get raw rows instead of
+        instances. Managers should override it to skip the creation of
+        instances, the default implementation relies on execute().
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: Raw values by db_name, one dict per entity
+        :rtype: list
+        """
+        fields = query.get_fields()
+        # Instances registered in an IdentityMap may have local changes
+        with IdentityMap.suspend():
+            instances = self.execute(query)
+        return [
+            ModelFactory.to_raw_values(instance, fields)
+            for instance in instances
+        ]
+
+    def execute_count(self, query):
+        """Count the rows matching the query. Managers should override it
+        to count in the database, the default implementation streams uids
+        of all rows.
+
+        :param query: The query to count
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: The number of rows
+        :rtype: int
+        """
+        count_query = query.clone()
+        count_query.set_only_fields([])
+        rows = self.iterate_raw(count_query, constants.DEFAULT_CHUNK_SIZE)
+        return sum(1 for _ in rows)
+
+    def execute_exists(self, query):
+        """Check if at least one row matches the query. Only the uid of the
+        first row is requested.
+
+        :param query: The query to check
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: True if a row matches the query, False otherwise
+        :rtype: bool
+        """
+        exists_query = query.clone()
+        exists_query.set_only_fields([])
+        exists_query.set_limits(0, 1)
+        return bool(self.execute_raw(exists_query))
+
+    def execute_aggregate(self, query, aggregates, group_by=None):
+        """Compute aggregates over the rows matching the query. Managers
+        should override it to compute them in the database, the default
+        implementation streams values of the needed fields and reduces
+        them on the client side.
+
+        :param query: The query to aggregate
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param aggregates: Aggregates by alias
+        :type aggregates: dict
+        :param group_by: Names of the fields to group rows by, defaults to None
+        :type group_by: list, optional
+        :return: Results by alias. With group_by, a list of them, one per
+        group, which also contains values of the grouped fields.
+        :rtype: dict or list
+        """
+        field_names = [
+            aggregate.field_name for aggregate in aggregates.values()
+        ]
+        field_names.extend(group_by or [])
+
+        aggregate_query = query.clone()
+        aggregate_query.set_only_fields(field_names)
+        rows = self.iterate_raw(aggregate_query, constants.DEFAULT_CHUNK_SIZE)
+        return aggregate_rows(self.model_class, rows, aggregates, group_by)
+
+    def run_query(self, query):
+        """Run the query through the QUERY_CACHE. The database is only
+        requested when the result is not in the cache.
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: Instances corresponding to the query
+        :rtype: list
+        """
+        if self.QUERY_CACHE is None:
+            return list(self.execute(query))
+
+        key = query.get_cache_key()
+        deferred_fields = query.get_deferred_field_names()
+
+        # Raw values are stored instead of instances, so changes on instances
+        # already registered in an IdentityMap are not cached.
+        rows = self.QUERY_CACHE.get(key)
+        if rows is None:
+            rows = list(self.execute_raw(query))
+            self.QUERY_CACHE.set(key, rows)
+
+        # Instances get their own copy of the values, a change on a mutable
+        # value (eg: the list of a ListField) would alter the cached rows.
+        return ModelFactory.build_many(
+            self.model_class,
+            copy.deepcopy(rows),
+            deferred_fields=deferred_fields,
+        )
+
+    def run_raw_query(self, query):
+        """Run the query through the QUERY_CACHE and get raw rows instead of
+        instances, see run_query(). Returned rows may be shared with the
+        cache, they should not be modified.
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :return: Raw values by db_name, one dict per entity
+        :rtype: list
+        """
+        if self.QUERY_CACHE is None:
+            return self.execute_raw(query)
+
+        key = query.get_cache_key()
+        rows = self.QUERY_CACHE.get(key)
+        if rows is None:
+            rows = list(self.execute_raw(query))
+            self.QUERY_CACHE.set(key, rows)
+        return rows
+
+    def invalidate_cache(self):
+        """Remove cached results of the model and of queries whose filters
+        go through it (eg: "shot__sequence__code" for a Sequence), see
+        Query.get_related_entity_names(). Managers should call it each time
+        entities are created, updated or deleted.
+        """
+        if self.QUERY_CACHE is None:
+            return
+        self.QUERY_CACHE.invalidate(self.model_class.entity_name)
+
+    def iterate(self, query, chunk_size):
+        """Run the query in the database and yield instances one by one.
+        Managers should override it to fetch rows page by page, the default
+        implementation relies on execute().
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param chunk_size: The number of rows to fetch per request
+        :type chunk_size: int
+        :return: A generator of instances
+        :rtype: generator
+        """
+        for instance in self.execute(query):
+            yield instance
+
+    def iterate_raw(self, query, chunk_size):
+        """Run the query in the database and yield raw rows one by one, see
+        iterate(). Managers should override it to skip the creation of
+        instances, the default implementation relies on iterate().
+
+        :param query: The query to run
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param chunk_size: The number of rows to fetch per request
+        :type chunk_size: int
+        :return: A generator of raw values by db_name
+        :rtype: generator
+        """
+        fields = query.get_fields()
+        for instance in self.iterate(query, chunk_size):
+            yield ModelFactory.to_raw_values(instance, fields)
+
+    def fetch_related(self, field, uids):
+        """Get objects linked to any of the given uids through the related
+        field. Managers should override it to send a single request, the
+        default implementation calls filters() for each uid.
+
+        :param field: The related field of the model which links to the uids
+        :type field: vfxDatabaseORM.core.models.fields.RelatedField
+        :param uids: Uids of the linked objects
+        :type uids: list
+        :return: Objects grouped by linked uid
+        :rtype: dict
+        """
+        key = "{}{}{}{}{}".format(
+            field.name,
+            constants.LOOKUP_TOKEN,
+            constants.UID_KEY,
+            constants.LOOKUP_TOKEN,
+            constants.LOOKUPS.EQUAL,
+        )
+        return {uid: list(self.filters(**{key: uid})) for uid in uids}
+
     @abc.abstractmethod
     def get(self, uid):
         """Get object in the database for the given uid.
@@ -44,12 +329,20 @@ class IManager(ABC):
 
     @abc.abstractmethod
     def all(self):
-        """Get all objects in the database."""
+        """Get all objects in the database.
+
+        :return: All objects, usually as a lazy QuerySet
+        :rtype: vfxDatabaseORM.core.queries.QuerySet
+        """
         pass
 
     @abc.abstractmethod
-    def filters(self, **kwargs):
-        """Filters objects in the database."""
+    def filters(self, *args, **kwargs):
+        """Filters objects in the database with Q objects and lookups.
+
+        :return: Filtered objects, usually as a lazy QuerySet
+        :rtype: vfxDatabaseORM.core.queries.QuerySet
+        """
         pass
 
     @abc.abstractmethod
@@ -80,3 +373,129 @@ class IManager(ABC):
     def delete(self, instance):
         """Delete the object from the database."""
         pass
+
+    def bulk_create(self, instances, batch_size=None):
+        """Insert many objects in the database. Managers should override it
+        to send batch requests, the default implementation calls insert()
+        for each instance.
+
+        :param instances: Instances to insert
+        :type instances: list
+        :param batch_size: The number of objects per request,
+        defaults to BATCH_SIZE
+        :type batch_size: int, optional
+        :raises exceptions.BulkOperationError: Raised if some objects
+        have not been inserted
+        :return: New instances, in the same order
+        :rtype: list
+        """
+        return self._run_in_batches(
+            instances, 1, lambda batch: [self.insert(batch[0])]
+        )
+
+    def bulk_update(self, instances, fields=None, batch_size=None):
+        """Update many objects in the database. Managers should override it
+        to send batch requests, the default implementation calls update()
+        for each instance, so batch_size is not used. With fields, only the
+        given fields are seen as changed by update().
+
+        :param instances: Instances to update
+        :type instances: list
+        :param fields: Names of the fields to send, defaults to changed fields
+        :type fields: list, optional
+        :param batch_size: The number of objects per request,
+        defaults to BATCH_SIZE
+        :type batch_size: int, optional
+        :raises exceptions.BulkOperationError: Raised if some objects
+        have not been updated
+        :return: Updated instances, in the same order
+        :rtype: list
+        """
+        if fields is not None:
+            fields = [self.model_class.get_field(name) for name in fields]
+
+        def run_batch(batch):
+            instance = batch[0]
+            if fields is None:
+                self.update(instance)
+                instance._mark_saved()
+                return batch
+
+            changed = instance._changed
+            instance._changed = {
+                field: changed.get(field, constants.NOT_LOADED)
+                for field in fields
+            }
+            try:
+                self.update(instance)
+            finally:
+                instance._changed = changed
+            # Changes of other fields have not been sent, they are kept
+            instance._mark_saved(fields)
+            return batch
+
+        return self._run_in_batches(instances, 1, run_batch)
+
+    def bulk_delete(self, instances, batch_size=None):
+        """Delete many objects from the database. Managers should override it
+        to send batch requests, the default implementation calls delete()
+        for each instance.
+
+        :param instances: Instances to delete
+        :type instances: list
+        :param batch_size: The number of objects per request,
+        defaults to BATCH_SIZE
+        :type batch_size: int, optional
+        :raises exceptions.BulkOperationError: Raised if some objects
+        have not been deleted
+        :return: The result of delete() for each instance, in the same order
+        :rtype: list
+        """
+        return self._run_in_batches(
+            instances, 1, lambda batch: [self.delete(batch[0])]
+        )
+
+    def _run_in_batches(self, instances, batch_size, run_batch):
+        """Split instances into batches and run each of them. A failed batch
+        doesn't stop the following ones, failures are reported at the end.
+
+        :param instances: Instances to process
+        :type instances: list
+        :param batch_size: The number of instances per batch,
+        defaults to BATCH_SIZE
+        :type batch_size: int
+        :param run_batch: Callable which processes a batch and returns
+        one result per instance
+        :type run_batch: callable
+        :raises exceptions.BulkOperationError: Raised if some batches
+        have failed
+        :return: Results, in the same order as instances
+        :rtype: list
+        """
+        instances = list(instances)
+        batch_size = batch_size or self.BATCH_SIZE
+
+        results = []
+        errors = []
+        for start in range(0, len(instances), batch_size):
+            batch = instances[start:start + batch_size]
+            try:
+                batch_results = run_batch(batch)
+            except Exception as error:
+                results.extend([None] * len(batch))
+                errors.extend(
+                    (start + index, instance, error)
+                    for index, instance in enumerate(batch)
+                )
+                continue
+            results.extend(batch_results)
+
+        if errors:
+            raise exceptions.BulkOperationError(
+                "{count} of {total} objects have failed.".format(
+                    count=len(errors), total=len(instances)
+                ),
+                results,
+                errors,
+            )
+        return results
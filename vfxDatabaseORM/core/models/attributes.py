@@ -46,48 +46,24 @@ class AttributeDescriptor(object):
             )
 
         if not self._field.is_related:
+            if self._field.name in instance._deferred:
+                # The value has not been retrieved yet, load it now.
+                instance._load_deferred_field(self._field)
             # It is not a related field, simply return the value.
             return getattr(instance, self._attribute_name)
 
         # TODO maybe for o2m and m2m fields we can have an object with
         # .clear(), .set(), .add(), .remove() methods ?
 
-        if instance.is_dirty and self._field.name in [x.name for x in instance._changed]:
+        if self._field in instance._changed:
             return getattr(instance, self._attribute_name)
 
-        # It is a related field
-        related_model = instance._graph.get_node_model(self._field.to)
-        related_db_name = self._field.related_db_name
-        related_model_fields = related_model.get_related_fields()
-
-        related_field = None
-        for field in related_model_fields:
-            if field.db_name == related_db_name:
-                related_field = field
-                break
-
-        if not related_field:
-            raise exceptions.FieldRelatedError(
-                "The corresponding {field_class_name} for '{field}' "
-                "should also be defined "
-                "in the related model '{related_model}'.".format(
-                    field_class_name=self._field.__class__.__name__,
-                    field=self._field,
-                    related_model=related_model,
-                )
-            )
-
-        kwargs = {}
-        key = "{}{}{}{}{}".format(
-            related_field.name,
-            constants.LOOKUP_TOKEN,
-            constants.UID_KEY,
-            constants.LOOKUP_TOKEN,
-            constants.LOOKUPS.EQUAL,
-        )
-        kwargs[key] = instance.uid
-
-        result = related_model.objects.filters(**kwargs)
+        if self._field.name in instance._related_cache:
+            # Already resolved, by a previous access or a prefetch
+            result = instance._related_cache[self._field.name]
+        else:
+            result = list(self._query_related(instance))
+            instance._set_related_cache(self._field.name, result)
 
         if self._field.is_one_to_many:
             return result
@@ -115,6 +91,31 @@ class AttributeDescriptor(object):
                 "are configured here."
             )
 
+    def _query_related(self, instance):
+        """Query the database to get entities linked to the instance through
+        the related field.
+
+        :param instance: The instance which owns the related field
+        :type instance: vfxDatabaseORM.core.models.Model
+        :return: Linked entities
+        :rtype: list
+        """
+        related_model, related_field = instance._resolve_related_field(
+            self._field
+        )
+
+        kwargs = {}
+        key = "{}{}{}{}{}".format(
+            related_field.name,
+            constants.LOOKUP_TOKEN,
+            constants.UID_KEY,
+            constants.LOOKUP_TOKEN,
+            constants.LOOKUPS.EQUAL,
+        )
+        kwargs[key] = instance.uid
+
+        return related_model.objects.filters(**kwargs)
+
     def __set__(self, instance, value):
         if not instance._initialized:
             if not self._field.check_value(value):
@@ -146,22 +147,35 @@ class AttributeDescriptor(object):
 
         # Related fields
         if self._field.is_related:
+            # Drop the value retrieved from the database
+            instance._related_cache.pop(self._field.name, None)
+
             # The field has been changed, mark it as changed.
             if self._field not in instance._changed:
-                instance._changed.append(self._field)
+                instance._set_changed(self._field, constants.NOT_LOADED)
 
-            instance._dirty = True
             setattr(instance, self._attribute_name, value)
 
         # No related field
         else:
-            if getattr(instance, self._field.name) == value:
-                # It is the same value, no change to perform
-                return
-
-            # The field has been changed, mark it as changed.
-            if self._field not in instance._changed:
-                instance._changed.append(self._field)
+            if self._field in instance._changed:
+                original_value = instance._changed[self._field]
+                if original_value is not constants.NOT_LOADED and (
+                    original_value == value
+                ):
+                    # Back to the value of the database, nothing to send
+                    del instance._changed[self._field]
+            elif self._field.name in instance._deferred:
+                # The value in the database is unknown, no need to load it
+                # since it is overridden.
+                instance._deferred.discard(self._field.name)
+                instance._set_changed(self._field, constants.NOT_LOADED)
+            else:
+                original_value = getattr(instance, self._attribute_name)
+                if original_value == value:
+                    # It is the same value, no change to perform
+                    return
+                # The field has been changed, keep its original value.
+                instance._set_changed(self._field, original_value)
 
-            instance._dirty = True
             setattr(instance, self._attribute_name, value)
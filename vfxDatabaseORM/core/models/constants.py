@@ -41,5 +41,31 @@ class LOOKUPS(object):
     ENDS_WITH = "endswith"
 
 
+# Aggregate functions
+class AGGREGATES(object):
+    COUNT = "count"
+    SUM = "sum"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+
+
 # Lookup token
 LOOKUP_TOKEN = "__"
+
+
+# Prefix of a field name to order in descending order
+ORDER_DESCENDING_TOKEN = "-"
+
+
+# Default number of rows fetched per request when streaming results
+DEFAULT_CHUNK_SIZE = 500
+
+
+# Default maximum number of threads sending requests at the same time
+DEFAULT_MAX_WORKERS = 8
+
+
+# Original value of a changed field which has not been retrieved from the
+# database (deferred or related fields)
+NOT_LOADED = object()
@@ -136,10 +136,16 @@ class BaseField(object):
         >>> ComputedLookup.related_field_name # uid
         >>> ComputedLookup.lookup # lt
 
+        >>> compute_lookup(shot__sequence__code__is) # through several models
+        >>> ComputedLookup.field_name # shot
+        >>> ComputedLookup.related_field_name # sequence__code
+        >>> ComputedLookup.lookup # is
+
         :param arg_with_filter: The argument with the lookup
         :type arg_with_filter: str
         :raises exceptions.InvalidLookUp: Raised if the lookup is not defined
-        for this field.
+        for this field. Lookups of related fields of related models are not
+        checked.
         :return: The computed lookup
         :rtype: ComputedLookup
         """
@@ -148,18 +154,17 @@ class BaseField(object):
         related_field_name = None
         lookup = None
 
-        if len(args) == 3:
-            # related field
-            field_name, related_field_name, lookup = args
+        if len(args) >= 3:
+            # related field, possibly through several related models
+            field_name = args[0]
+            related_field_name = self.LOOKUP_TOKEN.join(args[1:-1])
+            lookup = args[-1]
         elif len(args) == 2:
             # classic field with lookup
             field_name, lookup = args
-        elif len(args) == 1:
+        else:
             # classic field without lookup
             field_name = args[0]
-        else:
-            # More than three level, it is not supported yet
-            raise exceptions.InvalidLookUp("Only first deph lookup works.")
 
         if field_name != self.name:
             # This field is seems not be the right field
@@ -178,6 +183,11 @@ class BaseField(object):
                 field_name, related_field_name, LOOKUPS.EQUAL
             )
 
+        if related_field_name:
+            # The lookup applies to the last field of the related path, it
+            # is checked once the path is resolved, see compile_lookup()
+            return ComputedLookup(field_name, related_field_name, lookup)
+
         if lookup not in self.LOOKUPS:
             raise exceptions.InvalidLookUp(
                 "The lookup '{lookup}' is not valid. "
@@ -276,6 +286,8 @@ class IntegerField(Field):
         LOOKUPS.NOT_EQUAL,
         LOOKUPS.LESS_THAN,
         LOOKUPS.GREATER_THAN,
+        LOOKUPS.IN,
+        LOOKUPS.NOT_IN,
     ]
 
     def check_value(self, value):
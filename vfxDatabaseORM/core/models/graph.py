@@ -22,17 +22,16 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import networkx as nx
-
 from vfxDatabaseORM.core import exceptions
 
 
 class Graph(object):
-    _graph = None
-
     def __init__(self):
-        if not self._graph:
-            self._graph = nx.Graph()
+        # Data of each node, by node name
+        self._nodes = {}
+        # Neighbors of each node with the data of the edge, by node name.
+        # The data dict is shared by both directions of an edge.
+        self._adjacency = {}
 
     @property
     def nodes(self):
@@ -41,7 +40,7 @@ class Graph(object):
         :return: All nodes in the graph
         :rtype: list
         """
-        return list(self._graph.nodes(data=True))
+        return list(self._nodes.items())
 
     @property
     def edges(self):
@@ -50,7 +49,19 @@ class Graph(object):
         :return: All edges in the graph
         :rtype: list
         """
-        return list(self._graph.edges(data=True))
+        edges = []
+        seen = set()
+        for node_name, neighbors in self._adjacency.items():
+            for neighbor_name, data in neighbors.items():
+                if neighbor_name not in seen:
+                    edges.append((node_name, neighbor_name, data))
+            seen.add(node_name)
+        return edges
+
+    def _add_node_if_missing(self, node_name):
+        if node_name not in self._nodes:
+            self._nodes[node_name] = {}
+            self._adjacency[node_name] = {}
 
     def add_node(self, node_name):
         """Add a node to the graph
@@ -58,8 +69,9 @@ class Graph(object):
         :param node_name: The name of the node
         :type node_name: str
         """
-        self._graph.add_node(
-            node_name, model=None, attributes=[], related_attributes=[]
+        self._add_node_if_missing(node_name)
+        self._nodes[node_name].update(
+            model=None, attributes=[], related_attributes=[]
         )
 
     def get_node_model(self, node_name):
@@ -72,12 +84,31 @@ class Graph(object):
         :return: The class corresponding to this node
         :rtype: vfxDatabaseORM.core.models.Model
         """
-        if node_name not in self._graph.nodes:
+        try:
+            return self._nodes[node_name].get("model")
+        except KeyError:
+            raise exceptions.ModelNotRegistered(
+                "The model '{node_name}' cannot be found. "
+                "Have you defined it ?".format(node_name=node_name)
+            )
+
+    def get_neighbors(self, node_name):
+        """Get names of the nodes connected to the given node.
+
+        :param node_name: The name of the node
+        :type node_name: str
+        :raises exceptions.ModelNotRegistered: Raised if the node doesn't
+        exist
+        :return: Names of the connected nodes
+        :rtype: list
+        """
+        try:
+            return list(self._adjacency[node_name])
+        except KeyError:
             raise exceptions.ModelNotRegistered(
                 "The model '{node_name}' cannot be found. "
                 "Have you defined it ?".format(node_name=node_name)
             )
-        return self._graph.nodes(data=True)[node_name].get("model")
 
     def add_attribute_to_node(
         self, node_name, attribute_name, attribute_value
@@ -91,10 +122,10 @@ class Graph(object):
         :param attribute_value: The value of the attribute
         :type attribute_value: any
         """
-        self._graph.nodes[node_name][attribute_name] = attribute_value
+        self._nodes[node_name][attribute_name] = attribute_value
 
     def connect_nodes(self, node_name_a, node_name_b, on_attr):
-        """Connect two nodes together
+        """Connect two nodes together. Missing nodes are created.
 
         :param node_name_a: The name of the first node
         :type node_name_a: str
@@ -103,6 +134,27 @@ class Graph(object):
         :param on_attr: Tag the attribute on which the connection is made
         :type on_attr: str
         """
-        self._graph.add_edge(
-            node_name_a, node_name_b, origin=node_name_a, on_attr=on_attr
-        )
+        self._add_node_if_missing(node_name_a)
+        self._add_node_if_missing(node_name_b)
+
+        data = self._adjacency[node_name_a].get(node_name_b, {})
+        data.update(origin=node_name_a, on_attr=on_attr)
+        self._adjacency[node_name_a][node_name_b] = data
+        self._adjacency[node_name_b][node_name_a] = data
+
+    def to_networkx(self):
+        """Get a copy of the graph as a networkx Graph, to draw it for
+        example. networkx is only required by this method.
+
+        :raises ImportError: Raised if networkx is not installed
+        :return: The graph with the same nodes, edges and data
+        :rtype: networkx.Graph
+        """
+        import networkx
+
+        graph = networkx.Graph()
+        for node_name, data in self.nodes:
+            graph.add_node(node_name, **data)
+        for node_name_a, node_name_b, data in self.edges:
+            graph.add_edge(node_name_a, node_name_b, **data)
+        return graph
@@ -25,6 +25,7 @@
 import six
 
 from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.caches import IdentityMap
 from vfxDatabaseORM.core.models import constants
 from vfxDatabaseORM.core.models.graph import Graph
 from vfxDatabaseORM.core.models.options import Options
@@ -34,6 +35,26 @@ from vfxDatabaseORM.core.serializers import JSONSerializer
 from vfxDatabaseORM.core.interfaces import IManager
 
 
+class _EmptyDict(dict):
+    """Empty dict shared by instances until they need their own one.
+    Reading it or removing keys works like an empty dict, adding keys
+    raises.
+    """
+
+    def _raise_shared(self, *args, **kwargs):
+        raise TypeError("This dict is shared by instances, it is read only.")
+
+    __setitem__ = setdefault = update = _raise_shared
+
+
+# Shared by all instances without deferred fields
+_NO_DEFERRED_FIELDS = frozenset()
+# Shared by all instances without changes
+_NO_CHANGES = _EmptyDict()
+# Shared by all instances without resolved related fields
+_NO_RELATED_CACHE = _EmptyDict()
+
+
 class BaseModel(type):
     """Metaclass for all models"""
 
@@ -43,6 +64,17 @@ class BaseModel(type):
 
     _graph = None  # Singleton Graph
 
+    _manager = None
+    _serializer = None
+
+    # Private attributes of instances which are not linked to a field
+    _INSTANCE_ATTRIBUTES = (
+        "_changed",
+        "_initialized",
+        "_deferred",
+        "_related_cache",
+    )
+
     def __new__(cls, name, bases, attrs, **kwargs):
         # Initialize the graph for all futures entities and links
         if not cls._graph:
@@ -69,7 +101,12 @@ class BaseModel(type):
         # Inject uid field if it doesn't exist
         if cls.uid_key not in attrs:
             for base in bases:
-                uid_field = getattr(base, cls.uid_key, None)
+                base_meta = getattr(base, "_meta", None)
+                if base_meta is not None:
+                    # Fields of models are replaced by descriptors
+                    uid_field = base_meta.uid_field
+                else:
+                    uid_field = getattr(base, cls.uid_key, None)
                 if not uid_field:
                     continue
                 attrs[cls.uid_key] = uid_field
@@ -88,6 +125,19 @@ class BaseModel(type):
         new_attrs = attrs.copy()
 
         options = Options()
+        if "use_slots" in attrs:
+            options.use_slots = attrs["use_slots"]
+        else:
+            # Inherited from the parent models
+            options.use_slots = any(
+                getattr(base, "use_slots", False) for base in bases
+            )
+        # Slots defined by parent models are not defined twice
+        parent_slots = set()
+        for base in bases:
+            for klass in base.__mro__:
+                parent_slots.update(getattr(klass, "__slots__", ()))
+        slots = list(cls._INSTANCE_ATTRIBUTES)
 
         for attr_name, attr_value in attrs.items():
             if not isinstance(attr_value, (Field, RelatedField)):
@@ -104,13 +154,21 @@ class BaseModel(type):
 
             # Collect fields objects
             if isinstance(attr_value, Field):
-                # Create private attribute
-                new_attrs["_{}".format(attr_name)] = field.default
+                # Create private attribute, slots get their default value
+                # when the instance is created
+                if options.use_slots:
+                    slots.append("_{}".format(attr_name))
+                else:
+                    new_attrs["_{}".format(attr_name)] = field.default
 
                 # Register field in options
                 options.add_field(field)
 
             if isinstance(attr_value, RelatedField):
+                if options.use_slots:
+                    # Only set when the field is changed
+                    slots.append("_{}".format(attr_name))
+
                 # Register field in options
                 options.add_related_field(field)
                 # Connect nodes together, If the field.to node is not created
@@ -121,11 +179,20 @@ class BaseModel(type):
             attr_descriptor = AttributeDescriptor(field=field)
             new_attrs[attr_name] = attr_descriptor
 
+        options.uid_field = options.get_field(cls.uid_key)
+
         new_attrs["_meta"] = options
-        new_attrs["_dirty"] = False
-        new_attrs["_initialized"] = False
-        new_attrs["_changed"] = []
         new_attrs["_graph"] = cls._graph
+        if options.use_slots:
+            # No __dict__ per instance, values are stored in slots
+            new_attrs["__slots__"] = tuple(
+                slot for slot in slots if slot not in parent_slots
+            )
+        else:
+            new_attrs["_initialized"] = False
+            new_attrs["_deferred"] = _NO_DEFERRED_FIELDS
+            new_attrs["_changed"] = _NO_CHANGES
+            new_attrs["_related_cache"] = _NO_RELATED_CACHE
 
         new_class = super(BaseModel, cls).__new__(cls, name, bases, new_attrs)
 
@@ -159,22 +226,69 @@ class BaseModel(type):
     def serializer(cls):
         return cls._get_serializer()
 
+    def reset_manager(cls):
+        """Forget the manager of the model. A new one will be created on
+        the next access to objects.
+        """
+        cls._manager = None
+
+    def reset_serializer(cls):
+        """Forget the serializer of the model. A new one will be created on
+        the next access to serializer.
+        """
+        cls._serializer = None
+
     def _get_manager(cls):
-        """Get the manager of the model.
+        """Get the manager of the model. It is created once per model and
+        created again if the manager_class changes.
 
         :return: The instance of the manager
         :rtype: BaseManager
         """
-        return cls.manager_class(model_class=cls)
+        manager = cls._manager
+        if (
+            manager is None
+            or manager.model_class is not cls  # Inherited from a parent model
+            or manager.__class__ is not cls.manager_class
+        ):
+            manager = cls.manager_class(model_class=cls)
+            cls._manager = manager
+        return manager
 
     def _get_serializer(cls):
-        return cls.serializer_class(model_class=cls)
+        """Get the serializer of the model. It is created once per model and
+        created again if the serializer_class changes.
+
+        :return: The instance of the serializer
+        :rtype: vfxDatabaseORM.core.interfaces.ISerializer
+        """
+        serializer = cls._serializer
+        if (
+            serializer is None
+            or serializer.model_class is not cls
+            or serializer.__class__ is not cls.serializer_class
+        ):
+            serializer = cls.serializer_class(model_class=cls)
+            cls._serializer = serializer
+        return serializer
 
 
 @six.add_metaclass(BaseModel)
 class Model(object):
+    # Let models store values in slots, see use_slots
+    __slots__ = ()
+
     entity_name = ""
 
+    # Store values of instances in __slots__ instead of a __dict__, it saves
+    # memory when many instances are loaded. Attributes which are not fields
+    # can't be added to instances.
+    use_slots = False
+
+    # Check values built from the database like values given to __init__,
+    # it is slower and only useful to debug a backend.
+    validate_db_values = False
+
     # Default field to identify an entity in a database
     uid = IntegerField("id", read_only=True, default=0)
 
@@ -182,11 +296,10 @@ class Model(object):
         """Constructor of the Model.
         Each given attribute is set of the corresponding field.
         """
-        # Init changed to an empty list
-        self._changed = []
+        if self._meta.use_slots:
+            self._init_slots()
 
-        fields = self.get_fields()
-        field_names = [field.name for field in fields]
+        field_names = self._meta.field_names
 
         # Fill descriptors for basic fields
         for arg_name, arg_value in kwargs.items():
@@ -196,6 +309,115 @@ class Model(object):
 
         self._initialized = True
 
+    @classmethod
+    def _from_db(cls, row, deferred_fields=None):
+        """Create an instance from a row of the database. Values are trusted,
+        they are stored without being checked (unless validate_db_values is
+        enabled) and the instance is not marked as changed.
+        __init__ is not called.
+
+        :param row: Raw values from the database, by db_name
+        :type row: dict
+        :param deferred_fields: Names of fields which have not been retrieved
+        from the database, defaults to None
+        :type deferred_fields: list, optional
+        :raises exceptions.FieldBadValue: Raised if validate_db_values is
+        enabled and a value is not valid for its field
+        :return: The instance
+        :rtype: Model
+        """
+        if cls.validate_db_values:
+            cls._check_db_values(row)
+
+        instance = cls.__new__(cls)
+        if cls._meta.use_slots:
+            instance._init_slots()
+
+        db_name_attributes = cls._meta.db_name_attributes
+        for db_name, value in row.items():
+            attribute_name = db_name_attributes.get(db_name)
+            if attribute_name is not None:
+                setattr(instance, attribute_name, value)
+
+        if deferred_fields:
+            instance._deferred = set(deferred_fields)
+        instance._initialized = True
+        return instance
+
+    @classmethod
+    def _from_db_many(cls, rows, deferred_fields=None):
+        """Create instances from rows of the database, like _from_db() for
+        each row, but attributes of the Model are looked up once for all
+        rows.
+
+        :param rows: Raw values from the database, one dict per instance
+        :type rows: iterable
+        :param deferred_fields: Names of fields which have not been retrieved
+        from the database, defaults to None
+        :type deferred_fields: list, optional
+        :raises exceptions.FieldBadValue: Raised if validate_db_values is
+        enabled and a value is not valid for its field
+        :return: Instances, in the same order
+        :rtype: list
+        """
+        if cls.validate_db_values:
+            from_db = cls._from_db
+            return [
+                from_db(row, deferred_fields=deferred_fields) for row in rows
+            ]
+
+        new = cls.__new__
+        get_attribute_name = cls._meta.db_name_attributes.get
+        slot_defaults = ()
+        if cls._meta.use_slots:
+            # Default values of slots, see _init_slots()
+            slot_defaults = [
+                ("_{name}".format(name=field.name), field.default)
+                for field in cls._meta.fields
+            ]
+            slot_defaults.extend(
+                [
+                    ("_deferred", _NO_DEFERRED_FIELDS),
+                    ("_changed", _NO_CHANGES),
+                    ("_related_cache", _NO_RELATED_CACHE),
+                ]
+            )
+
+        instances = []
+        for row in rows:
+            instance = new(cls)
+            for attribute_name, default in slot_defaults:
+                setattr(instance, attribute_name, default)
+            for db_name, value in row.items():
+                attribute_name = get_attribute_name(db_name)
+                if attribute_name is not None:
+                    setattr(instance, attribute_name, value)
+            if deferred_fields:
+                instance._deferred = set(deferred_fields)
+            instance._initialized = True
+            instances.append(instance)
+        return instances
+
+    @classmethod
+    def _check_db_values(cls, row):
+        """Check values of a row of the database like __init__ does.
+
+        :param row: Raw values from the database, by db_name
+        :type row: dict
+        :raises exceptions.FieldBadValue: Raised if a value is not valid
+        for its field
+        """
+        for db_name, value in row.items():
+            field = cls._meta.get_field_by_db_name(db_name)
+            if field is None or field.check_value(value):
+                continue
+            raise exceptions.FieldBadValue(
+                "The value '{value}' from the database is not valid "
+                "for the field '{field}' of {model}.".format(
+                    value=value, field=field, model=cls.__name__
+                )
+            )
+
     def save(self, **kwargs):
         """Save the model into the database.
 
@@ -215,26 +437,68 @@ class Model(object):
             for field in self.get_fields():
                 setattr(self, field.name, getattr(new_instance, field.name))
             self._initialized = True
-            # Reset changed fields
-            self._changed = []
+            self._mark_saved()
+
+            identity_map = IdentityMap.get_current()
+            if identity_map is not None:
+                # The map holds the instance built by the manager, this
+                # instance represents the entity from now on.
+                identity_map.add(self)
             return True
 
-        if not self._dirty:
+        if not self._changed:
             # Nothing has changed, nothing to update
             return False
 
         # Update the model on the database
         self.__class__.objects.update(self)
 
-        # Reset changed fields
-        self._changed = []
-        self._dirty = False
+        self._mark_saved()
 
         return True
 
     def delete(self):
         raise NotImplementedError()
 
+    def refresh_from_db(self, fields=None):
+        """Reload values of the instance from the database. Local changes
+        on refreshed fields are discarded and resolved related fields are
+        requested again on next access.
+
+        :param fields: Names of the fields to refresh, defaults to all fields
+        :type fields: list, optional
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        :raises exceptions.EntityNotFound: Raised if the entity doesn't exist
+        anymore in the database
+        """
+        if fields is None:
+            fields = self.get_all_fields()
+        else:
+            fields = [self.get_field(field_name) for field_name in fields]
+
+        basic_fields = [field for field in fields if not field.is_related]
+        if basic_fields:
+            # An active identity map would return this instance
+            with IdentityMap.suspend():
+                db_instance = self.__class__.objects.get(self.uid)
+            if db_instance is None:
+                raise exceptions.EntityNotFound(
+                    "The entity {instance} doesn't exist "
+                    "in the database.".format(instance=self)
+                )
+            for field in basic_fields:
+                attribute_name = "_{name}".format(name=field.name)
+                setattr(self, attribute_name, getattr(db_instance, field.name))
+                if field.name in self._deferred:
+                    self._deferred.discard(field.name)
+
+        for field in fields:
+            if field.is_related:
+                self._related_cache.pop(field.name, None)
+
+        for field in fields:
+            self._changed.pop(field, None)
+
     @property
     def is_dirty(self):
         """Is the node is dirty ?
@@ -242,7 +506,56 @@ class Model(object):
         :return: Return True if the node is dirty, False otherwise
         :rtype: bool
         """
-        return self._dirty
+        return bool(self._changed)
+
+    def get_changes(self):
+        """Get the changes which would be sent to the database by save().
+
+        >>> shot.code = "SH020"
+        >>> shot.get_changes()
+        {"code": ("SH010", "SH020")}
+
+        :return: The original value and the new value of changed fields,
+        by field name. The original value is None if it has not been
+        retrieved from the database (related or deferred fields).
+        :rtype: dict
+        """
+        changes = {}
+        for field, original_value in self._changed.items():
+            if original_value is constants.NOT_LOADED:
+                original_value = None
+            changes[field.name] = (
+                original_value,
+                getattr(self, "_{name}".format(name=field.name)),
+            )
+        return changes
+
+    def revert(self, fields=None):
+        """Discard local changes, without requesting the database.
+
+        :param fields: Names of the fields to revert, defaults to all
+        changed fields
+        :type fields: list, optional
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        """
+        if fields is None:
+            fields = list(self._changed)
+        else:
+            fields = [self.get_field(field_name) for field_name in fields]
+
+        for field in fields:
+            if field not in self._changed:
+                continue
+            original_value = self._changed.pop(field)
+            if field.is_related:
+                # Resolved again from the database on next access
+                continue
+            if original_value is constants.NOT_LOADED:
+                # It was deferred, it will be loaded on next access
+                self._deferred = set(self._deferred)
+                self._deferred.add(field.name)
+                continue
+            setattr(self, "_{name}".format(name=field.name), original_value)
 
     @classmethod
     def get_fields(cls):
@@ -295,26 +608,131 @@ class Model(object):
         :return: The field object
         :rtype: Field
         """
-        for field in cls._meta.fields:
-            if field.name == field_name:
-                return field
-        for field in cls._meta.related_fields:
-            if field.name == field_name:
-                return field
+        field = cls._meta.get_field(field_name)
+        if field is not None:
+            return field
         raise exceptions.FieldNotFound(
             "This Model doesn't have a Field named '{name}'.".format(
                 name=field_name
             )
         )
 
+    @classmethod
+    def _resolve_related_field(cls, field):
+        """Get the related model of the given related field and the field
+        of this related model which links back to this model.
+
+        :param field: A related field of this model
+        :type field: vfxDatabaseORM.core.models.fields.RelatedField
+        :raises exceptions.FieldRelatedError: Raised if the related model
+        doesn't define the corresponding field.
+        :return: The related model and its related field
+        :rtype: tuple
+        """
+        related_model = cls._graph.get_node_model(field.to)
+        related_field = related_model._meta.get_related_field_by_db_name(
+            field.related_db_name
+        )
+        if related_field is not None:
+            return related_model, related_field
+
+        raise exceptions.FieldRelatedError(
+            "The corresponding {field_class_name} for '{field}' "
+            "should also be defined "
+            "in the related model '{related_model}'.".format(
+                field_class_name=field.__class__.__name__,
+                field=field,
+                related_model=related_model,
+            )
+        )
+
+    def _load_deferred_field(self, field):
+        """Retrieve the value of a deferred field from the database.
+
+        :param field: The deferred field to load
+        :type field: vfxDatabaseORM.core.models.fields.Field
+        """
+        model_class = self.__class__
+        queryset = model_class.objects.filters(
+            **{model_class.uid_key: self.uid}
+        )
+        # With an active identity map, this instance is returned and its
+        # deferred field is filled when the row is built.
+        db_instance = queryset.only(field.name).first()
+        if db_instance is not None:
+            attribute_name = "_{field_name}".format(field_name=field.name)
+            setattr(
+                self, attribute_name, getattr(db_instance, attribute_name)
+            )
+        # Without entity in the database, the default value is kept
+        self._deferred.discard(field.name)
+
+    def _init_slots(self):
+        """Set default values of slots, like class attributes do for models
+        which don't use slots.
+        """
+        self._initialized = False
+        self._deferred = _NO_DEFERRED_FIELDS
+        self._changed = _NO_CHANGES
+        self._related_cache = _NO_RELATED_CACHE
+        for field in self._meta.fields:
+            setattr(self, "_{name}".format(name=field.name), field.default)
+
+    def _reset_changes(self):
+        """Mark the instance as synchronized with the database."""
+        self._changed = _NO_CHANGES
+
+    def _mark_saved(self, fields=None):
+        """Mark the instance as written into the database. Related values
+        may have changed on both sides of the links, they are fetched again.
+
+        :param fields: Fields which have been written, changes of other
+        fields are kept, defaults to all fields
+        :type fields: list, optional
+        """
+        self._related_cache = _NO_RELATED_CACHE
+        if fields is None:
+            self._reset_changes()
+            return
+        for field in fields:
+            self._changed.pop(field, None)
+        if not self._changed:
+            self._reset_changes()
+
+    def _set_changed(self, field, original_value):
+        """Mark a field as changed. Instances share an empty dict of changes
+        until their first change.
+
+        :param field: The changed field
+        :type field: vfxDatabaseORM.core.models.fields.Field
+        :param original_value: The value of the field in the database,
+        constants.NOT_LOADED if it is unknown
+        :type original_value: any
+        """
+        if self._changed is _NO_CHANGES:
+            self._changed = {}
+        self._changed[field] = original_value
+
+    def _set_related_cache(self, field_name, value):
+        """Store the resolved value of a related field. Instances share an
+        empty cache until a related field is resolved.
+
+        :param field_name: The name of the related field
+        :type field_name: str
+        :param value: Related instances
+        :type value: list
+        """
+        if self._related_cache is _NO_RELATED_CACHE:
+            self._related_cache = {}
+        self._related_cache[field_name] = value
+
     def _set_attributes_from_kwargs(self, kwargs):
         """From given kwargs, set attributes on this instance.
 
         :param kwargs: Attributes to set
         :type kwargs: dict
         """
-        fields = self.get_fields()
-        field_names = [field.name for field in fields]
+        field_names = self._meta.field_names
 
         for key, value in kwargs.items():
             if key not in field_names:
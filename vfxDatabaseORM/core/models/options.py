@@ -24,12 +24,31 @@
 
 
 class Options(object):
-    """A class which contains informations of a model like its fields..."""
+    """A class which contains informations of a model like its fields...
+
+    Fields are also indexed by name and by db_name when they are registered,
+    at class creation, so they are retrieved in constant time.
+    """
 
     def __init__(self):
         self._fields = []
         self._related_fields = []
 
+        self._fields_by_name = {}
+        self._fields_by_db_name = {}
+        self._related_fields_by_db_name = {}
+        self._field_names = frozenset()
+        self._db_name_mapping = {}
+        self._db_name_attributes = {}
+
+        # The field which contains the unique identifier
+        self.uid_field = None
+        # Values of instances are stored in __slots__
+        self.use_slots = False
+        # Lookup arguments already resolved, see
+        # vfxDatabaseORM.core.queries.lookups.compile_lookup()
+        self.compiled_lookups = {}
+
     @property
     def fields(self):
         """Returns the list of basic fields associated with the model
@@ -48,6 +67,65 @@ class Options(object):
         """
         return self._related_fields
 
+    @property
+    def field_names(self):
+        """Returns names of basic fields associated with the model
+
+        :return: Names of basic fields
+        :rtype: frozenset
+        """
+        return self._field_names
+
+    @property
+    def db_name_mapping(self):
+        """Returns names of basic fields by their name in the database
+
+        :return: Field names, by db_name
+        :rtype: dict
+        """
+        return self._db_name_mapping
+
+    @property
+    def db_name_attributes(self):
+        """Returns names of private attributes which store values of basic
+        fields, by their name in the database
+
+        :return: Private attribute names, by db_name
+        :rtype: dict
+        """
+        return self._db_name_attributes
+
+    def get_field(self, name):
+        """Get a field (basic or related) from its name
+
+        :param name: The name of the field
+        :type name: str
+        :return: The field, None if there is no field with this name
+        :rtype: vfxDatabaseORM.core.models.fields.Field
+        """
+        return self._fields_by_name.get(name)
+
+    def get_field_by_db_name(self, db_name):
+        """Get a basic field from its name in the database
+
+        :param db_name: The name of the field in the database
+        :type db_name: str
+        :return: The field, None if there is no basic field with this db_name
+        :rtype: vfxDatabaseORM.core.models.fields.Field
+        """
+        return self._fields_by_db_name.get(db_name)
+
+    def get_related_field_by_db_name(self, db_name):
+        """Get a related field from its name in the database
+
+        :param db_name: The name of the field in the database
+        :type db_name: str
+        :return: The field, None if there is no related field with this
+        db_name
+        :rtype: vfxDatabaseORM.core.models.fields.RelatedField
+        """
+        return self._related_fields_by_db_name.get(db_name)
+
     def add_field(self, field):
         """Registers a new field
 
@@ -55,6 +133,13 @@ class Options(object):
         :type field: vfxDatabaseORM.src.domain.model.fields.Field
         """
         self._fields.append(field)
+        self._fields_by_name[field.name] = field
+        self._fields_by_db_name[field.db_name] = field
+        self._field_names = self._field_names | {field.name}
+        self._db_name_mapping[field.db_name] = field.name
+        self._db_name_attributes[field.db_name] = "_{name}".format(
+            name=field.name
+        )
 
     def add_related_field(self, field):
         """Registers a new related field
@@ -63,3 +148,5 @@ class Options(object):
         :type field: vfxDatabaseORM.src.domain.model.fields.Field
         """
         self._related_fields.append(field)
+        self._fields_by_name[field.name] = field
+        self._related_fields_by_db_name[field.db_name] = field
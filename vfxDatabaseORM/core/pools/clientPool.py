@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# - clientPool.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import threading
+import contextlib
+
+from vfxDatabaseORM.core import exceptions
+
+
+class ClientPool(object):
+    """A bounded pool of backend clients which can be shared by threads.
+
+    Each thread checks out its own client and returns it once done. A thread
+    which checks out a client again before returning it gets the same client,
+    so nested requests never wait for a second client.
+
+    >>> pool = ClientPool(lambda: shotgun_api3.Shotgun(...), max_size=4)
+    >>> with pool.connection() as client:
+    ...     client.find("Shot", [], ["code"])
+    """
+
+    def __init__(self, factory, max_size=4):
+        """Constructor for ClientPool
+
+        :param factory: Callable which creates a new client
+        :type factory: callable
+        :param max_size: The maximum number of clients, defaults to 4
+        :type max_size: int, optional
+        """
+        self.max_size = max_size
+
+        self._factory = factory
+        self._idle_clients = []
+        self._size = 0
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    @property
+    def size(self):
+        """The number of clients created by the pool
+
+        :return: The number of clients
+        :rtype: int
+        """
+        return self._size
+
+    def acquire(self, timeout=None):
+        """Check out a client. If all clients are used by other threads,
+        wait until one of them is returned.
+
+        :param timeout: Seconds to wait for a client, defaults to None (ever)
+        :type timeout: float, optional
+        :raises exceptions.PoolExhausted: Raised if no client has been
+        returned before the timeout
+        :return: A client
+        :rtype: any
+        """
+        client = getattr(self._local, "client", None)
+        if client is not None:
+            # The thread already holds a client
+            self._local.depth += 1
+            return client
+
+        should_create = False
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._condition:
+            while not self._idle_clients and self._size >= self.max_size:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise exceptions.PoolExhausted(
+                            "No client has been returned to the pool "
+                            "after {timeout} seconds.".format(timeout=timeout)
+                        )
+                self._condition.wait(remaining)
+
+            if self._idle_clients:
+                client = self._idle_clients.pop()
+            else:
+                # Reserve the place before creating the client outside of
+                # the lock, creation may be slow (authentication...)
+                self._size += 1
+                should_create = True
+
+        if should_create:
+            try:
+                client = self._factory()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+
+        self._local.client = client
+        self._local.depth = 1
+        return client
+
+    def release(self, client):
+        """Return a client to the pool.
+
+        :param client: The client checked out with acquire()
+        :type client: any
+        """
+        if getattr(self._local, "client", None) is client:
+            self._local.depth -= 1
+            if self._local.depth > 0:
+                # Still used by the thread
+                return
+            self._local.client = None
+
+        with self._condition:
+            self._idle_clients.append(client)
+            self._condition.notify()
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        """Context manager which checks out a client and returns it.
+
+        :param timeout: Seconds to wait for a client, defaults to None (ever)
+        :type timeout: float, optional
+        """
+        client = self.acquire(timeout=timeout)
+        try:
+            yield client
+        finally:
+            self.release(client)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+#
+# - __init__.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import six
+
+from .q import Q  # noqa
+from .query import Query  # noqa
+from .querySet import QuerySet  # noqa
+from .resultFrame import ResultFrame, ResultRow  # noqa
+from .aggregates import Aggregate, Count, Sum, Avg, Min, Max  # noqa
+from .lookups import CompiledLookup, compile_lookup  # noqa
+from .evaluator import evaluate, filter_rows  # noqa
+from .planner import QueryPlan, plan_query, find_related_path  # noqa
+from .prefetch import prefetch_related_objects  # noqa
+from .parallel import run_in_parallel, gather  # noqa
+
+if six.PY3:
+    # Coroutines are not supported by python 2
+    from .asyncQuerySet import AsyncQuerySet  # noqa
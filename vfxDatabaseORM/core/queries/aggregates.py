@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+#
+# - aggregates.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import collections
+
+from vfxDatabaseORM.core.models.constants import AGGREGATES, LOOKUP_TOKEN
+from vfxDatabaseORM.core.models.constants import UID_KEY
+
+
+class Aggregate(object):
+    """Base class of aggregate functions, computed over the values of a
+    field. Empty values are ignored.
+
+    Managers compute aggregates in the database when the backend supports
+    it, otherwise values are reduced on the client side with
+    create_state(), add() and get_result().
+    """
+
+    # Name of the function, see constants.AGGREGATES
+    function = None
+
+    def __init__(self, field_name):
+        """Constructor for Aggregate
+
+        :param field_name: The name of the field to aggregate
+        :type field_name: str
+        """
+        self.field_name = field_name
+
+    @property
+    def default_alias(self):
+        """The key of the result when no alias is given (eg: "duration__sum")
+
+        :return: The default alias
+        :rtype: str
+        """
+        return "{}{}{}".format(self.field_name, LOOKUP_TOKEN, self.function)
+
+    def create_state(self):
+        """Create the state of a client-side reduction.
+
+        :return: The number of values and the current result
+        :rtype: list
+        """
+        return [0, None]
+
+    def add(self, state, value):
+        """Add a value to the state of a client-side reduction.
+
+        :param state: The state, see create_state()
+        :type state: list
+        :param value: The value of the field
+        :type value: any
+        """
+        if value is None:
+            return
+        state[0] += 1
+        state[1] = value if state[0] == 1 else self._combine(state[1], value)
+
+    def get_result(self, state):
+        """Get the result of a client-side reduction.
+
+        :param state: The state, see create_state()
+        :type state: list
+        :return: The result, None if there is no value
+        :rtype: any
+        """
+        return state[1]
+
+    def _combine(self, result, value):
+        raise NotImplementedError()
+
+    def __eq__(self, other):
+        return (
+            self.__class__ is other.__class__
+            and self.field_name == other.field_name
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.__class__, self.field_name))
+
+    def __repr__(self):
+        return "<{cls_name} '{field_name}'>".format(
+            cls_name=self.__class__.__name__, field_name=self.field_name
+        )
+
+
+class Count(Aggregate):
+    """Number of non empty values. Count() counts entities."""
+
+    function = AGGREGATES.COUNT
+
+    def __init__(self, field_name=UID_KEY):
+        super(Count, self).__init__(field_name)
+
+    def get_result(self, state):
+        return state[0]
+
+    def _combine(self, result, value):
+        return result
+
+
+class Sum(Aggregate):
+    """Sum of the values."""
+
+    function = AGGREGATES.SUM
+
+    def _combine(self, result, value):
+        return result + value
+
+
+class Avg(Aggregate):
+    """Average of the values."""
+
+    function = AGGREGATES.AVG
+
+    def get_result(self, state):
+        if not state[0]:
+            return None
+        return state[1] / float(state[0])
+
+    def _combine(self, result, value):
+        return result + value
+
+
+class Min(Aggregate):
+    """Smallest value."""
+
+    function = AGGREGATES.MIN
+
+    def _combine(self, result, value):
+        return min(result, value)
+
+
+class Max(Aggregate):
+    """Largest value."""
+
+    function = AGGREGATES.MAX
+
+    def _combine(self, result, value):
+        return max(result, value)
+
+
+def aggregate_rows(model_class, rows, aggregates, group_by=None):
+    """Compute aggregates over raw rows on the client side. Rows are
+    consumed one by one, so they can be streamed from the database.
+
+    :param model_class: The Model of the rows
+    :type model_class: vfxDatabaseORM.core.models.Model
+    :param rows: Raw values by db_name, one dict per entity
+    :type rows: iterable
+    :param aggregates: Aggregates by alias
+    :type aggregates: dict
+    :param group_by: Names of the fields to group rows by, defaults to None
+    :type group_by: list, optional
+    :return: Results by alias. With group_by, a list of them, one per group,
+    which also contains values of the grouped fields.
+    :rtype: dict or list
+    """
+    group_fields = [
+        model_class.get_field(field_name) for field_name in group_by or []
+    ]
+    reducers = [
+        (aggregate, model_class.get_field(aggregate.field_name).db_name)
+        for aggregate in aggregates.values()
+    ]
+
+    groups = collections.OrderedDict()
+    if not group_fields:
+        groups[()] = [aggregate.create_state() for aggregate, _ in reducers]
+
+    for row in rows:
+        key = tuple(
+            row.get(field.db_name, field.default) for field in group_fields
+        )
+        states = groups.get(key)
+        if states is None:
+            states = [aggregate.create_state() for aggregate, _ in reducers]
+            groups[key] = states
+        for (aggregate, db_name), state in zip(reducers, states):
+            aggregate.add(state, row.get(db_name))
+
+    results = []
+    for key, states in groups.items():
+        result = {
+            field.name: value for field, value in zip(group_fields, key)
+        }
+        for alias, (aggregate, _), state in zip(aggregates, reducers, states):
+            result[alias] = aggregate.get_result(state)
+        results.append(result)
+
+    if not group_fields:
+        return results[0]
+    return results
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+# - asyncQuerySet.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import itertools
+
+from vfxDatabaseORM.core.models.constants import DEFAULT_CHUNK_SIZE
+
+
+class AsyncQuerySet(object):
+    """Asynchronous counterpart of a QuerySet. Requests are sent by the
+    manager in its executor, so the event loop is never blocked.
+
+    It can be awaited to get all results as a list, or iterated with
+    async for to get them chunk by chunk.
+
+    >>> shots = await Shot.objects.afilters(code__contains="010")
+    >>> async for shot in Shot.objects.aall().order_by("code"):
+    ...     print(shot.code)
+    """
+
+    def __init__(self, manager, queryset):
+        """Constructor for AsyncQuerySet
+
+        :param manager: The asynchronous manager which runs requests
+        :type manager: vfxDatabaseORM.core.interfaces.AsyncIManager
+        :param queryset: The QuerySet to run
+        :type queryset: vfxDatabaseORM.core.queries.QuerySet
+        """
+        self.manager = manager
+        self.queryset = queryset
+
+    def _chain(self, queryset):
+        return self.__class__(manager=self.manager, queryset=queryset)
+
+    def filter(self, *args, **kwargs):
+        """Return a new AsyncQuerySet, see QuerySet.filter()."""
+        return self._chain(self.queryset.filter(*args, **kwargs))
+
+    def exclude(self, *args, **kwargs):
+        """Return a new AsyncQuerySet, see QuerySet.exclude()."""
+        return self._chain(self.queryset.exclude(*args, **kwargs))
+
+    def order_by(self, *field_names):
+        """Return a new AsyncQuerySet, see QuerySet.order_by()."""
+        return self._chain(self.queryset.order_by(*field_names))
+
+    def only(self, *field_names):
+        """Return a new AsyncQuerySet, see QuerySet.only()."""
+        return self._chain(self.queryset.only(*field_names))
+
+    def defer(self, *field_names):
+        """Return a new AsyncQuerySet, see QuerySet.defer()."""
+        return self._chain(self.queryset.defer(*field_names))
+
+    def prefetch_related(self, *field_names):
+        """Return a new AsyncQuerySet, see QuerySet.prefetch_related()."""
+        return self._chain(self.queryset.prefetch_related(*field_names))
+
+    def values(self, *field_names):
+        """Return a new AsyncQuerySet, see QuerySet.values()."""
+        return self._chain(self.queryset.values(*field_names))
+
+    def values_list(self, *field_names, **kwargs):
+        """Return a new AsyncQuerySet, see QuerySet.values_list()."""
+        return self._chain(self.queryset.values_list(*field_names, **kwargs))
+
+    async def aall(self):
+        """Get all results of the query. The query is sent each time, results
+        are not cached since they may be awaited by several coroutines.
+
+        :return: Instances corresponding to the query
+        :rtype: list
+        """
+        return await self.manager.run_in_executor(list, self.queryset.all())
+
+    async def acount(self):
+        """Get the number of results of the query.
+
+        :rtype: int
+        """
+        return await self.manager.run_in_executor(self.queryset.count)
+
+    async def aexists(self):
+        """Check if the query has any result.
+
+        :rtype: bool
+        """
+        return await self.manager.run_in_executor(self.queryset.exists)
+
+    async def aaggregate(self, *args, **kwargs):
+        """Compute aggregates over the results of the query.
+        See QuerySet.aggregate().
+
+        :rtype: dict or list
+        """
+        return await self.manager.run_in_executor(
+            self.queryset.aggregate, *args, **kwargs
+        )
+
+    async def afirst(self):
+        """Get the first result of the query.
+
+        :return: The first instance, None if there is no result
+        :rtype: vfxDatabaseORM.core.models.Model
+        """
+        return await self.manager.run_in_executor(self.queryset.first)
+
+    async def aiterator(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield results chunk by chunk, see QuerySet.iterator(). The
+        iterator is created, which may run subqueries, then each chunk is
+        fetched in the executor of the manager.
+
+        :param chunk_size: The number of rows fetched per request,
+        defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :return: An asynchronous generator of instances
+        :rtype: async_generator
+        """
+        iterator = await self.manager.run_in_executor(
+            self.queryset.iterator, chunk_size=chunk_size
+        )
+        while True:
+            chunk = await self.manager.run_in_executor(
+                list, itertools.islice(iterator, chunk_size)
+            )
+            for instance in chunk:
+                yield instance
+
+            if len(chunk) < chunk_size:
+                break
+
+    def __await__(self):
+        return self.aall().__await__()
+
+    def __aiter__(self):
+        return self.aiterator()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError(
+                "AsyncQuerySet only supports slices, use afirst() to get "
+                "a single instance."
+            )
+        return self._chain(self.queryset[key])
+
+    def __repr__(self):
+        return "<{cls_name} {model}>".format(
+            cls_name=self.__class__.__name__,
+            model=self.manager.model_class.__name__,
+        )
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# - evaluator.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import operator
+
+from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.models.constants import LOOKUPS
+from vfxDatabaseORM.core.queries.q import Q
+from vfxDatabaseORM.core.queries.lookups import compile_lookup
+
+
+def _ordering(function):
+    """Wrap an ordering operator so empty values never match, python 2 can
+    order None with any value.
+    """
+
+    def compare(value, arg):
+        if value is None or arg is None:
+            return False
+        return function(value, arg)
+
+    return compare
+
+
+_OPERATORS = {
+    LOOKUPS.EQUAL: operator.eq,
+    LOOKUPS.NOT_EQUAL: operator.ne,
+    LOOKUPS.LESS_THAN: _ordering(operator.lt),
+    LOOKUPS.LESS_THAN_OR_EQUAL: _ordering(operator.le),
+    LOOKUPS.GREATER_THAN: _ordering(operator.gt),
+    LOOKUPS.GREATER_THAN_OR_EQUAL: _ordering(operator.ge),
+    LOOKUPS.CONTAINS: lambda value, arg: arg in value,
+    LOOKUPS.IN: lambda value, arg: value in arg,
+    LOOKUPS.NOT_IN: lambda value, arg: value not in arg,
+    LOOKUPS.STARTS_WITH: lambda value, arg: value.startswith(arg),
+    LOOKUPS.ENDS_WITH: lambda value, arg: value.endswith(arg),
+}
+
+# Lookups which must be true for all entities of a multi-entity field
+_NEGATIVE_LOOKUPS = frozenset([LOOKUPS.NOT_EQUAL, LOOKUPS.NOT_IN])
+
+
+def evaluate(model_class, node, row):
+    """Check in memory if a raw row matches a tree of filters. It is meant
+    for backends without a query language and for local data. Like
+    managers, lookups which don't match any field are ignored.
+
+    :param model_class: The Model of the row
+    :type model_class: vfxDatabaseORM.core.models.Model
+    :param node: The filters
+    :type node: vfxDatabaseORM.core.queries.Q
+    :param row: Raw values by db_name
+    :type row: dict
+    :raises exceptions.InvalidLookUp: Raised if a lookup filters fields of
+    a related model, they are not in the row
+    :return: True if the row matches the filters, False otherwise
+    :rtype: bool
+    """
+    result = _evaluate_node(model_class, node, row)
+    return True if result is None else result
+
+
+def filter_rows(model_class, node, rows):
+    """Get raw rows which match a tree of filters, see evaluate().
+
+    :param model_class: The Model of the rows
+    :type model_class: vfxDatabaseORM.core.models.Model
+    :param node: The filters
+    :type node: vfxDatabaseORM.core.queries.Q
+    :param rows: Raw values by db_name, one dict per entity
+    :type rows: iterable
+    :return: A generator of matching rows
+    :rtype: generator
+    """
+    for row in rows:
+        if evaluate(model_class, node, row):
+            yield row
+
+
+def _evaluate_node(model_class, node, row):
+    results = []
+    for child in node.children:
+        if isinstance(child, Q):
+            result = _evaluate_node(model_class, child, row)
+        else:
+            result = _evaluate_lookup(model_class, child[0], child[1], row)
+        if result is not None:
+            results.append(result)
+
+    if not results:
+        return None
+    result = all(results) if node.connector == Q.AND else any(results)
+    return result != node.negated
+
+
+def _evaluate_lookup(model_class, arg_name, arg_value, row):
+    compiled_lookup = compile_lookup(model_class, arg_name)
+    if compiled_lookup is None:
+        return None
+    if compiled_lookup.related_model is not None:
+        raise exceptions.InvalidLookUp(
+            "The lookup '{arg_name}' filters fields of a related model, "
+            "it can't be evaluated in memory.".format(arg_name=arg_name)
+        )
+
+    function = _OPERATORS[compiled_lookup.lookup]
+    value = row.get(compiled_lookup.field.db_name)
+    if not compiled_lookup.field.is_related:
+        return _apply(function, value, arg_value)
+
+    # Entities are compared on their uid
+    if isinstance(arg_value, (list, tuple, set)):
+        arg_value = [_get_uid(item) for item in arg_value]
+    else:
+        arg_value = _get_uid(arg_value)
+    if not isinstance(value, list):
+        return _apply(function, _get_uid(value), arg_value)
+
+    results = (_apply(function, _get_uid(item), arg_value) for item in value)
+    if compiled_lookup.lookup in _NEGATIVE_LOOKUPS:
+        return all(results)
+    return any(results)
+
+
+def _apply(function, value, arg_value):
+    try:
+        return bool(function(value, arg_value))
+    except (TypeError, AttributeError):
+        # Empty values or values which can't be compared
+        return False
+
+
+def _get_uid(value):
+    if isinstance(value, dict):
+        return value.get("id")
+    return getattr(value, "uid", value)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# - lookups.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections import namedtuple
+
+from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.models.constants import LOOKUP_TOKEN
+
+
+class CompiledLookup(
+    namedtuple(
+        "CompiledLookup",
+        ["field", "related_model", "related_field", "lookup", "related_path"],
+    )
+):
+    """A lookup argument resolved against a model.
+
+    ``related_path`` is empty unless the lookup filters a related field
+    through fields of related models (eg: "shot__sequence__code__is"). It
+    contains a (model, field) tuple for each model crossed from the related
+    field, ``related_model`` and ``related_field`` are the last ones.
+    """
+
+    pass
+
+
+def compile_lookup(model_class, arg_name):
+    """Resolve a lookup argument (eg: "shot__sequence__code__is") into its
+    fields and its lookup, through the graph of models. The result is
+    memoized per model class, so a lookup is only parsed the first time it
+    is used.
+
+    :param model_class: The Model filtered by the lookup
+    :type model_class: vfxDatabaseORM.core.models.Model
+    :param arg_name: The lookup argument
+    :type arg_name: str
+    :raises exceptions.InvalidLookUp: Raised if the lookup is not valid,
+    for a related path it is checked against the last field
+    :raises exceptions.FieldNotFound: Raised if a field of a related model
+    doesn't exist
+    :raises exceptions.ModelNotRegistered: Raised if a related model
+    is not defined
+    :return: The compiled lookup, None if no field matches the argument
+    :rtype: CompiledLookup
+    """
+    compiled_lookups = model_class._meta.compiled_lookups
+    try:
+        return compiled_lookups[arg_name]
+    except KeyError:
+        pass
+
+    field_name = arg_name.split(LOOKUP_TOKEN, 1)[0]
+    field = model_class._meta.get_field(field_name)
+    if field is None:
+        compiled_lookups[arg_name] = None
+        return None
+
+    computed_lookup = field.compute_lookup(arg_name)
+    related_path = ()
+    if field.is_related and computed_lookup.related_field_name:
+        related_path = _resolve_related_path(
+            model_class, field, computed_lookup.related_field_name
+        )
+
+    related_model, related_field = (
+        related_path[-1] if related_path else (None, None)
+    )
+    if related_field is not None and (
+        computed_lookup.lookup not in related_field.LOOKUPS
+    ):
+        raise exceptions.InvalidLookUp(
+            "The lookup '{lookup}' is not valid for '{field}'. "
+            "Valid lookup are: {lookups}.".format(
+                lookup=computed_lookup.lookup,
+                field=related_field,
+                lookups=related_field.LOOKUPS,
+            )
+        )
+    compiled_lookup = CompiledLookup(
+        field,
+        related_model,
+        related_field,
+        computed_lookup.lookup,
+        related_path,
+    )
+    compiled_lookups[arg_name] = compiled_lookup
+    return compiled_lookup
+
+
+def _resolve_related_path(model_class, field, related_field_name):
+    """Follow a path of field names (eg: "sequence__code") from a related
+    field through the graph of models.
+
+    :return: (model, field) tuples, one per model crossed
+    :rtype: tuple
+    """
+    related_path = []
+    field_names = related_field_name.split(LOOKUP_TOKEN)
+    for index, field_name in enumerate(field_names):
+        if not field.is_related:
+            raise exceptions.InvalidLookUp(
+                "'{name}' is not a related field, the lookup can't "
+                "continue with '{rest}'.".format(
+                    name=field.name,
+                    rest=LOOKUP_TOKEN.join(field_names[index:]),
+                )
+            )
+        related_model = model_class._graph.get_node_model(field.to)
+        if related_model is None:
+            raise exceptions.ModelNotRegistered(
+                "The model '{name}' cannot be found. "
+                "Have you defined it ?".format(name=field.to)
+            )
+        field = related_model.get_field(field_name)
+        related_path.append((related_model, field))
+    return tuple(related_path)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# - parallel.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import functools
+from multiprocessing.pool import ThreadPool
+
+from vfxDatabaseORM.core.models.constants import DEFAULT_MAX_WORKERS
+from vfxDatabaseORM.core.caches import IdentityMap
+
+
+def run_in_parallel(*callables, **kwargs):
+    """Call independent callables at the same time in a pool of threads.
+    Managers share their clients between threads, so the time spent is the
+    time of the slowest call instead of the sum of all calls.
+
+    >>> project, shot = run_in_parallel(
+    ...     lambda: Project.objects.get(1), lambda: Shot.objects.get(2)
+    ... )
+
+    :param callables: Callables without arguments
+    :type callables: callable
+    :param max_workers: The maximum number of threads,
+    defaults to DEFAULT_MAX_WORKERS
+    :type max_workers: int, optional
+    :raises Exception: The first exception raised by a callable, once all
+    callables have returned
+    :return: Results of the callables, in the same order
+    :rtype: list
+    """
+    max_workers = kwargs.pop("max_workers", None) or DEFAULT_MAX_WORKERS
+    if kwargs:
+        raise TypeError(
+            "Unexpected keyword arguments: {names}".format(
+                names=", ".join(sorted(kwargs))
+            )
+        )
+
+    if len(callables) <= 1:
+        # No need for threads
+        return [func() for func in callables]
+
+    # The active identity map of the caller is shared with the threads
+    callables = [IdentityMap.bind_current(func) for func in callables]
+
+    pool = ThreadPool(min(max_workers, len(callables)))
+    try:
+        return pool.map(_call, callables, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def gather(*querysets, **kwargs):
+    """Evaluate independent QuerySets at the same time in a pool of threads,
+    see run_in_parallel(). QuerySets keep their results, so iterating them
+    afterwards doesn't send any request.
+
+    >>> shots, assets = gather(
+    ...     Shot.objects.filters(project=project),
+    ...     Asset.objects.filters(project=project),
+    ... )
+
+    :param querysets: QuerySets to evaluate
+    :type querysets: vfxDatabaseORM.core.queries.QuerySet
+    :param max_workers: The maximum number of threads,
+    defaults to DEFAULT_MAX_WORKERS
+    :type max_workers: int, optional
+    :return: Results of each QuerySet as a list, in the same order
+    :rtype: list
+    """
+    return run_in_parallel(
+        *[functools.partial(list, queryset) for queryset in querysets],
+        **kwargs
+    )
+
+
+def _call(func):
+    return func()
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+#
+# - planner.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import collections
+
+from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.models.constants import LOOKUPS, LOOKUP_TOKEN
+from vfxDatabaseORM.core.models.constants import UID_KEY
+from vfxDatabaseORM.core.queries.q import Q
+from vfxDatabaseORM.core.queries.lookups import compile_lookup
+
+
+# Strategies of the steps of a plan
+class STRATEGIES(object):
+    QUERY = "query"
+    DEEP_FILTER = "deep filter"
+    SUBQUERY = "in-subquery"
+
+
+class PlanStep(
+    collections.namedtuple(
+        "PlanStep", ["strategy", "description", "round_trips", "subplan"]
+    )
+):
+    """A step of a QueryPlan. ``subplan`` is the plan of the query run by
+    an in-subquery, None otherwise.
+    """
+
+    pass
+
+
+class Subquery(object):
+    """Value of a lookup which is the result of another QuerySet. It is
+    evaluated when the plan is run, see QueryPlan.get_query().
+    """
+
+    def __init__(self, queryset):
+        """Constructor for Subquery
+
+        :param queryset: The QuerySet which returns the value
+        :type queryset: vfxDatabaseORM.core.queries.QuerySet
+        """
+        self.queryset = queryset
+
+    def __repr__(self):
+        return "<{cls_name} {queryset!r}>".format(
+            cls_name=self.__class__.__name__, queryset=self.queryset
+        )
+
+
+class QueryPlan(object):
+    """How a query is run by a manager: the filters which are sent as deep
+    filters and the ones which are resolved by in-subqueries first.
+    """
+
+    def __init__(self, query, manager):
+        """Constructor for QueryPlan
+
+        :param query: The planned query
+        :type query: vfxDatabaseORM.core.queries.Query
+        :param manager: The manager which runs the query
+        :type manager: vfxDatabaseORM.core.interfaces.IManager
+        """
+        self.query = query
+        self.manager = manager
+        self.steps = []
+        # Filters of the query, lookups resolved by in-subqueries have a
+        # Subquery value
+        self.where = query.where
+
+    @property
+    def round_trips(self):
+        """Estimated number of requests sent to databases to run the plan
+
+        :return: The number of requests
+        :rtype: int
+        """
+        return sum(step.round_trips for step in self.steps)
+
+    @property
+    def has_subqueries(self):
+        """Does the plan run in-subqueries before the query ?
+
+        :return: True if there are in-subqueries, False otherwise
+        :rtype: bool
+        """
+        return any(
+            step.strategy == STRATEGIES.SUBQUERY for step in self.steps
+        )
+
+    def get_query(self):
+        """Run in-subqueries and get the query to send to the manager.
+
+        :return: The query, the planned query itself if there is no
+        in-subquery
+        :rtype: vfxDatabaseORM.core.queries.Query
+        """
+        if not self.has_subqueries:
+            return self.query
+        query = self.query.clone()
+        query.where = _resolve_subqueries(self.where)
+        return query
+
+    def explain(self):
+        """Describe the plan.
+
+        >>> queryset = Version.objects.filters(shot__sequence__code__is="x")
+        >>> print(queryset.explain())
+        Version on ShotgridManager: 1 round trip
+          query: find Version (1 round trip)
+          deep filter: shot__sequence__code__is through Shot, Sequence
+
+        :return: The description of the plan
+        :rtype: str
+        """
+        return "\n".join(self._get_lines())
+
+    def _get_lines(self, indent=""):
+        round_trips = self.round_trips
+        lines = [
+            "{indent}{model} on {manager}: {count} round trip{s}".format(
+                indent=indent,
+                model=self.query.model_class.__name__,
+                manager=self.manager.__class__.__name__,
+                count=round_trips,
+                s="" if round_trips == 1 else "s",
+            )
+        ]
+        for step in self.steps:
+            line = "{indent}  {strategy}: {description}".format(
+                indent=indent,
+                strategy=step.strategy,
+                description=step.description,
+            )
+            if step.round_trips:
+                line += " ({count} round trip{s})".format(
+                    count=step.round_trips,
+                    s="" if step.round_trips == 1 else "s",
+                )
+            lines.append(line)
+            if step.subplan is not None:
+                lines.extend(step.subplan._get_lines(indent + "    "))
+        return lines
+
+    def __str__(self):
+        return self.explain()
+
+
+def plan_query(manager, query):
+    """Plan how the manager runs the query. A lookup through related
+    models is sent as a deep filter when the manager supports its depth,
+    see IManager.MAX_FILTER_DEPTH. Otherwise entities of the deepest
+    reachable model are selected first by an in-subquery.
+
+    :param manager: The manager which runs the query
+    :type manager: vfxDatabaseORM.core.interfaces.IManager
+    :param query: The query to plan
+    :type query: vfxDatabaseORM.core.queries.Query
+    :return: The plan
+    :rtype: QueryPlan
+    """
+    plan = QueryPlan(query, manager)
+    plan.steps.append(
+        PlanStep(
+            STRATEGIES.QUERY,
+            "find {model}".format(model=query.model_class.__name__),
+            1,
+            None,
+        )
+    )
+    plan.where = _plan_node(plan, query.where)
+    return plan
+
+
+def find_related_path(model_class, target_model):
+    """Find the shortest path of related fields from a model to another
+    one through the graph of models.
+
+    >>> find_related_path(Version, Sequence)
+    ["shot", "sequence"]
+
+    :param model_class: The model where the path starts
+    :type model_class: vfxDatabaseORM.core.models.Model
+    :param target_model: The model to reach
+    :type target_model: vfxDatabaseORM.core.models.Model
+    :raises exceptions.InvalidQuery: Raised if the target model can't be
+    reached, or if several shortest paths reach it (eg: two related fields
+    to the same model)
+    :return: Names of related fields, one per model
+    :rtype: list
+    """
+    graph = model_class._graph
+    source = model_class.__name__
+    target = target_model.__name__
+
+    # Breadth first search, level by level. Up to two paths are kept per
+    # model, it is enough to know if the shortest path is ambiguous.
+    paths = {source: [[]]}
+    level = [source]
+    while level and target not in paths:
+        next_paths = collections.OrderedDict()
+        for node_name in level:
+            node_model = graph.get_node_model(node_name)
+            if node_model is None:
+                continue
+            for neighbor in graph.get_neighbors(node_name):
+                if neighbor in paths:
+                    continue
+                neighbor_paths = next_paths.setdefault(neighbor, [])
+                # Fields linked only from the other side are not followed
+                for field in _get_fields_to(node_model, neighbor):
+                    for path in paths[node_name]:
+                        if len(neighbor_paths) < 2:
+                            neighbor_paths.append(path + [field.name])
+        level = [name for name, found in next_paths.items() if found]
+        paths.update((name, next_paths[name]) for name in level)
+
+    if target not in paths:
+        raise exceptions.InvalidQuery(
+            "There is no relationship from '{source}' to '{target}'.".format(
+                source=source, target=target
+            )
+        )
+    if len(paths[target]) > 1:
+        raise exceptions.InvalidQuery(
+            "Several relationships link '{source}' to '{target}' "
+            "(eg: {paths}), filter through one of them explicitly.".format(
+                source=source,
+                target=target,
+                paths=", ".join(
+                    LOOKUP_TOKEN.join(path) for path in paths[target]
+                ),
+            )
+        )
+    return paths[target][0]
+
+
+def _get_fields_to(model_class, node_name):
+    return [
+        field
+        for field in model_class.get_related_fields()
+        if field.to == node_name
+    ]
+
+
+def _plan_node(plan, node):
+    planned_node = node._copy()
+    planned_node.children = [
+        _plan_node(plan, child)
+        if isinstance(child, Q)
+        else _plan_lookup(plan, child[0], child[1])
+        for child in node.children
+    ]
+    return planned_node
+
+
+def _plan_lookup(plan, arg_name, arg_value):
+    compiled_lookup = compile_lookup(plan.query.model_class, arg_name)
+    if compiled_lookup is None or not compiled_lookup.related_path:
+        return (arg_name, arg_value)
+
+    related_path = compiled_lookup.related_path
+    max_depth = plan.manager.MAX_FILTER_DEPTH
+    if max_depth is None or len(related_path) <= max_depth:
+        plan.steps.append(
+            PlanStep(
+                STRATEGIES.DEEP_FILTER,
+                "{arg_name} through {models}".format(
+                    arg_name=arg_name,
+                    models=", ".join(
+                        model.__name__ for model, _ in related_path
+                    ),
+                ),
+                0,
+                None,
+            )
+        )
+        return (arg_name, arg_value)
+
+    # The manager filters the entities of the deepest model it can reach,
+    # they are selected by a subquery on this model.
+    field_names = [compiled_lookup.field.name]
+    field_names.extend(field.name for _, field in related_path)
+    in_lookup = LOOKUP_TOKEN.join(field_names[:max_depth + 1] + [LOOKUPS.IN])
+    subquery_model = related_path[max_depth][0]
+    subquery_lookup = LOOKUP_TOKEN.join(
+        field_names[max_depth + 1:] + [compiled_lookup.lookup]
+    )
+
+    queryset = subquery_model.objects.filters(
+        **{subquery_lookup: arg_value}
+    ).only(UID_KEY)
+    subplan = plan_query(queryset._manager, queryset.query)
+    plan.steps.append(
+        PlanStep(
+            STRATEGIES.SUBQUERY,
+            "{arg_name} as {in_lookup} on {model}".format(
+                arg_name=arg_name,
+                in_lookup=in_lookup,
+                model=subquery_model.__name__,
+            ),
+            subplan.round_trips,
+            subplan,
+        )
+    )
+    return (in_lookup, Subquery(queryset))
+
+
+def _resolve_subqueries(node):
+    resolved_node = node._copy()
+    resolved_node.children = []
+    for child in node.children:
+        if isinstance(child, Q):
+            child = _resolve_subqueries(child)
+        elif isinstance(child[1], Subquery):
+            child = (child[0], list(child[1].queryset))
+        resolved_node.children.append(child)
+    return resolved_node
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# - prefetch.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+def prefetch_related_objects(model_class, instances, field_names):
+    """Resolve related fields of all given instances with one request per
+    related field instead of one request per instance and per field.
+    Resolved entities are stored in instances so the access to these fields
+    doesn't hit the database anymore.
+
+    >>> shots = list(Shot.objects.all())
+    >>> prefetch_related_objects(Shot, shots, ["assets"])  # One request
+    >>> [shot.assets for shot in shots]  # No request
+
+    :param model_class: The Model of the instances
+    :type model_class: vfxDatabaseORM.core.models.Model
+    :param instances: Instances to resolve
+    :type instances: list
+    :param field_names: Names of related fields to resolve
+    :type field_names: list
+    """
+    # Ordered uids, without duplicates
+    uids = []
+    seen_uids = set()
+    for instance in instances:
+        if instance.uid and instance.uid not in seen_uids:
+            seen_uids.add(instance.uid)
+            uids.append(instance.uid)
+    if not uids:
+        return
+
+    for field_name in field_names:
+        field = model_class.get_field(field_name)
+        related_model, related_field = model_class._resolve_related_field(
+            field
+        )
+
+        related_instances = related_model.objects.fetch_related(
+            related_field, uids
+        )
+
+        for instance in instances:
+            instance._set_related_cache(
+                field.name, related_instances.get(instance.uid, [])
+            )
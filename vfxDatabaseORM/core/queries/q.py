@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# - q.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+class Q(object):
+    """A backend-neutral filter, which can be combined with other filters
+    through ``&`` (AND), ``|`` (OR) and ``~`` (NOT).
+
+    A Q is a node of a tree. Its children are lookup arguments, as
+    (arg_name, value) tuples, or other Q nodes. Managers translate the tree
+    into a query of their backend.
+
+    >>> Shot.objects.filters(Q(code__startswith="SH") | ~Q(status="omt"))
+    """
+
+    AND = "AND"
+    OR = "OR"
+
+    def __init__(self, *args, **kwargs):
+        """Constructor for Q
+
+        :param args: Child nodes
+        :type args: Q
+        :param kwargs: Lookup arguments (eg: code__startswith="SH")
+        :type kwargs: any
+        """
+        connector = kwargs.pop("_connector", self.AND)
+        negated = kwargs.pop("_negated", False)
+        if connector not in (self.AND, self.OR):
+            raise ValueError(
+                "Unknown connector '{connector}'.".format(connector=connector)
+            )
+        for arg in args:
+            if not isinstance(arg, Q):
+                raise TypeError(
+                    "Positional arguments should be Q objects, "
+                    "not {type_name}.".format(type_name=type(arg).__name__)
+                )
+
+        self.connector = connector
+        self.negated = negated
+        self.children = list(args) + sorted(kwargs.items())
+
+    def _copy(self):
+        node = Q(_connector=self.connector, _negated=self.negated)
+        node.children = list(self.children)
+        return node
+
+    def _combine(self, other, connector):
+        if not isinstance(other, Q):
+            raise TypeError(
+                "Cannot combine a Q object with {type_name}.".format(
+                    type_name=type(other).__name__
+                )
+            )
+        if not other:
+            return self._copy()
+        if not self:
+            return other._copy()
+
+        node = Q(_connector=connector)
+        for child in (self, other):
+            if not child.negated and (
+                child.connector == connector or len(child.children) == 1
+            ):
+                # Same operation, no need to nest it
+                node.children.extend(child.children)
+            else:
+                node.children.append(child)
+        return node
+
+    def __and__(self, other):
+        return self._combine(other, self.AND)
+
+    def __or__(self, other):
+        return self._combine(other, self.OR)
+
+    def __invert__(self):
+        node = self._copy()
+        node.negated = not self.negated
+        return node
+
+    def __bool__(self):
+        return bool(self.children)
+
+    __nonzero__ = __bool__  # Python 2
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Q)
+            and self.connector == other.connector
+            and self.negated == other.negated
+            and self.children == other.children
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        children = ", ".join(
+            repr(child)
+            if isinstance(child, Q)
+            else "{}={!r}".format(child[0], child[1])
+            for child in self.children
+        )
+        return "<{not_}{cls_name} {connector}: {children}>".format(
+            not_="NOT " if self.negated else "",
+            cls_name=self.__class__.__name__,
+            connector=self.connector,
+            children=children,
+        )
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+#
+# - query.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.models.constants import ORDER_DESCENDING_TOKEN
+from vfxDatabaseORM.core.queries.q import Q
+from vfxDatabaseORM.core.queries.lookups import compile_lookup
+
+
+class Query(object):
+    """Backend-neutral description of a query. It is built by a QuerySet
+    and translated by a manager when the QuerySet is evaluated.
+    """
+
+    def __init__(self, model_class):
+        """Constructor for Query
+
+        :param model_class: The Model targeted by the query
+        :type model_class: vfxDatabaseORM.core.models.Model
+        """
+        self.model_class = model_class
+
+        # Tree of filters, see vfxDatabaseORM.core.queries.Q
+        self.where = Q()
+        # List of (field_name, descending) tuples.
+        self.ordering = []
+        # Names of the fields to retrieve, None means all fields.
+        self.only_fields = None
+        # Names of the fields to not retrieve.
+        self.deferred_fields = []
+        # Names of the related fields to resolve with the query.
+        self.prefetch_related = []
+
+        self.low_mark = 0
+        self.high_mark = None
+
+    @property
+    def offset(self):
+        """The number of rows to skip
+
+        :return: The offset of the query
+        :rtype: int
+        """
+        return self.low_mark
+
+    @property
+    def limit(self):
+        """The maximum number of rows to return
+
+        :return: The limit of the query, None if there is no limit
+        :rtype: int
+        """
+        if self.high_mark is None:
+            return None
+        return self.high_mark - self.low_mark
+
+    @property
+    def is_sliced(self):
+        """Is the query limited by an offset or a limit ?
+
+        :return: True if the query is sliced, False otherwise
+        :rtype: bool
+        """
+        return bool(self.low_mark) or self.high_mark is not None
+
+    def clone(self):
+        """Get a copy of this query which can be modified without altering
+        the current one.
+
+        :return: The copy of the query
+        :rtype: Query
+        """
+        new_query = self.__class__(self.model_class)
+        new_query.where = self.where._copy()
+        new_query.ordering = list(self.ordering)
+        new_query.only_fields = (
+            list(self.only_fields) if self.only_fields is not None else None
+        )
+        new_query.deferred_fields = list(self.deferred_fields)
+        new_query.prefetch_related = list(self.prefetch_related)
+        new_query.low_mark = self.low_mark
+        new_query.high_mark = self.high_mark
+        return new_query
+
+    def add_filter(self, kwargs, negated=False):
+        """Add a filter to the query.
+
+        :param kwargs: Lookups of the filter (eg: {"uid__gt": 5})
+        :type kwargs: dict
+        :param negated: Should the filter be excluded ?, defaults to False
+        :type negated: bool, optional
+        """
+        node = Q(**kwargs)
+        self.add_q(~node if negated else node)
+
+    def add_q(self, node):
+        """Add a tree of filters to the query. It is combined with AND to
+        current filters.
+
+        :param node: The filters
+        :type node: vfxDatabaseORM.core.queries.Q
+        """
+        if not node:
+            return
+        if node.connector == Q.AND and not node.negated:
+            self.where.children.extend(node.children)
+        else:
+            self.where.children.append(node)
+
+    def set_ordering(self, field_names):
+        """Set the ordering of the query. A field name prefixed with "-"
+        means a descending order.
+
+        :param field_names: Names of the fields in the model
+        :type field_names: list
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        """
+        ordering = []
+        for field_name in field_names:
+            descending = field_name.startswith(ORDER_DESCENDING_TOKEN)
+            if descending:
+                field_name = field_name[len(ORDER_DESCENDING_TOKEN):]
+            # Ensure the field exists
+            self.model_class.get_field(field_name)
+            ordering.append((field_name, descending))
+        self.ordering = ordering
+
+    def set_only_fields(self, field_names):
+        """Restrict the fields to retrieve. The uid field is always
+        retrieved.
+
+        :param field_names: Names of the fields in the model
+        :type field_names: list
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        """
+        only_fields = [self.model_class.uid_key]
+        for field_name in field_names:
+            self.model_class.get_field(field_name)
+            if field_name not in only_fields:
+                only_fields.append(field_name)
+        self.only_fields = only_fields
+        self.deferred_fields = []
+
+    def add_deferred_fields(self, field_names):
+        """Exclude fields from the fields to retrieve. The uid field
+        can't be deferred.
+
+        :param field_names: Names of the fields in the model
+        :type field_names: list
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        """
+        for field_name in field_names:
+            self.model_class.get_field(field_name)
+            if field_name == self.model_class.uid_key:
+                continue
+            if field_name not in self.deferred_fields:
+                self.deferred_fields.append(field_name)
+
+    def add_prefetch_related(self, field_names):
+        """Add related fields to resolve once the query has been run.
+
+        :param field_names: Names of related fields in the model
+        :type field_names: list
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        :raises exceptions.FieldRelatedError: Raised if a field is not related
+        """
+        for field_name in field_names:
+            field = self.model_class.get_field(field_name)
+            if not field.is_related:
+                raise exceptions.FieldRelatedError(
+                    "'{name}' is not a related field, "
+                    "it cannot be prefetched.".format(name=field_name)
+                )
+            if field_name not in self.prefetch_related:
+                self.prefetch_related.append(field_name)
+
+    def get_fields(self):
+        """Get basic fields to retrieve from the database.
+
+        :return: List of fields
+        :rtype: list
+        """
+        fields = self.model_class.get_fields()
+        if self.only_fields is not None:
+            fields = [f for f in fields if f.name in self.only_fields]
+        if self.deferred_fields:
+            fields = [f for f in fields if f.name not in self.deferred_fields]
+        return fields
+
+    def get_deferred_field_names(self):
+        """Get names of basic fields which are not retrieved from the
+        database. They will be loaded on first access.
+
+        :return: Names of deferred fields
+        :rtype: list
+        """
+        fetched_fields = self.get_fields()
+        return [
+            field.name
+            for field in self.model_class.get_fields()
+            if field not in fetched_fields
+        ]
+
+    def set_limits(self, low=None, high=None):
+        """Restrict the rows returned by the query. Limits are relative to
+        the current limits of the query.
+
+        :param low: Index of the first row, defaults to None
+        :type low: int, optional
+        :param high: Index after the last row, defaults to None
+        :type high: int, optional
+        """
+        if high is not None:
+            if self.high_mark is not None:
+                self.high_mark = min(self.high_mark, self.low_mark + high)
+            else:
+                self.high_mark = self.low_mark + high
+        if low is not None:
+            if self.high_mark is not None:
+                self.low_mark = min(self.high_mark, self.low_mark + low)
+            else:
+                self.low_mark = self.low_mark + low
+
+    def get_sliced_count(self, count):
+        """Apply the limits of the query to a number of rows.
+
+        :param count: The number of rows matching the query without limits
+        :type count: int
+        :return: The number of rows returned by the query
+        :rtype: int
+        """
+        count = max(count - self.low_mark, 0)
+        if self.high_mark is not None:
+            count = min(count, self.limit)
+        return count
+
+    def is_empty(self):
+        """Is the query sure to return nothing ?
+
+        :return: True if the query can't return any row, False otherwise
+        :rtype: bool
+        """
+        return self.high_mark is not None and self.high_mark <= self.low_mark
+
+    def check_filterable(self):
+        """Ensure the query can still be filtered or ordered.
+
+        :raises exceptions.InvalidQuery: Raised if the query is sliced
+        """
+        if self.is_sliced:
+            raise exceptions.InvalidQuery(
+                "Cannot filter or order a query once a slice has been taken."
+            )
+
+    def get_related_entity_names(self):
+        """Get names of the other entities which filters of the query go
+        through (eg: "Shot" and "Sequence" for "shot__sequence__code__is").
+        Changes on these entities may change the result of the query.
+
+        :return: Entity names, sorted
+        :rtype: tuple
+        """
+        graph = self.model_class._graph
+        entity_names = set()
+        nodes = [self.where]
+        while nodes:
+            node = nodes.pop()
+            for child in node.children:
+                if isinstance(child, Q):
+                    nodes.append(child)
+                    continue
+                compiled_lookup = compile_lookup(self.model_class, child[0])
+                if compiled_lookup is None:
+                    continue
+                fields = [compiled_lookup.field]
+                fields.extend(
+                    field for _, field in compiled_lookup.related_path
+                )
+                for field in fields:
+                    if not field.is_related:
+                        continue
+                    related_model = graph.get_node_model(field.to)
+                    if related_model is not None:
+                        entity_names.add(related_model.entity_name)
+        entity_names.discard(self.model_class.entity_name)
+        return tuple(sorted(entity_names))
+
+    def get_cache_key(self):
+        """Get a hashable key which identifies the result of the query.
+        The first item of the key is the entity name, the second one the
+        names of other entities its filters go through, see ICache.
+
+        :return: The key of the query
+        :rtype: tuple
+        """
+        return (
+            self.model_class.entity_name,
+            self.get_related_entity_names(),
+            self.model_class.__name__,
+            _freeze(self.where),
+            tuple(self.ordering),
+            tuple(field.name for field in self.get_fields()),
+            self.low_mark,
+            self.high_mark,
+        )
+
+    def __repr__(self):
+        return (
+            "<{cls_name} model={model} where={where} "
+            "ordering={ordering} offset={offset} limit={limit}>".format(
+                cls_name=self.__class__.__name__,
+                model=self.model_class.__name__,
+                where=self.where,
+                ordering=self.ordering,
+                offset=self.offset,
+                limit=self.limit,
+            )
+        )
+
+
+def _freeze(value):
+    """Convert a filter value into a hashable value.
+
+    :param value: The value to convert
+    :type value: any
+    :return: A hashable value
+    :rtype: any
+    """
+    if isinstance(value, Q):
+        return (
+            value.connector,
+            value.negated,
+            tuple(_freeze(child) for child in value.children),
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if hasattr(value, "entity_name") and hasattr(value, "uid"):
+        # Instance of a Model
+        return (value.entity_name, value.uid)
+    return value
@@ -0,0 +1,626 @@
+# -*- coding: utf-8 -*-
+#
+# - querySet.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import collections
+import itertools
+
+import six
+
+from vfxDatabaseORM.core import exceptions
+from vfxDatabaseORM.core.models.constants import DEFAULT_CHUNK_SIZE
+from vfxDatabaseORM.core.models.constants import LOOKUP_TOKEN, LOOKUPS
+from vfxDatabaseORM.core.queries.q import Q
+from vfxDatabaseORM.core.queries.query import Query
+from vfxDatabaseORM.core.queries.aggregates import Aggregate, aggregate_rows
+from vfxDatabaseORM.core.queries.prefetch import prefetch_related_objects
+from vfxDatabaseORM.core.queries.planner import find_related_path, plan_query
+from vfxDatabaseORM.core.queries.resultFrame import ResultFrame
+
+# Kinds of results returned by values() and values_list()
+_VALUES_DICT = "dict"
+_VALUES_TUPLE = "tuple"
+_VALUES_FLAT = "flat"
+
+
+class QuerySet(object):
+    """A lazy collection of entities. Filtering, ordering or slicing a
+    QuerySet returns a new QuerySet without hitting the database. The
+    database is only requested when the QuerySet is evaluated (iteration,
+    len(), bool(), indexing...).
+
+    >>> shots = Shot.objects.filters(code__startswith="SH").order_by("code")
+    >>> shots = shots.exclude(status="omt")[:10]  # Still no request
+    >>> for shot in shots:  # One request is sent here
+    ...     print(shot.code)
+    """
+
+    def __init__(self, manager, query=None):
+        """Constructor for QuerySet
+
+        :param manager: The manager used to evaluate the QuerySet
+        :type manager: vfxDatabaseORM.core.interfaces.IManager
+        :param query: The query to evaluate, defaults to None
+        :type query: vfxDatabaseORM.core.queries.Query, optional
+        """
+        self._manager = manager
+        self._query = query or Query(manager.model_class)
+        self._result_cache = None
+        # The query with resolved in-subqueries, see _get_query()
+        self._planned_query = None
+
+        # Set by values() and values_list() to return raw values
+        # instead of instances
+        self._values_kind = None
+        self._values_fields = None
+
+    @property
+    def model_class(self):
+        """The Model returned by this QuerySet
+
+        :return: The Model class
+        :rtype: vfxDatabaseORM.core.models.Model
+        """
+        return self._manager.model_class
+
+    @property
+    def query(self):
+        """The backend-neutral query of this QuerySet
+
+        :return: The query
+        :rtype: vfxDatabaseORM.core.queries.Query
+        """
+        return self._query
+
+    def all(self):
+        """Get a copy of this QuerySet.
+
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        return self._clone()
+
+    def filter(self, *args, **kwargs):
+        """Get a new QuerySet filtered by given Q objects and lookups.
+        They are combined with the existing ones.
+
+        >>> Project.objects.all().filter(uid__gt=500, code__endswith="foo")
+        >>> Project.objects.all().filter(Q(code="foo") | Q(code="bar"))
+
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        return self._filter_or_exclude(False, args, kwargs)
+
+    def exclude(self, *args, **kwargs):
+        """Get a new QuerySet without entities which match given Q objects
+        and lookups.
+
+        >>> Project.objects.all().exclude(code__contains="test")
+
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        return self._filter_or_exclude(True, args, kwargs)
+
+    def order_by(self, *field_names):
+        """Get a new QuerySet ordered by given field names. Prefix a field
+        name with "-" to sort in descending order.
+
+        >>> Project.objects.all().order_by("-created_at", "code")
+
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        self._query.check_filterable()
+        clone = self._clone()
+        clone._query.set_ordering(field_names)
+        return clone
+
+    def only(self, *field_names):
+        """Get a new QuerySet which only retrieves given fields. Other fields
+        are loaded from the database on first access.
+        The uid field is always retrieved.
+
+        >>> Project.objects.all().only("code")
+
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        clone = self._clone()
+        clone._query.set_only_fields(field_names)
+        return clone
+
+    def defer(self, *field_names):
+        """Get a new QuerySet which doesn't retrieve given fields. Deferred
+        fields are loaded from the database on first access.
+
+        >>> Version.objects.all().defer("description", "frames")
+
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        clone = self._clone()
+        clone._query.add_deferred_fields(field_names)
+        return clone
+
+    def prefetch_related(self, *field_names):
+        """Get a new QuerySet which resolves given related fields of all
+        entities with one request per field, when the QuerySet is evaluated.
+
+        >>> for shot in Shot.objects.all().prefetch_related("assets"):
+        ...     print(shot.assets)  # No request here
+
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        clone = self._clone()
+        clone._query.add_prefetch_related(field_names)
+        return clone
+
+    def iterator(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Iterate over entities without caching them. Rows are fetched by
+        chunks so the memory stays bounded whatever the size of the table.
+
+        >>> for version in Version.objects.all().iterator(chunk_size=200):
+        ...     print(version.code)
+
+        :param chunk_size: The number of rows fetched per request,
+        defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :raises ValueError: Raised if the chunk size is not positive
+        :return: A generator of instances
+        :rtype: generator
+        """
+        if chunk_size <= 0:
+            raise ValueError("The chunk size should be strictly positive.")
+        if self._result_cache is not None:
+            return iter(self._result_cache)
+        if self._query.is_empty():
+            return iter([])
+        if self._values_kind is not None:
+            return self._iterate_values(
+                self._manager.iterate_raw(self._get_query(), chunk_size)
+            )
+        iterator = self._manager.iterate(self._get_query(), chunk_size)
+        if self._query.prefetch_related:
+            return self._prefetch_by_chunks(iterator, chunk_size)
+        return iterator
+
+    def values(self, *field_names):
+        """Get a new QuerySet which returns dicts of values instead of
+        instances. Values are taken from rows of the database as they are,
+        no instance is created.
+
+        >>> Shot.objects.filters(code__startswith="SH").values("uid", "code")
+        [{"uid": 1, "code": "SH010"}, {"uid": 2, "code": "SH020"}]
+
+        :param field_names: Names of basic fields to retrieve,
+        defaults to all basic fields
+        :type field_names: str
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        :raises exceptions.FieldRelatedError: Raised if a field is related
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        return self._values(_VALUES_DICT, field_names)
+
+    def values_list(self, *field_names, **kwargs):
+        """Get a new QuerySet which returns tuples of values instead of
+        instances, see values().
+
+        >>> Shot.objects.all().values_list("uid", "code")
+        [(1, "SH010"), (2, "SH020")]
+        >>> Shot.objects.all().values_list("code", flat=True)
+        ["SH010", "SH020"]
+
+        :param field_names: Names of basic fields to retrieve,
+        defaults to all basic fields
+        :type field_names: str
+        :param flat: Return single values instead of tuples, only if there
+        is one field, defaults to False
+        :type flat: bool, optional
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        :raises exceptions.FieldRelatedError: Raised if a field is related
+        :raises TypeError: Raised if flat is used with more than one field
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        flat = kwargs.pop("flat", False)
+        if kwargs:
+            raise TypeError(
+                "Unexpected keyword arguments: {names}".format(
+                    names=", ".join(sorted(kwargs))
+                )
+            )
+        if flat and len(field_names) != 1:
+            raise TypeError(
+                "'flat' is only valid when values_list() is called "
+                "with a single field."
+            )
+        return self._values(
+            _VALUES_FLAT if flat else _VALUES_TUPLE, field_names
+        )
+
+    def values_columnar(self, *field_names, **kwargs):
+        """Evaluate the QuerySet into a ResultFrame, which stores values
+        column by column without creating any instance. Rows are fetched by
+        chunks, see iterator(). It is meant for large read-only queries.
+
+        >>> frame = Version.objects.all().values_columnar("code", "frames")
+        >>> sum(frame.get_column("frames"))
+
+        :param field_names: Names of basic fields to retrieve,
+        defaults to all basic fields
+        :type field_names: str
+        :param chunk_size: The number of rows fetched per request,
+        defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        :raises exceptions.FieldRelatedError: Raised if a field is related
+        :return: The results
+        :rtype: vfxDatabaseORM.core.queries.ResultFrame
+        """
+        chunk_size = kwargs.pop("chunk_size", DEFAULT_CHUNK_SIZE)
+        if kwargs:
+            raise TypeError(
+                "Unexpected keyword arguments: {names}".format(
+                    names=", ".join(sorted(kwargs))
+                )
+            )
+        if chunk_size <= 0:
+            raise ValueError("The chunk size should be strictly positive.")
+
+        query = self._get_query().clone()
+        if field_names:
+            fields = self._get_basic_fields(field_names)
+            query.set_only_fields(field_names)
+        else:
+            fields = query.get_fields()
+
+        frame = ResultFrame(fields)
+        if query.is_empty():
+            return frame
+        rows = self._manager.iterate_raw(query, chunk_size)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            frame.extend(chunk)
+            if len(chunk) < chunk_size:
+                return frame
+
+    def filter_related(self, model, *args, **kwargs):
+        """Get a new QuerySet filtered by lookups on another model. The
+        shortest path of related fields to this model is found through the
+        graph of models.
+
+        >>> Version.objects.all().filter_related(Sequence, code="SEQ01")
+        >>> # Same as
+        >>> Version.objects.all().filter(shot__sequence__code__is="SEQ01")
+
+        :param model: The model filtered by the lookups, or its name
+        :type model: vfxDatabaseORM.core.models.Model or str
+        :raises exceptions.InvalidQuery: Raised if there is no path to the
+        model
+        :return: A new QuerySet
+        :rtype: QuerySet
+        """
+        if isinstance(model, six.string_types):
+            model = self.model_class._graph.get_node_model(model)
+        field_names = find_related_path(self.model_class, model)
+        if not field_names:
+            return self.filter(*args, **kwargs)
+
+        prefix = LOOKUP_TOKEN.join(field_names) + LOOKUP_TOKEN
+        node = _prefix_lookups(Q(*args, **kwargs), prefix)
+        return self.filter(node)
+
+    def explain(self):
+        """Describe how the QuerySet is run by its manager: deep filters,
+        in-subqueries and the estimated number of requests. Related fields
+        prefetched afterwards are not part of the plan. Nothing is
+        requested.
+
+        :return: The description of the plan
+        :rtype: str
+        """
+        return plan_query(self._manager, self._query).explain()
+
+    def count(self):
+        """Get the number of entities in this QuerySet. Entities are counted
+        by the database, unless the QuerySet has already been evaluated.
+
+        :return: The number of entities
+        :rtype: int
+        """
+        if self._result_cache is not None:
+            return len(self._result_cache)
+        if self._query.is_empty():
+            return 0
+        return self._manager.execute_count(self._get_query())
+
+    def exists(self):
+        """Is there at least one entity in this QuerySet ?
+
+        :return: True if the QuerySet contains entities, False otherwise
+        :rtype: bool
+        """
+        if self._result_cache is not None:
+            return bool(self._result_cache)
+        if self._query.is_empty():
+            return False
+        return self._manager.execute_exists(self._get_query())
+
+    def aggregate(self, *args, **kwargs):
+        """Compute aggregates over the entities of this QuerySet, without
+        retrieving them when the database supports it. Results are keyed by
+        the given alias, or by "<field>__<function>".
+
+        >>> Version.objects.filters(project=project).aggregate(
+        ...     Sum("frame_count"), longest=Max("frame_count")
+        ... )
+        {"frame_count__sum": 12000, "longest": 240}
+        >>> Version.objects.all().aggregate(Count(), group_by="status")
+        [{"status": "apr", "uid__count": 10}, ...]
+
+        :param args: Aggregates keyed by their default alias
+        :type args: vfxDatabaseORM.core.queries.Aggregate
+        :param kwargs: Aggregates keyed by alias
+        :type kwargs: vfxDatabaseORM.core.queries.Aggregate
+        :param group_by: Names of the fields to group entities by,
+        defaults to None
+        :type group_by: str or list, optional
+        :raises exceptions.FieldNotFound: Raised if a field doesn't exist
+        :raises exceptions.FieldRelatedError: Raised if a field is related
+        :raises TypeError: Raised if no aggregate is given
+        :raises ValueError: Raised if an alias is used twice
+        :return: Results by alias. With group_by, a list of them, one per
+        group, which also contains values of the grouped fields.
+        :rtype: dict or list
+        """
+        group_by = kwargs.pop("group_by", None) or []
+        if isinstance(group_by, six.string_types):
+            group_by = [group_by]
+        else:
+            group_by = list(group_by)
+
+        aggregates = collections.OrderedDict()
+        named_aggregates = [(a.default_alias, a) for a in args]
+        named_aggregates.extend(sorted(kwargs.items()))
+        for alias, aggregate in named_aggregates:
+            if not isinstance(aggregate, Aggregate):
+                raise TypeError(
+                    "'{alias}' is not an aggregate.".format(alias=alias)
+                )
+            if alias in aggregates or alias in group_by:
+                raise ValueError(
+                    "The alias '{alias}' is used twice.".format(alias=alias)
+                )
+            aggregates[alias] = aggregate
+        if not aggregates:
+            raise TypeError("aggregate() requires at least one aggregate.")
+
+        self._get_basic_fields(
+            [aggregate.field_name for aggregate in aggregates.values()]
+            + group_by
+        )
+
+        if self._query.is_empty():
+            return aggregate_rows(self.model_class, [], aggregates, group_by)
+        return self._manager.execute_aggregate(
+            self._get_query(), aggregates, group_by
+        )
+
+    def first(self):
+        """Get the first entity of this QuerySet.
+
+        :return: The first entity, None if the QuerySet is empty
+        :rtype: vfxDatabaseORM.core.models.Model
+        """
+        if self._result_cache is not None:
+            return self._result_cache[0] if self._result_cache else None
+        for instance in self[:1]:
+            return instance
+        return None
+
+    def _prefetch_by_chunks(self, iterator, chunk_size):
+        chunk = []
+        for instance in iterator:
+            chunk.append(instance)
+            if len(chunk) < chunk_size:
+                continue
+            self._prefetch_related_objects(chunk)
+            for chunk_instance in chunk:
+                yield chunk_instance
+            chunk = []
+        self._prefetch_related_objects(chunk)
+        for chunk_instance in chunk:
+            yield chunk_instance
+
+    def _prefetch_related_objects(self, instances):
+        if not instances or not self._query.prefetch_related:
+            return
+        prefetch_related_objects(
+            self.model_class, instances, self._query.prefetch_related
+        )
+
+    def _get_basic_fields(self, field_names):
+        fields = []
+        for field_name in field_names:
+            field = self.model_class.get_field(field_name)
+            if field.is_related:
+                raise exceptions.FieldRelatedError(
+                    "'{name}' is a related field, only basic fields "
+                    "are supported.".format(name=field_name)
+                )
+            fields.append(field)
+        return fields
+
+    def _values(self, kind, field_names):
+        clone = self._clone()
+        if field_names:
+            clone._values_fields = self._get_basic_fields(field_names)
+            clone._query.set_only_fields(field_names)
+        else:
+            clone._values_fields = clone._query.get_fields()
+        clone._values_kind = kind
+        return clone
+
+    def _iterate_values(self, rows):
+        fields = [
+            (field.db_name, field.default) for field in self._values_fields
+        ]
+        if self._values_kind == _VALUES_FLAT:
+            db_name, default = fields[0]
+            for row in rows:
+                yield row.get(db_name, default)
+        elif self._values_kind == _VALUES_TUPLE:
+            for row in rows:
+                yield tuple(
+                    row.get(db_name, default) for db_name, default in fields
+                )
+        else:
+            names = [field.name for field in self._values_fields]
+            for row in rows:
+                yield {
+                    name: row.get(db_name, default)
+                    for name, (db_name, default) in zip(names, fields)
+                }
+
+    def _get_query(self):
+        """Get the query to send to the manager. Filters deeper than the
+        manager supports are resolved by in-subqueries first, only once per
+        QuerySet.
+        """
+        if self._manager.MAX_FILTER_DEPTH is None:
+            return self._query
+        if self._planned_query is None:
+            self._planned_query = plan_query(
+                self._manager, self._query
+            ).get_query()
+        return self._planned_query
+
+    def _filter_or_exclude(self, negated, args, kwargs):
+        self._query.check_filterable()
+        if len(args) == 1 and not kwargs and isinstance(args[0], Q):
+            node = args[0]
+        else:
+            node = Q(*args, **kwargs)
+        clone = self._clone()
+        clone._query.add_q(~node if negated else node)
+        return clone
+
+    def _clone(self):
+        clone = self.__class__(
+            manager=self._manager, query=self._query.clone()
+        )
+        clone._values_kind = self._values_kind
+        clone._values_fields = self._values_fields
+        return clone
+
+    def _fetch_all(self):
+        if self._result_cache is not None:
+            return
+        if self._query.is_empty():
+            self._result_cache = []
+            return
+        if self._values_kind is not None:
+            rows = self._manager.run_raw_query(self._get_query())
+            self._result_cache = list(self._iterate_values(rows))
+            return
+        result = self._manager.run_query(self._get_query())
+        self._prefetch_related_objects(result)
+        self._result_cache = result
+
+    def __iter__(self):
+        self._fetch_all()
+        return iter(self._result_cache)
+
+    def __len__(self):
+        self._fetch_all()
+        return len(self._result_cache)
+
+    def __bool__(self):
+        self._fetch_all()
+        return bool(self._result_cache)
+
+    __nonzero__ = __bool__  # Python 2
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step is not None:
+                raise ValueError("Slicing with a step is not supported.")
+            if (key.start is not None and key.start < 0) or (
+                key.stop is not None and key.stop < 0
+            ):
+                raise ValueError("Negative indexing is not supported.")
+            if self._result_cache is not None:
+                return self._result_cache[key]
+            clone = self._clone()
+            clone._query.set_limits(key.start, key.stop)
+            return clone
+
+        if not isinstance(key, six.integer_types):
+            raise TypeError(
+                "QuerySet indices must be integers or slices, "
+                "not {type_name}.".format(type_name=type(key).__name__)
+            )
+        if key < 0:
+            raise ValueError("Negative indexing is not supported.")
+        if self._result_cache is not None:
+            return self._result_cache[key]
+
+        clone = self._clone()
+        clone._query.set_limits(key, key + 1)
+        return list(clone)[0]
+
+    def __repr__(self):
+        return "<{cls_name} {model}>".format(
+            cls_name=self.__class__.__name__,
+            model=self.model_class.__name__,
+        )
+
+
+def _prefix_lookups(node, prefix):
+    """Prefix lookups of a tree of Q nodes with a path of related fields.
+    A lookup without operator gets the equality operator, since the last
+    part of a related lookup is always the operator.
+
+    :param node: The filters
+    :type node: Q
+    :param prefix: The path (eg: "shot__sequence__")
+    :type prefix: str
+    :return: The new filters
+    :rtype: Q
+    """
+    prefixed_node = node._copy()
+    prefixed_node.children = []
+    for child in node.children:
+        if isinstance(child, Q):
+            child = _prefix_lookups(child, prefix)
+        else:
+            arg_name, arg_value = child
+            if LOOKUP_TOKEN not in arg_name:
+                arg_name = arg_name + LOOKUP_TOKEN + LOOKUPS.EQUAL
+            child = (prefix + arg_name, arg_value)
+        prefixed_node.children.append(child)
+    return prefixed_node
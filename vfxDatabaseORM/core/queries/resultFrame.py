@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+#
+# - resultFrame.py -
+#
+# Copyright (c) 2022-2023 Alexandre Laurette
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import array
+import datetime
+
+from vfxDatabaseORM.core.models import fields as model_fields
+
+try:
+    array.array("q")
+    _INTEGER_TYPECODE = "q"
+except ValueError:
+    # 64 bits integers are stored as long by python 2
+    _INTEGER_TYPECODE = "l"
+
+
+class ArrayColumn(object):
+    """A column of numbers stored in a compact array. The column falls back
+    to a list as soon as a value can't be stored in the array (None...).
+    """
+
+    def __init__(self, typecode, cast=None):
+        """Constructor for ArrayColumn
+
+        :param typecode: The typecode of the array
+        :type typecode: str
+        :param cast: Callable to convert values read from the array,
+        defaults to None
+        :type cast: callable, optional
+        """
+        self._values = array.array(typecode)
+        self._cast = cast
+
+    def append(self, value):
+        if isinstance(self._values, array.array):
+            try:
+                self._values.append(value)
+                return
+            except (TypeError, OverflowError):
+                self._values = list(self._values)
+        self._values.append(value)
+
+    def extend(self, values):
+        values = list(values)
+        if isinstance(self._values, array.array):
+            try:
+                # Build a new array first, so nothing is added on failure
+                self._values.extend(array.array(self._values.typecode, values))
+                return
+            except (TypeError, OverflowError):
+                self._values = list(self._values)
+        self._values.extend(values)
+
+    def to_list(self):
+        if self._cast is None or not isinstance(self._values, array.array):
+            return list(self._values)
+        return [self._cast(value) for value in self._values]
+
+    def to_numpy(self, numpy):
+        if not isinstance(self._values, array.array):
+            return numpy.array(self._values, dtype=object)
+        values = numpy.frombuffer(self._values, dtype=self._values.typecode)
+        if self._cast is not None:
+            values = values.astype(self._cast)
+        return values
+
+    def __getitem__(self, index):
+        value = self._values[index]
+        if self._cast is None or not isinstance(self._values, array.array):
+            return value
+        return self._cast(value)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class TableColumn(object):
+    """A column of repeated values (strings, dates...). Each distinct value
+    is stored once in a table and rows only store its index.
+    """
+
+    def __init__(self):
+        self._table = []
+        self._indexes_by_value = {}
+        self._indexes = array.array(_INTEGER_TYPECODE)
+
+    @property
+    def table(self):
+        """Distinct values of the column, in order of appearance
+
+        :rtype: list
+        """
+        return self._table
+
+    def append(self, value):
+        index = self._indexes_by_value.get(value)
+        if index is None:
+            index = len(self._table)
+            self._table.append(value)
+            self._indexes_by_value[value] = index
+        self._indexes.append(index)
+
+    def extend(self, values):
+        table = self._table
+        indexes_by_value = self._indexes_by_value
+        indexes = []
+        for value in values:
+            index = indexes_by_value.get(value)
+            if index is None:
+                index = len(table)
+                table.append(value)
+                indexes_by_value[value] = index
+            indexes.append(index)
+        self._indexes.extend(array.array(_INTEGER_TYPECODE, indexes))
+
+    def to_list(self):
+        table = self._table
+        return [table[index] for index in self._indexes]
+
+    def to_numpy(self, numpy):
+        table = numpy.array(self._table, dtype=object)
+        return table[numpy.frombuffer(self._indexes, dtype=numpy.int64)]
+
+    def __getitem__(self, index):
+        return self._table[self._indexes[index]]
+
+    def __len__(self):
+        return len(self._indexes)
+
+
+class DateTimeColumn(object):
+    """A column of datetimes stored as POSIX timestamps in an array. None is
+    stored as NaN. Timezones are kept for the whole column, from the first
+    value which has one.
+    """
+
+    def __init__(self):
+        self._timestamps = array.array("d")
+        self._tzinfo = None
+
+    def append(self, value):
+        self.extend([value])
+
+    def extend(self, values):
+        timestamps = []
+        for value in values:
+            if value is None:
+                timestamps.append(_NAN)
+            elif value.tzinfo is None:
+                timestamps.append((value - _EPOCH).total_seconds())
+            else:
+                self._tzinfo = self._tzinfo or value.tzinfo
+                timestamps.append((value - _UTC_EPOCH).total_seconds())
+        self._timestamps.extend(array.array("d", timestamps))
+
+    def to_list(self):
+        return [self[index] for index in range(len(self))]
+
+    def to_numpy(self, numpy):
+        timestamps = numpy.frombuffer(self._timestamps, dtype=numpy.float64)
+        values = numpy.full(len(timestamps), "NaT", dtype="datetime64[us]")
+        valid = ~numpy.isnan(timestamps)
+        microseconds = numpy.round(timestamps[valid] * 1e6).astype(numpy.int64)
+        values[valid] = microseconds.astype("datetime64[us]")
+        return values
+
+    def __getitem__(self, index):
+        timestamp = self._timestamps[index]
+        if timestamp != timestamp:
+            # NaN
+            return None
+        value = _EPOCH + datetime.timedelta(seconds=timestamp)
+        if self._tzinfo is None:
+            return value
+        return value.replace(tzinfo=_UTC).astimezone(self._tzinfo)
+
+    def __len__(self):
+        return len(self._timestamps)
+
+
+class ListColumn(object):
+    """A column of any values, stored in a list."""
+
+    def __init__(self):
+        self._values = []
+
+    def append(self, value):
+        self._values.append(value)
+
+    def extend(self, values):
+        self._values.extend(values)
+
+    def to_list(self):
+        return list(self._values)
+
+    def to_numpy(self, numpy):
+        return numpy.array(self._values, dtype=object)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __len__(self):
+        return len(self._values)
+
+
+class _UTCTimezone(datetime.tzinfo):
+    def utcoffset(self, value):
+        return datetime.timedelta(0)
+
+    def dst(self, value):
+        return datetime.timedelta(0)
+
+    def tzname(self, value):
+        return "UTC"
+
+
+_UTC = _UTCTimezone()
+_EPOCH = datetime.datetime(1970, 1, 1)
+_UTC_EPOCH = _EPOCH.replace(tzinfo=_UTC)
+_NAN = float("nan")
+
+
+def _create_column(field):
+    """Create the most compact column for the values of a field.
+
+    :param field: A basic field
+    :type field: vfxDatabaseORM.core.models.fields.Field
+    :rtype: object
+    """
+    # BooleanField before IntegerField, in case of inheritance
+    if isinstance(field, model_fields.BooleanField):
+        return ArrayColumn("b", cast=bool)
+    if isinstance(field, model_fields.IntegerField):
+        return ArrayColumn(_INTEGER_TYPECODE)
+    if isinstance(field, model_fields.FloatField):
+        return ArrayColumn("d")
+    if isinstance(field, model_fields.DateTimeField):
+        return DateTimeColumn()
+    if isinstance(field, (model_fields.StringField, model_fields.DateField)):
+        return TableColumn()
+    return ListColumn()
+
+
+class ResultRow(object):
+    """A read-only view on a row of a ResultFrame. Values are read from the
+    columns of the frame on access.
+
+    >>> row = frame[0]
+    >>> row.code, row["uid"]
+    """
+
+    __slots__ = ("_frame", "_index")
+
+    def __init__(self, frame, index):
+        self._frame = frame
+        self._index = index
+
+    def as_dict(self):
+        """Get values of the row.
+
+        :return: Values by field name
+        :rtype: dict
+        """
+        return {
+            name: self._frame.get_column(name)[self._index]
+            for name in self._frame.field_names
+        }
+
+    def __getitem__(self, field_name):
+        return self._frame.get_column(field_name)[self._index]
+
+    def __getattr__(self, field_name):
+        try:
+            return self[field_name]
+        except KeyError:
+            raise AttributeError(field_name)
+
+    def __repr__(self):
+        return "<{cls_name} {values}>".format(
+            cls_name=self.__class__.__name__, values=self.as_dict()
+        )
+
+
+class ResultFrame(object):
+    """Results of a query stored column by column, without creating any
+    instance. Numbers, booleans and datetimes are stored in arrays and
+    repeated values (strings, dates) are stored once per column.
+
+    >>> frame = Version.objects.filters(project=project).values_columnar(
+    ...     "code", "frame_count"
+    ... )
+    >>> sum(frame.get_column("frame_count"))
+    >>> frame[0].code
+    >>> frame.to_numpy()["frame_count"].mean()
+    """
+
+    def __init__(self, fields):
+        """Constructor for ResultFrame
+
+        :param fields: Basic fields of the columns, in order
+        :type fields: list
+        """
+        self._fields = list(fields)
+        self._columns = {field.name: _create_column(field) for field in fields}
+        self._length = 0
+
+    @property
+    def field_names(self):
+        """Names of the columns, in order
+
+        :rtype: list
+        """
+        return [field.name for field in self._fields]
+
+    def append(self, raw_values):
+        """Add a row of the database.
+
+        :param raw_values: Raw values from the database, by db_name
+        :type raw_values: dict
+        """
+        for field in self._fields:
+            self._columns[field.name].append(
+                raw_values.get(field.db_name, field.default)
+            )
+        self._length += 1
+
+    def extend(self, rows):
+        """Add rows of the database. It is faster than append() since values
+        are added column by column.
+
+        :param rows: Raw values from the database, one dict per row
+        :type rows: list
+        """
+        for field in self._fields:
+            db_name = field.db_name
+            default = field.default
+            self._columns[field.name].extend(
+                [row.get(db_name, default) for row in rows]
+            )
+        self._length += len(rows)
+
+    def get_column(self, field_name):
+        """Get the values of a column. It is not a copy, the column should
+        not be modified.
+
+        :param field_name: The name of the field
+        :type field_name: str
+        :raises KeyError: Raised if there is no column for this field
+        :return: The column, which supports len() and indexing
+        :rtype: object
+        """
+        return self._columns[field_name]
+
+    def to_dicts(self):
+        """Get all rows as dicts.
+
+        :return: Values by field name, one dict per row
+        :rtype: list
+        """
+        columns = [
+            (name, self._columns[name].to_list()) for name in self.field_names
+        ]
+        return [
+            {name: values[index] for name, values in columns}
+            for index in range(self._length)
+        ]
+
+    def to_numpy(self):
+        """Get each column as a NumPy array. NumPy is only required by this
+        method.
+
+        :raises ImportError: Raised if NumPy is not installed
+        :return: Arrays by field name
+        :rtype: dict
+        """
+        import numpy
+
+        return {
+            name: self._columns[name].to_numpy(numpy)
+            for name in self.field_names
+        }
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ResultFrame index out of range.")
+        return ResultRow(self, index)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield ResultRow(self, index)
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return "<{cls_name} {length} rows {names}>".format(
+            cls_name=self.__class__.__name__,
+            length=self._length,
+            names=self.field_names,
+        )